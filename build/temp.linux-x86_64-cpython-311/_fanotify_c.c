@@ -0,0 +1,1607 @@
+#define _CFFI_
+
+/* We try to define Py_LIMITED_API before including Python.h.
+
+   Mess: we can only define it if Py_DEBUG, Py_TRACE_REFS and
+   Py_REF_DEBUG are not defined.  This is a best-effort approximation:
+   we can learn about Py_DEBUG from pyconfig.h, but it is unclear if
+   the same works for the other two macros.  Py_DEBUG implies them,
+   but not the other way around.
+
+   The implementation is messy (issue #350): on Windows, with _MSC_VER,
+   we have to define Py_LIMITED_API even before including pyconfig.h.
+   In that case, we guess what pyconfig.h will do to the macros above,
+   and check our guess after the #include.
+
+   Note that on Windows, with CPython 3.x, you need >= 3.5 and virtualenv
+   version >= 16.0.0.  With older versions of either, you don't get a
+   copy of PYTHON3.DLL in the virtualenv.  We can't check the version of
+   CPython *before* we even include pyconfig.h.  ffi.set_source() puts
+   a ``#define _CFFI_NO_LIMITED_API'' at the start of this file if it is
+   running on Windows < 3.5, as an attempt at fixing it, but that's
+   arguably wrong because it may not be the target version of Python.
+   Still better than nothing I guess.  As another workaround, you can
+   remove the definition of Py_LIMITED_API here.
+
+   See also 'py_limited_api' in cffi/setuptools_ext.py.
+*/
+#if !defined(_CFFI_USE_EMBEDDING) && !defined(Py_LIMITED_API)
+#  ifdef _MSC_VER
+#    if !defined(_DEBUG) && !defined(Py_DEBUG) && !defined(Py_TRACE_REFS) && !defined(Py_REF_DEBUG) && !defined(_CFFI_NO_LIMITED_API)
+#      if !defined(Py_GIL_DISABLED)
+#        define Py_LIMITED_API
+#      else
+#        define Py_LIMITED_API 0x030f0000
+#      endif
+#    endif
+
+#    include <pyconfig.h>
+     /* sanity-check: Py_LIMITED_API will cause crashes if any of these
+        are also defined.  Normally, the Python file PC/pyconfig.h does not
+        cause any of these to be defined, with the exception that _DEBUG
+        causes Py_DEBUG.  Double-check that. */
+#    ifdef Py_LIMITED_API
+#      if defined(Py_DEBUG)
+#        error "pyconfig.h unexpectedly defines Py_DEBUG, but Py_LIMITED_API is set"
+#      endif
+#      if defined(Py_TRACE_REFS)
+#        error "pyconfig.h unexpectedly defines Py_TRACE_REFS, but Py_LIMITED_API is set"
+#      endif
+#      if defined(Py_REF_DEBUG)
+#        error "pyconfig.h unexpectedly defines Py_REF_DEBUG, but Py_LIMITED_API is set"
+#      endif
+#    endif
+#  else
+#    include <pyconfig.h>
+#    if !defined(Py_DEBUG) && !defined(Py_TRACE_REFS) && !defined(Py_REF_DEBUG) && !defined(_CFFI_NO_LIMITED_API)
+#      if !defined(Py_GIL_DISABLED)
+#        define Py_LIMITED_API
+#      else
+#        define Py_LIMITED_API 0x030f0000
+#      endif
+#    endif
+#  endif
+#endif
+
+#include <Python.h>
+#ifdef __cplusplus
+extern "C" {
+#endif
+#include <stddef.h>
+#include <stdlib.h>
+#include <string.h>
+
+
+/* This part is from file 'cffi/parse_c_type.h'.  It is copied at the
+   beginning of C sources generated by CFFI's ffi.set_source(). */
+
+typedef void *_cffi_opcode_t;
+
+#define _CFFI_OP(opcode, arg)   (_cffi_opcode_t)(opcode | (((uintptr_t)(arg)) << 8))
+#define _CFFI_GETOP(cffi_opcode)    ((unsigned char)(uintptr_t)cffi_opcode)
+#define _CFFI_GETARG(cffi_opcode)   (((intptr_t)cffi_opcode) >> 8)
+
+#define _CFFI_OP_PRIMITIVE       1
+#define _CFFI_OP_POINTER         3
+#define _CFFI_OP_ARRAY           5
+#define _CFFI_OP_OPEN_ARRAY      7
+#define _CFFI_OP_STRUCT_UNION    9
+#define _CFFI_OP_ENUM           11
+#define _CFFI_OP_FUNCTION       13
+#define _CFFI_OP_FUNCTION_END   15
+#define _CFFI_OP_NOOP           17
+#define _CFFI_OP_BITFIELD       19
+#define _CFFI_OP_TYPENAME       21
+#define _CFFI_OP_CPYTHON_BLTN_V 23   // varargs
+#define _CFFI_OP_CPYTHON_BLTN_N 25   // noargs
+#define _CFFI_OP_CPYTHON_BLTN_O 27   // O  (i.e. a single arg)
+#define _CFFI_OP_CONSTANT       29
+#define _CFFI_OP_CONSTANT_INT   31
+#define _CFFI_OP_GLOBAL_VAR     33
+#define _CFFI_OP_DLOPEN_FUNC    35
+#define _CFFI_OP_DLOPEN_CONST   37
+#define _CFFI_OP_GLOBAL_VAR_F   39
+#define _CFFI_OP_EXTERN_PYTHON  41
+
+#define _CFFI_PRIM_VOID          0
+#define _CFFI_PRIM_BOOL          1
+#define _CFFI_PRIM_CHAR          2
+#define _CFFI_PRIM_SCHAR         3
+#define _CFFI_PRIM_UCHAR         4
+#define _CFFI_PRIM_SHORT         5
+#define _CFFI_PRIM_USHORT        6
+#define _CFFI_PRIM_INT           7
+#define _CFFI_PRIM_UINT          8
+#define _CFFI_PRIM_LONG          9
+#define _CFFI_PRIM_ULONG        10
+#define _CFFI_PRIM_LONGLONG     11
+#define _CFFI_PRIM_ULONGLONG    12
+#define _CFFI_PRIM_FLOAT        13
+#define _CFFI_PRIM_DOUBLE       14
+#define _CFFI_PRIM_LONGDOUBLE   15
+
+#define _CFFI_PRIM_WCHAR        16
+#define _CFFI_PRIM_INT8         17
+#define _CFFI_PRIM_UINT8        18
+#define _CFFI_PRIM_INT16        19
+#define _CFFI_PRIM_UINT16       20
+#define _CFFI_PRIM_INT32        21
+#define _CFFI_PRIM_UINT32       22
+#define _CFFI_PRIM_INT64        23
+#define _CFFI_PRIM_UINT64       24
+#define _CFFI_PRIM_INTPTR       25
+#define _CFFI_PRIM_UINTPTR      26
+#define _CFFI_PRIM_PTRDIFF      27
+#define _CFFI_PRIM_SIZE         28
+#define _CFFI_PRIM_SSIZE        29
+#define _CFFI_PRIM_INT_LEAST8   30
+#define _CFFI_PRIM_UINT_LEAST8  31
+#define _CFFI_PRIM_INT_LEAST16  32
+#define _CFFI_PRIM_UINT_LEAST16 33
+#define _CFFI_PRIM_INT_LEAST32  34
+#define _CFFI_PRIM_UINT_LEAST32 35
+#define _CFFI_PRIM_INT_LEAST64  36
+#define _CFFI_PRIM_UINT_LEAST64 37
+#define _CFFI_PRIM_INT_FAST8    38
+#define _CFFI_PRIM_UINT_FAST8   39
+#define _CFFI_PRIM_INT_FAST16   40
+#define _CFFI_PRIM_UINT_FAST16  41
+#define _CFFI_PRIM_INT_FAST32   42
+#define _CFFI_PRIM_UINT_FAST32  43
+#define _CFFI_PRIM_INT_FAST64   44
+#define _CFFI_PRIM_UINT_FAST64  45
+#define _CFFI_PRIM_INTMAX       46
+#define _CFFI_PRIM_UINTMAX      47
+#define _CFFI_PRIM_FLOATCOMPLEX 48
+#define _CFFI_PRIM_DOUBLECOMPLEX 49
+#define _CFFI_PRIM_CHAR16       50
+#define _CFFI_PRIM_CHAR32       51
+
+#define _CFFI__NUM_PRIM         52
+#define _CFFI__UNKNOWN_PRIM           (-1)
+#define _CFFI__UNKNOWN_FLOAT_PRIM     (-2)
+#define _CFFI__UNKNOWN_LONG_DOUBLE    (-3)
+
+#define _CFFI__IO_FILE_STRUCT         (-1)
+
+
+struct _cffi_global_s {
+    const char *name;
+    void *address;
+    _cffi_opcode_t type_op;
+    void *size_or_direct_fn;  // OP_GLOBAL_VAR: size, or 0 if unknown
+                              // OP_CPYTHON_BLTN_*: addr of direct function
+};
+
+struct _cffi_getconst_s {
+    unsigned long long value;
+    const struct _cffi_type_context_s *ctx;
+    int gindex;
+};
+
+struct _cffi_struct_union_s {
+    const char *name;
+    int type_index;          // -> _cffi_types, on a OP_STRUCT_UNION
+    int flags;               // _CFFI_F_* flags below
+    size_t size;
+    int alignment;
+    int first_field_index;   // -> _cffi_fields array
+    int num_fields;
+};
+#define _CFFI_F_UNION         0x01   // is a union, not a struct
+#define _CFFI_F_CHECK_FIELDS  0x02   // complain if fields are not in the
+                                     // "standard layout" or if some are missing
+#define _CFFI_F_PACKED        0x04   // for CHECK_FIELDS, assume a packed struct
+#define _CFFI_F_EXTERNAL      0x08   // in some other ffi.include()
+#define _CFFI_F_OPAQUE        0x10   // opaque
+
+struct _cffi_field_s {
+    const char *name;
+    size_t field_offset;
+    size_t field_size;
+    _cffi_opcode_t field_type_op;
+};
+
+struct _cffi_enum_s {
+    const char *name;
+    int type_index;          // -> _cffi_types, on a OP_ENUM
+    int type_prim;           // _CFFI_PRIM_xxx
+    const char *enumerators; // comma-delimited string
+};
+
+struct _cffi_typename_s {
+    const char *name;
+    int type_index;   /* if opaque, points to a possibly artificial
+                         OP_STRUCT which is itself opaque */
+};
+
+struct _cffi_type_context_s {
+    _cffi_opcode_t *types;
+    const struct _cffi_global_s *globals;
+    const struct _cffi_field_s *fields;
+    const struct _cffi_struct_union_s *struct_unions;
+    const struct _cffi_enum_s *enums;
+    const struct _cffi_typename_s *typenames;
+    int num_globals;
+    int num_struct_unions;
+    int num_enums;
+    int num_typenames;
+    const char *const *includes;
+    int num_types;
+    int flags;      /* future extension */
+};
+
+struct _cffi_parse_info_s {
+    const struct _cffi_type_context_s *ctx;
+    _cffi_opcode_t *output;
+    unsigned int output_size;
+    size_t error_location;
+    const char *error_message;
+};
+
+struct _cffi_externpy_s {
+    const char *name;
+    size_t size_of_result;
+    void *reserved1, *reserved2;
+};
+
+#ifdef _CFFI_INTERNAL
+static int parse_c_type(struct _cffi_parse_info_s *info, const char *input);
+static int search_in_globals(const struct _cffi_type_context_s *ctx,
+                             const char *search, size_t search_len);
+static int search_in_struct_unions(const struct _cffi_type_context_s *ctx,
+                                   const char *search, size_t search_len);
+#endif
+
+/* this block of #ifs should be kept exactly identical between
+   c/_cffi_backend.c, cffi/vengine_cpy.py, cffi/vengine_gen.py
+   and cffi/_cffi_include.h */
+#if defined(_MSC_VER)
+# include <malloc.h>   /* for alloca() */
+# if _MSC_VER < 1600   /* MSVC < 2010 */
+   typedef __int8 int8_t;
+   typedef __int16 int16_t;
+   typedef __int32 int32_t;
+   typedef __int64 int64_t;
+   typedef unsigned __int8 uint8_t;
+   typedef unsigned __int16 uint16_t;
+   typedef unsigned __int32 uint32_t;
+   typedef unsigned __int64 uint64_t;
+   typedef __int8 int_least8_t;
+   typedef __int16 int_least16_t;
+   typedef __int32 int_least32_t;
+   typedef __int64 int_least64_t;
+   typedef unsigned __int8 uint_least8_t;
+   typedef unsigned __int16 uint_least16_t;
+   typedef unsigned __int32 uint_least32_t;
+   typedef unsigned __int64 uint_least64_t;
+   typedef __int8 int_fast8_t;
+   typedef __int16 int_fast16_t;
+   typedef __int32 int_fast32_t;
+   typedef __int64 int_fast64_t;
+   typedef unsigned __int8 uint_fast8_t;
+   typedef unsigned __int16 uint_fast16_t;
+   typedef unsigned __int32 uint_fast32_t;
+   typedef unsigned __int64 uint_fast64_t;
+   typedef __int64 intmax_t;
+   typedef unsigned __int64 uintmax_t;
+# else
+#  include <stdint.h>
+# endif
+# if _MSC_VER < 1800   /* MSVC < 2013 */
+#  ifndef __cplusplus
+    typedef unsigned char _Bool;
+#  endif
+# endif
+# define _cffi_float_complex_t   _Fcomplex    /* include <complex.h> for it */
+# define _cffi_double_complex_t  _Dcomplex    /* include <complex.h> for it */
+#else
+# include <stdint.h>
+# if (defined (__SVR4) && defined (__sun)) || defined(_AIX) || defined(__hpux)
+#  include <alloca.h>
+# endif
+# define _cffi_float_complex_t   float _Complex
+# define _cffi_double_complex_t  double _Complex
+#endif
+
+#ifdef __GNUC__
+# define _CFFI_UNUSED_FN  __attribute__((unused))
+#else
+# define _CFFI_UNUSED_FN  /* nothing */
+#endif
+
+#ifdef __cplusplus
+# ifndef _Bool
+   typedef bool _Bool;   /* semi-hackish: C++ has no _Bool; bool is builtin */
+# endif
+#endif
+
+/**********  CPython-specific section  **********/
+#ifndef PYPY_VERSION
+
+
+#define _cffi_from_c_double PyFloat_FromDouble
+#define _cffi_from_c_float PyFloat_FromDouble
+#define _cffi_from_c_long PyLong_FromLong
+#define _cffi_from_c_ulong PyLong_FromUnsignedLong
+#define _cffi_from_c_longlong PyLong_FromLongLong
+#define _cffi_from_c_ulonglong PyLong_FromUnsignedLongLong
+#define _cffi_from_c__Bool PyBool_FromLong
+
+#define _cffi_to_c_double PyFloat_AsDouble
+#define _cffi_to_c_float PyFloat_AsDouble
+
+#define _cffi_from_c_int(x, type)                                        \
+    (((type)-1) > 0 ? /* unsigned */                                     \
+        (sizeof(type) < sizeof(long) ?                                   \
+            PyLong_FromLong((long)x) :                                   \
+         sizeof(type) == sizeof(long) ?                                  \
+            PyLong_FromUnsignedLong((unsigned long)x) :                  \
+            PyLong_FromUnsignedLongLong((unsigned long long)x)) :        \
+        (sizeof(type) <= sizeof(long) ?                                  \
+            PyLong_FromLong((long)x) :                                   \
+            PyLong_FromLongLong((long long)x)))
+
+#define _cffi_to_c_int(o, type)                                          \
+    ((type)(                                                             \
+     sizeof(type) == 1 ? (((type)-1) > 0 ? (type)_cffi_to_c_u8(o)        \
+                                         : (type)_cffi_to_c_i8(o)) :     \
+     sizeof(type) == 2 ? (((type)-1) > 0 ? (type)_cffi_to_c_u16(o)       \
+                                         : (type)_cffi_to_c_i16(o)) :    \
+     sizeof(type) == 4 ? (((type)-1) > 0 ? (type)_cffi_to_c_u32(o)       \
+                                         : (type)_cffi_to_c_i32(o)) :    \
+     sizeof(type) == 8 ? (((type)-1) > 0 ? (type)_cffi_to_c_u64(o)       \
+                                         : (type)_cffi_to_c_i64(o)) :    \
+     (Py_FatalError("unsupported size for type " #type), (type)0)))
+
+#define _cffi_to_c_i8                                                    \
+                 ((int(*)(PyObject *))_cffi_exports[1])
+#define _cffi_to_c_u8                                                    \
+                 ((int(*)(PyObject *))_cffi_exports[2])
+#define _cffi_to_c_i16                                                   \
+                 ((int(*)(PyObject *))_cffi_exports[3])
+#define _cffi_to_c_u16                                                   \
+                 ((int(*)(PyObject *))_cffi_exports[4])
+#define _cffi_to_c_i32                                                   \
+                 ((int(*)(PyObject *))_cffi_exports[5])
+#define _cffi_to_c_u32                                                   \
+                 ((unsigned int(*)(PyObject *))_cffi_exports[6])
+#define _cffi_to_c_i64                                                   \
+                 ((long long(*)(PyObject *))_cffi_exports[7])
+#define _cffi_to_c_u64                                                   \
+                 ((unsigned long long(*)(PyObject *))_cffi_exports[8])
+#define _cffi_to_c_char                                                  \
+                 ((int(*)(PyObject *))_cffi_exports[9])
+#define _cffi_from_c_pointer                                             \
+    ((PyObject *(*)(char *, struct _cffi_ctypedescr *))_cffi_exports[10])
+#define _cffi_to_c_pointer                                               \
+    ((char *(*)(PyObject *, struct _cffi_ctypedescr *))_cffi_exports[11])
+#define _cffi_get_struct_layout                                          \
+    not used any more
+#define _cffi_restore_errno                                              \
+    ((void(*)(void))_cffi_exports[13])
+#define _cffi_save_errno                                                 \
+    ((void(*)(void))_cffi_exports[14])
+#define _cffi_from_c_char                                                \
+    ((PyObject *(*)(char))_cffi_exports[15])
+#define _cffi_from_c_deref                                               \
+    ((PyObject *(*)(char *, struct _cffi_ctypedescr *))_cffi_exports[16])
+#define _cffi_to_c                                                       \
+    ((int(*)(char *, struct _cffi_ctypedescr *, PyObject *))_cffi_exports[17])
+#define _cffi_from_c_struct                                              \
+    ((PyObject *(*)(char *, struct _cffi_ctypedescr *))_cffi_exports[18])
+#define _cffi_to_c_wchar_t                                               \
+    ((_cffi_wchar_t(*)(PyObject *))_cffi_exports[19])
+#define _cffi_from_c_wchar_t                                             \
+    ((PyObject *(*)(_cffi_wchar_t))_cffi_exports[20])
+#define _cffi_to_c_long_double                                           \
+    ((long double(*)(PyObject *))_cffi_exports[21])
+#define _cffi_to_c__Bool                                                 \
+    ((_Bool(*)(PyObject *))_cffi_exports[22])
+#define _cffi_prepare_pointer_call_argument                              \
+    ((Py_ssize_t(*)(struct _cffi_ctypedescr *,                           \
+                    PyObject *, char **))_cffi_exports[23])
+#define _cffi_convert_array_from_object                                  \
+    ((int(*)(char *, struct _cffi_ctypedescr *, PyObject *))_cffi_exports[24])
+#define _CFFI_CPIDX  25
+#define _cffi_call_python                                                \
+    ((void(*)(struct _cffi_externpy_s *, char *))_cffi_exports[_CFFI_CPIDX])
+#define _cffi_to_c_wchar3216_t                                           \
+    ((int(*)(PyObject *))_cffi_exports[26])
+#define _cffi_from_c_wchar3216_t                                         \
+    ((PyObject *(*)(int))_cffi_exports[27])
+#define _CFFI_NUM_EXPORTS 28
+
+struct _cffi_ctypedescr;
+
+static void *_cffi_exports[_CFFI_NUM_EXPORTS];
+
+#define _cffi_type(index)   (                           \
+    assert((((uintptr_t)_cffi_types[index]) & 1) == 0), \
+    (struct _cffi_ctypedescr *)_cffi_types[index])
+
+static PyObject *_cffi_init(const char *module_name, Py_ssize_t version,
+                            const struct _cffi_type_context_s *ctx)
+{
+    PyObject *module, *o_arg, *new_module;
+    void *raw[] = {
+        (void *)module_name,
+        (void *)version,
+        (void *)_cffi_exports,
+        (void *)ctx,
+    };
+
+    module = PyImport_ImportModule("_cffi_backend");
+    if (module == NULL)
+        goto failure;
+
+    o_arg = PyLong_FromVoidPtr((void *)raw);
+    if (o_arg == NULL)
+        goto failure;
+
+    new_module = PyObject_CallMethod(
+        module, (char *)"_init_cffi_1_0_external_module", (char *)"O", o_arg);
+
+    Py_DECREF(o_arg);
+    Py_DECREF(module);
+    return new_module;
+
+  failure:
+    Py_XDECREF(module);
+    return NULL;
+}
+
+
+#ifdef HAVE_WCHAR_H
+typedef wchar_t _cffi_wchar_t;
+#else
+typedef uint16_t _cffi_wchar_t;   /* same random pick as _cffi_backend.c */
+#endif
+
+_CFFI_UNUSED_FN static uint16_t _cffi_to_c_char16_t(PyObject *o)
+{
+    if (sizeof(_cffi_wchar_t) == 2)
+        return (uint16_t)_cffi_to_c_wchar_t(o);
+    else
+        return (uint16_t)_cffi_to_c_wchar3216_t(o);
+}
+
+_CFFI_UNUSED_FN static PyObject *_cffi_from_c_char16_t(uint16_t x)
+{
+    if (sizeof(_cffi_wchar_t) == 2)
+        return _cffi_from_c_wchar_t((_cffi_wchar_t)x);
+    else
+        return _cffi_from_c_wchar3216_t((int)x);
+}
+
+_CFFI_UNUSED_FN static int _cffi_to_c_char32_t(PyObject *o)
+{
+    if (sizeof(_cffi_wchar_t) == 4)
+        return (int)_cffi_to_c_wchar_t(o);
+    else
+        return (int)_cffi_to_c_wchar3216_t(o);
+}
+
+_CFFI_UNUSED_FN static PyObject *_cffi_from_c_char32_t(unsigned int x)
+{
+    if (sizeof(_cffi_wchar_t) == 4)
+        return _cffi_from_c_wchar_t((_cffi_wchar_t)x);
+    else
+        return _cffi_from_c_wchar3216_t((int)x);
+}
+
+union _cffi_union_alignment_u {
+    unsigned char m_char;
+    unsigned short m_short;
+    unsigned int m_int;
+    unsigned long m_long;
+    unsigned long long m_longlong;
+    float m_float;
+    double m_double;
+    long double m_longdouble;
+};
+
+struct _cffi_freeme_s {
+    struct _cffi_freeme_s *next;
+    union _cffi_union_alignment_u alignment;
+};
+
+_CFFI_UNUSED_FN static int
+_cffi_convert_array_argument(struct _cffi_ctypedescr *ctptr, PyObject *arg,
+                             char **output_data, Py_ssize_t datasize,
+                             struct _cffi_freeme_s **freeme)
+{
+    char *p;
+    if (datasize < 0)
+        return -1;
+
+    p = *output_data;
+    if (p == NULL) {
+        struct _cffi_freeme_s *fp = (struct _cffi_freeme_s *)PyObject_Malloc(
+            offsetof(struct _cffi_freeme_s, alignment) + (size_t)datasize);
+        if (fp == NULL)
+            return -1;
+        fp->next = *freeme;
+        *freeme = fp;
+        p = *output_data = (char *)&fp->alignment;
+    }
+    memset((void *)p, 0, (size_t)datasize);
+    return _cffi_convert_array_from_object(p, ctptr, arg);
+}
+
+_CFFI_UNUSED_FN static void
+_cffi_free_array_arguments(struct _cffi_freeme_s *freeme)
+{
+    do {
+        void *p = (void *)freeme;
+        freeme = freeme->next;
+        PyObject_Free(p);
+    } while (freeme != NULL);
+}
+
+/**********  end CPython-specific section  **********/
+#else
+_CFFI_UNUSED_FN
+static void (*_cffi_call_python_org)(struct _cffi_externpy_s *, char *);
+# define _cffi_call_python  _cffi_call_python_org
+#endif
+
+
+#define _cffi_array_len(array)   (sizeof(array) / sizeof((array)[0]))
+
+#define _cffi_prim_int(size, sign)                                      \
+    ((size) == 1 ? ((sign) ? _CFFI_PRIM_INT8  : _CFFI_PRIM_UINT8)  :    \
+     (size) == 2 ? ((sign) ? _CFFI_PRIM_INT16 : _CFFI_PRIM_UINT16) :    \
+     (size) == 4 ? ((sign) ? _CFFI_PRIM_INT32 : _CFFI_PRIM_UINT32) :    \
+     (size) == 8 ? ((sign) ? _CFFI_PRIM_INT64 : _CFFI_PRIM_UINT64) :    \
+     _CFFI__UNKNOWN_PRIM)
+
+#define _cffi_prim_float(size)                                          \
+    ((size) == sizeof(float) ? _CFFI_PRIM_FLOAT :                       \
+     (size) == sizeof(double) ? _CFFI_PRIM_DOUBLE :                     \
+     (size) == sizeof(long double) ? _CFFI__UNKNOWN_LONG_DOUBLE :       \
+     _CFFI__UNKNOWN_FLOAT_PRIM)
+
+#define _cffi_check_int(got, got_nonpos, expected)      \
+    ((got_nonpos) == (expected <= 0) &&                 \
+     (got) == (unsigned long long)expected)
+
+#ifdef MS_WIN32
+# define _cffi_stdcall  __stdcall
+#else
+# define _cffi_stdcall  /* nothing */
+#endif
+
+#ifdef __cplusplus
+}
+#endif
+
+/************************************************************/
+
+
+#include <linux/fcntl.h>
+#include <sys/fanotify.h>
+
+#include <sys/stat.h>
+#include <sys/sysmacros.h>
+#include <limits.h>
+#include <string.h>
+#include <stdio.h>
+#include <errno.h>
+#include <unistd.h>
+#include <sys/uio.h>
+
+#ifndef FAN_MODIFY_DIR
+#define FAN_MODIFY_DIR 0x00040000
+#endif
+
+struct fanotify_event_info {
+    uint64_t mask;
+    int32_t fd;
+    int32_t pid;
+    uint32_t vers;
+    uint32_t reserved;
+};
+
+/* Walk a buffer read from a fanotify fd in a single pass, returning the
+ * amount of events decoded into 'events'. Decoding stops at the first
+ * truncated or malformed record (see FAN_EVENT_OK)
+ */
+static size_t fanotify_decode_events(const char *buf, size_t buf_len,
+                                     struct fanotify_event_info *events, size_t max_events) {
+    const size_t header_len = sizeof(struct fanotify_event_metadata);
+    size_t offset = 0;
+    size_t count = 0;
+
+    while (count < max_events && offset + header_len <= buf_len) {
+        struct fanotify_event_metadata event;
+
+        /* buffers handed to us from python have no alignment guarantees */
+        memcpy(&event, buf + offset, header_len);
+        if (event.event_len < header_len || event.event_len > buf_len - offset) {
+            break;
+        }
+        offset += event.event_len;
+
+        events[count].mask = event.mask;
+        events[count].fd = event.fd;
+        events[count].pid = event.pid;
+        events[count].vers = event.vers;
+        events[count].reserved = 0;
+        count++;
+    }
+
+    return count;
+}
+
+struct fanotify_file_id {
+    uint64_t dev;
+    uint64_t ino;
+    int64_t btime_ns;
+};
+
+/* stat each fd storing its device, inode and birth time in 'ids', fds
+ * that are invalid or cannot be stat'd get an id of 0/0/0. The birth time
+ * tells apart files that reuse the inode number of a deleted file, unlike
+ * the ctime it does not change when the file is written
+ */
+static void fanotify_stat_fds(const int32_t *fds, size_t n_fds, struct fanotify_file_id *ids) {
+    size_t i;
+#ifdef STATX_BTIME
+    struct statx stx;
+
+    for (i = 0; i < n_fds; i++) {
+        if (fds[i] >= 0 && statx(fds[i], "", AT_EMPTY_PATH, STATX_INO | STATX_BTIME, &stx) == 0) {
+            ids[i].dev = makedev(stx.stx_dev_major, stx.stx_dev_minor);
+            ids[i].ino = stx.stx_ino;
+            ids[i].btime_ns = (stx.stx_mask & STATX_BTIME) ?
+                (int64_t)stx.stx_btime.tv_sec * 1000000000 + stx.stx_btime.tv_nsec : 0;
+#else
+    struct stat st;
+
+    for (i = 0; i < n_fds; i++) {
+        if (fds[i] >= 0 && fstat(fds[i], &st) == 0) {
+            ids[i].dev = st.st_dev;
+            ids[i].ino = st.st_ino;
+            ids[i].btime_ns = 0;
+#endif
+        } else {
+            ids[i].dev = 0;
+            ids[i].ino = 0;
+            ids[i].btime_ns = 0;
+        }
+    }
+}
+
+/* Resolve each fd to the path it refers to by reading the link of the
+ * same name in proc_fd_dirfd (an open /proc/self/fd). The path for fds[i]
+ * is stored (without a NUL) at paths + i * path_size and its length in
+ * lengths[i], or -errno if it could not be read
+ */
+static void fanotify_readlink_fds(int proc_fd_dirfd, const int32_t *fds, size_t n_fds,
+                                  char *paths, size_t path_size, int32_t *lengths) {
+    size_t i;
+    char name[16];
+
+    for (i = 0; i < n_fds; i++) {
+        ssize_t len;
+
+        if (fds[i] < 0) {
+            lengths[i] = -EBADF;
+            continue;
+        }
+        snprintf(name, sizeof(name), "%d", fds[i]);
+        len = readlinkat(proc_fd_dirfd, name, paths + i * path_size, path_size);
+        if (len < 0) {
+            lengths[i] = -errno;
+        } else if ((size_t)len == path_size) {
+            lengths[i] = -ENAMETOOLONG;
+        } else {
+            lengths[i] = len;
+        }
+    }
+}
+
+/* Write every response with writev(), the kernel consumes one response
+ * per iovec so a batch costs one syscall per IOV_MAX responses rather than
+ * one each. A response that is rejected ends the writev early, its error
+ * is recorded in status[i] (0 on success, -errno on failure) and writing
+ * resumes with the next one. With close_fds set each response's event fd
+ * is closed afterwards. Returns the amount of responses accepted
+ */
+static size_t fanotify_respond_many(int fanotify_fd, struct fanotify_response *responses, size_t n_responses,
+                                    int close_fds, int32_t *status) {
+    const size_t response_len = sizeof(struct fanotify_response);
+    struct iovec iov[IOV_MAX];
+    size_t accepted = 0;
+    size_t i = 0;
+
+    while (i < n_responses) {
+        size_t n_iov = n_responses - i < IOV_MAX ? n_responses - i : IOV_MAX;
+        size_t j;
+        ssize_t written;
+
+        for (j = 0; j < n_iov; j++) {
+            iov[j].iov_base = &responses[i + j];
+            iov[j].iov_len = response_len;
+        }
+
+        written = writev(fanotify_fd, iov, n_iov);
+        if (written < 0) {
+            if (errno == EINTR) {
+                continue;
+            }
+            /* the first response was rejected, skip over it */
+            status[i] = -errno;
+            i++;
+            continue;
+        }
+
+        for (j = 0; j < (size_t)written / response_len; j++) {
+            status[i++] = 0;
+            accepted++;
+        }
+    }
+
+    if (close_fds) {
+        for (i = 0; i < n_responses; i++) {
+            if (responses[i].fd >= 0) {
+                close(responses[i].fd);
+            }
+        }
+    }
+
+    return accepted;
+}
+
+
+/************************************************************/
+
+static void *_cffi_types[] = {
+/*  0 */ _CFFI_OP(_CFFI_OP_FUNCTION, 1), // int()(int, unsigned int, uint64_t, int, char const *)
+/*  1 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7), // int
+/*  2 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 8), // unsigned int
+/*  3 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 24), // uint64_t
+/*  4 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/*  5 */ _CFFI_OP(_CFFI_OP_POINTER, 37), // char const *
+/*  6 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/*  7 */ _CFFI_OP(_CFFI_OP_FUNCTION, 1), // int()(unsigned int, unsigned int)
+/*  8 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 8),
+/*  9 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 8),
+/* 10 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 11 */ _CFFI_OP(_CFFI_OP_FUNCTION, 13), // size_t()(char const *, size_t, struct fanotify_event_info *, size_t)
+/* 12 */ _CFFI_OP(_CFFI_OP_NOOP, 5),
+/* 13 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 28), // size_t
+/* 14 */ _CFFI_OP(_CFFI_OP_POINTER, 40), // struct fanotify_event_info *
+/* 15 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 28),
+/* 16 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 17 */ _CFFI_OP(_CFFI_OP_FUNCTION, 13), // size_t()(int, struct fanotify_response *, size_t, int, int32_t *)
+/* 18 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 19 */ _CFFI_OP(_CFFI_OP_POINTER, 43), // struct fanotify_response *
+/* 20 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 28),
+/* 21 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 22 */ _CFFI_OP(_CFFI_OP_POINTER, 38), // int32_t *
+/* 23 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 24 */ _CFFI_OP(_CFFI_OP_FUNCTION, 47), // void()(int, int32_t const *, size_t, char *, size_t, int32_t *)
+/* 25 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 26 */ _CFFI_OP(_CFFI_OP_POINTER, 38), // int32_t const *
+/* 27 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 28),
+/* 28 */ _CFFI_OP(_CFFI_OP_POINTER, 37), // char *
+/* 29 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 28),
+/* 30 */ _CFFI_OP(_CFFI_OP_NOOP, 22),
+/* 31 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 32 */ _CFFI_OP(_CFFI_OP_FUNCTION, 47), // void()(int32_t const *, size_t, struct fanotify_file_id *)
+/* 33 */ _CFFI_OP(_CFFI_OP_NOOP, 26),
+/* 34 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 28),
+/* 35 */ _CFFI_OP(_CFFI_OP_POINTER, 42), // struct fanotify_file_id *
+/* 36 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 37 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 2), // char
+/* 38 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 21), // int32_t
+/* 39 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 23), // int64_t
+/* 40 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 0), // struct fanotify_event_info
+/* 41 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 1), // struct fanotify_event_metadata
+/* 42 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 2), // struct fanotify_file_id
+/* 43 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 3), // struct fanotify_response
+/* 44 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 20), // uint16_t
+/* 45 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 22), // uint32_t
+/* 46 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 18), // uint8_t
+/* 47 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 0), // void
+};
+
+static size_t _cffi_d_fanotify_decode_events(char const * x0, size_t x1, struct fanotify_event_info * x2, size_t x3)
+{
+  return fanotify_decode_events(x0, x1, x2, x3);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_fanotify_decode_events(PyObject *self, PyObject *args)
+{
+  char const * x0;
+  size_t x1;
+  struct fanotify_event_info * x2;
+  size_t x3;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  size_t result;
+  PyObject *pyresult;
+  PyObject *arg0;
+  PyObject *arg1;
+  PyObject *arg2;
+  PyObject *arg3;
+
+  if (!PyArg_UnpackTuple(args, "fanotify_decode_events", 4, 4, &arg0, &arg1, &arg2, &arg3))
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(5), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (char const *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(5), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x1 = _cffi_to_c_int(arg1, size_t);
+  if (x1 == (size_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(14), arg2, (char **)&x2);
+  if (datasize != 0) {
+    x2 = ((size_t)datasize) <= 640 ? (struct fanotify_event_info *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(14), arg2, (char **)&x2,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x3 = _cffi_to_c_int(arg3, size_t);
+  if (x3 == (size_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = fanotify_decode_events(x0, x1, x2, x3); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_int(result, size_t);
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  return pyresult;
+}
+#else
+#  define _cffi_f_fanotify_decode_events _cffi_d_fanotify_decode_events
+#endif
+
+static int _cffi_d_fanotify_init(unsigned int x0, unsigned int x1)
+{
+  return fanotify_init(x0, x1);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_fanotify_init(PyObject *self, PyObject *args)
+{
+  unsigned int x0;
+  unsigned int x1;
+  int result;
+  PyObject *pyresult;
+  PyObject *arg0;
+  PyObject *arg1;
+
+  if (!PyArg_UnpackTuple(args, "fanotify_init", 2, 2, &arg0, &arg1))
+    return NULL;
+
+  x0 = _cffi_to_c_int(arg0, unsigned int);
+  if (x0 == (unsigned int)-1 && PyErr_Occurred())
+    return NULL;
+
+  x1 = _cffi_to_c_int(arg1, unsigned int);
+  if (x1 == (unsigned int)-1 && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = fanotify_init(x0, x1); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_int(result, int);
+  return pyresult;
+}
+#else
+#  define _cffi_f_fanotify_init _cffi_d_fanotify_init
+#endif
+
+static int _cffi_d_fanotify_mark(int x0, unsigned int x1, uint64_t x2, int x3, char const * x4)
+{
+  return fanotify_mark(x0, x1, x2, x3, x4);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_fanotify_mark(PyObject *self, PyObject *args)
+{
+  int x0;
+  unsigned int x1;
+  uint64_t x2;
+  int x3;
+  char const * x4;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  int result;
+  PyObject *pyresult;
+  PyObject *arg0;
+  PyObject *arg1;
+  PyObject *arg2;
+  PyObject *arg3;
+  PyObject *arg4;
+
+  if (!PyArg_UnpackTuple(args, "fanotify_mark", 5, 5, &arg0, &arg1, &arg2, &arg3, &arg4))
+    return NULL;
+
+  x0 = _cffi_to_c_int(arg0, int);
+  if (x0 == (int)-1 && PyErr_Occurred())
+    return NULL;
+
+  x1 = _cffi_to_c_int(arg1, unsigned int);
+  if (x1 == (unsigned int)-1 && PyErr_Occurred())
+    return NULL;
+
+  x2 = _cffi_to_c_int(arg2, uint64_t);
+  if (x2 == (uint64_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  x3 = _cffi_to_c_int(arg3, int);
+  if (x3 == (int)-1 && PyErr_Occurred())
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(5), arg4, (char **)&x4);
+  if (datasize != 0) {
+    x4 = ((size_t)datasize) <= 640 ? (char const *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(5), arg4, (char **)&x4,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = fanotify_mark(x0, x1, x2, x3, x4); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_int(result, int);
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  return pyresult;
+}
+#else
+#  define _cffi_f_fanotify_mark _cffi_d_fanotify_mark
+#endif
+
+static void _cffi_d_fanotify_readlink_fds(int x0, int32_t const * x1, size_t x2, char * x3, size_t x4, int32_t * x5)
+{
+  fanotify_readlink_fds(x0, x1, x2, x3, x4, x5);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_fanotify_readlink_fds(PyObject *self, PyObject *args)
+{
+  int x0;
+  int32_t const * x1;
+  size_t x2;
+  char * x3;
+  size_t x4;
+  int32_t * x5;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  PyObject *arg0;
+  PyObject *arg1;
+  PyObject *arg2;
+  PyObject *arg3;
+  PyObject *arg4;
+  PyObject *arg5;
+
+  if (!PyArg_UnpackTuple(args, "fanotify_readlink_fds", 6, 6, &arg0, &arg1, &arg2, &arg3, &arg4, &arg5))
+    return NULL;
+
+  x0 = _cffi_to_c_int(arg0, int);
+  if (x0 == (int)-1 && PyErr_Occurred())
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(26), arg1, (char **)&x1);
+  if (datasize != 0) {
+    x1 = ((size_t)datasize) <= 640 ? (int32_t const *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(26), arg1, (char **)&x1,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x2 = _cffi_to_c_int(arg2, size_t);
+  if (x2 == (size_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(28), arg3, (char **)&x3);
+  if (datasize != 0) {
+    x3 = ((size_t)datasize) <= 640 ? (char *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(28), arg3, (char **)&x3,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x4 = _cffi_to_c_int(arg4, size_t);
+  if (x4 == (size_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(22), arg5, (char **)&x5);
+  if (datasize != 0) {
+    x5 = ((size_t)datasize) <= 640 ? (int32_t *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(22), arg5, (char **)&x5,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { fanotify_readlink_fds(x0, x1, x2, x3, x4, x5); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  Py_INCREF(Py_None);
+  return Py_None;
+}
+#else
+#  define _cffi_f_fanotify_readlink_fds _cffi_d_fanotify_readlink_fds
+#endif
+
+static size_t _cffi_d_fanotify_respond_many(int x0, struct fanotify_response * x1, size_t x2, int x3, int32_t * x4)
+{
+  return fanotify_respond_many(x0, x1, x2, x3, x4);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_fanotify_respond_many(PyObject *self, PyObject *args)
+{
+  int x0;
+  struct fanotify_response * x1;
+  size_t x2;
+  int x3;
+  int32_t * x4;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  size_t result;
+  PyObject *pyresult;
+  PyObject *arg0;
+  PyObject *arg1;
+  PyObject *arg2;
+  PyObject *arg3;
+  PyObject *arg4;
+
+  if (!PyArg_UnpackTuple(args, "fanotify_respond_many", 5, 5, &arg0, &arg1, &arg2, &arg3, &arg4))
+    return NULL;
+
+  x0 = _cffi_to_c_int(arg0, int);
+  if (x0 == (int)-1 && PyErr_Occurred())
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(19), arg1, (char **)&x1);
+  if (datasize != 0) {
+    x1 = ((size_t)datasize) <= 640 ? (struct fanotify_response *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(19), arg1, (char **)&x1,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x2 = _cffi_to_c_int(arg2, size_t);
+  if (x2 == (size_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  x3 = _cffi_to_c_int(arg3, int);
+  if (x3 == (int)-1 && PyErr_Occurred())
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(22), arg4, (char **)&x4);
+  if (datasize != 0) {
+    x4 = ((size_t)datasize) <= 640 ? (int32_t *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(22), arg4, (char **)&x4,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = fanotify_respond_many(x0, x1, x2, x3, x4); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_int(result, size_t);
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  return pyresult;
+}
+#else
+#  define _cffi_f_fanotify_respond_many _cffi_d_fanotify_respond_many
+#endif
+
+static void _cffi_d_fanotify_stat_fds(int32_t const * x0, size_t x1, struct fanotify_file_id * x2)
+{
+  fanotify_stat_fds(x0, x1, x2);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_fanotify_stat_fds(PyObject *self, PyObject *args)
+{
+  int32_t const * x0;
+  size_t x1;
+  struct fanotify_file_id * x2;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  PyObject *arg0;
+  PyObject *arg1;
+  PyObject *arg2;
+
+  if (!PyArg_UnpackTuple(args, "fanotify_stat_fds", 3, 3, &arg0, &arg1, &arg2))
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(26), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (int32_t const *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(26), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x1 = _cffi_to_c_int(arg1, size_t);
+  if (x1 == (size_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(35), arg2, (char **)&x2);
+  if (datasize != 0) {
+    x2 = ((size_t)datasize) <= 640 ? (struct fanotify_file_id *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(35), arg2, (char **)&x2,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { fanotify_stat_fds(x0, x1, x2); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  Py_INCREF(Py_None);
+  return Py_None;
+}
+#else
+#  define _cffi_f_fanotify_stat_fds _cffi_d_fanotify_stat_fds
+#endif
+
+static int _cffi_const_FAN_ACCESS(unsigned long long *o)
+{
+  int n = (FAN_ACCESS) <= 0;
+  *o = (unsigned long long)((FAN_ACCESS) | 0);  /* check that FAN_ACCESS is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_ACCESS_PERM(unsigned long long *o)
+{
+  int n = (FAN_ACCESS_PERM) <= 0;
+  *o = (unsigned long long)((FAN_ACCESS_PERM) | 0);  /* check that FAN_ACCESS_PERM is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_ALLOW(unsigned long long *o)
+{
+  int n = (FAN_ALLOW) <= 0;
+  *o = (unsigned long long)((FAN_ALLOW) | 0);  /* check that FAN_ALLOW is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_ALL_EVENTS(unsigned long long *o)
+{
+  int n = (FAN_ALL_EVENTS) <= 0;
+  *o = (unsigned long long)((FAN_ALL_EVENTS) | 0);  /* check that FAN_ALL_EVENTS is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_ALL_MARK_FLAGS(unsigned long long *o)
+{
+  int n = (FAN_ALL_MARK_FLAGS) <= 0;
+  *o = (unsigned long long)((FAN_ALL_MARK_FLAGS) | 0);  /* check that FAN_ALL_MARK_FLAGS is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_CLASS_CONTENT(unsigned long long *o)
+{
+  int n = (FAN_CLASS_CONTENT) <= 0;
+  *o = (unsigned long long)((FAN_CLASS_CONTENT) | 0);  /* check that FAN_CLASS_CONTENT is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_CLASS_NOTIF(unsigned long long *o)
+{
+  int n = (FAN_CLASS_NOTIF) <= 0;
+  *o = (unsigned long long)((FAN_CLASS_NOTIF) | 0);  /* check that FAN_CLASS_NOTIF is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_CLASS_PRE_CONTENT(unsigned long long *o)
+{
+  int n = (FAN_CLASS_PRE_CONTENT) <= 0;
+  *o = (unsigned long long)((FAN_CLASS_PRE_CONTENT) | 0);  /* check that FAN_CLASS_PRE_CONTENT is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_CLOEXEC(unsigned long long *o)
+{
+  int n = (FAN_CLOEXEC) <= 0;
+  *o = (unsigned long long)((FAN_CLOEXEC) | 0);  /* check that FAN_CLOEXEC is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_CLOSE(unsigned long long *o)
+{
+  int n = (FAN_CLOSE) <= 0;
+  *o = (unsigned long long)((FAN_CLOSE) | 0);  /* check that FAN_CLOSE is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_CLOSE_NOWRITE(unsigned long long *o)
+{
+  int n = (FAN_CLOSE_NOWRITE) <= 0;
+  *o = (unsigned long long)((FAN_CLOSE_NOWRITE) | 0);  /* check that FAN_CLOSE_NOWRITE is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_CLOSE_WRITE(unsigned long long *o)
+{
+  int n = (FAN_CLOSE_WRITE) <= 0;
+  *o = (unsigned long long)((FAN_CLOSE_WRITE) | 0);  /* check that FAN_CLOSE_WRITE is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_DENY(unsigned long long *o)
+{
+  int n = (FAN_DENY) <= 0;
+  *o = (unsigned long long)((FAN_DENY) | 0);  /* check that FAN_DENY is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_EVENT_ON_CHILD(unsigned long long *o)
+{
+  int n = (FAN_EVENT_ON_CHILD) <= 0;
+  *o = (unsigned long long)((FAN_EVENT_ON_CHILD) | 0);  /* check that FAN_EVENT_ON_CHILD is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_MARK_ADD(unsigned long long *o)
+{
+  int n = (FAN_MARK_ADD) <= 0;
+  *o = (unsigned long long)((FAN_MARK_ADD) | 0);  /* check that FAN_MARK_ADD is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_MARK_DONT_FOLLOW(unsigned long long *o)
+{
+  int n = (FAN_MARK_DONT_FOLLOW) <= 0;
+  *o = (unsigned long long)((FAN_MARK_DONT_FOLLOW) | 0);  /* check that FAN_MARK_DONT_FOLLOW is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_MARK_FLUSH(unsigned long long *o)
+{
+  int n = (FAN_MARK_FLUSH) <= 0;
+  *o = (unsigned long long)((FAN_MARK_FLUSH) | 0);  /* check that FAN_MARK_FLUSH is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_MARK_IGNORED_MASK(unsigned long long *o)
+{
+  int n = (FAN_MARK_IGNORED_MASK) <= 0;
+  *o = (unsigned long long)((FAN_MARK_IGNORED_MASK) | 0);  /* check that FAN_MARK_IGNORED_MASK is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_MARK_IGNORED_SURV_MODIFY(unsigned long long *o)
+{
+  int n = (FAN_MARK_IGNORED_SURV_MODIFY) <= 0;
+  *o = (unsigned long long)((FAN_MARK_IGNORED_SURV_MODIFY) | 0);  /* check that FAN_MARK_IGNORED_SURV_MODIFY is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_MARK_MOUNT(unsigned long long *o)
+{
+  int n = (FAN_MARK_MOUNT) <= 0;
+  *o = (unsigned long long)((FAN_MARK_MOUNT) | 0);  /* check that FAN_MARK_MOUNT is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_MARK_ONLYDIR(unsigned long long *o)
+{
+  int n = (FAN_MARK_ONLYDIR) <= 0;
+  *o = (unsigned long long)((FAN_MARK_ONLYDIR) | 0);  /* check that FAN_MARK_ONLYDIR is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_MARK_REMOVE(unsigned long long *o)
+{
+  int n = (FAN_MARK_REMOVE) <= 0;
+  *o = (unsigned long long)((FAN_MARK_REMOVE) | 0);  /* check that FAN_MARK_REMOVE is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_MODIFY(unsigned long long *o)
+{
+  int n = (FAN_MODIFY) <= 0;
+  *o = (unsigned long long)((FAN_MODIFY) | 0);  /* check that FAN_MODIFY is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_MODIFY_DIR(unsigned long long *o)
+{
+  int n = (FAN_MODIFY_DIR) <= 0;
+  *o = (unsigned long long)((FAN_MODIFY_DIR) | 0);  /* check that FAN_MODIFY_DIR is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_NONBLOCK(unsigned long long *o)
+{
+  int n = (FAN_NONBLOCK) <= 0;
+  *o = (unsigned long long)((FAN_NONBLOCK) | 0);  /* check that FAN_NONBLOCK is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_ONDIR(unsigned long long *o)
+{
+  int n = (FAN_ONDIR) <= 0;
+  *o = (unsigned long long)((FAN_ONDIR) | 0);  /* check that FAN_ONDIR is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_OPEN(unsigned long long *o)
+{
+  int n = (FAN_OPEN) <= 0;
+  *o = (unsigned long long)((FAN_OPEN) | 0);  /* check that FAN_OPEN is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_OPEN_PERM(unsigned long long *o)
+{
+  int n = (FAN_OPEN_PERM) <= 0;
+  *o = (unsigned long long)((FAN_OPEN_PERM) | 0);  /* check that FAN_OPEN_PERM is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_Q_OVERFLOW(unsigned long long *o)
+{
+  int n = (FAN_Q_OVERFLOW) <= 0;
+  *o = (unsigned long long)((FAN_Q_OVERFLOW) | 0);  /* check that FAN_Q_OVERFLOW is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_UNLIMITED_MARKS(unsigned long long *o)
+{
+  int n = (FAN_UNLIMITED_MARKS) <= 0;
+  *o = (unsigned long long)((FAN_UNLIMITED_MARKS) | 0);  /* check that FAN_UNLIMITED_MARKS is an integer */
+  return n;
+}
+
+static int _cffi_const_FAN_UNLIMITED_QUEUE(unsigned long long *o)
+{
+  int n = (FAN_UNLIMITED_QUEUE) <= 0;
+  *o = (unsigned long long)((FAN_UNLIMITED_QUEUE) | 0);  /* check that FAN_UNLIMITED_QUEUE is an integer */
+  return n;
+}
+
+static int _cffi_const_PATH_MAX(unsigned long long *o)
+{
+  int n = (PATH_MAX) <= 0;
+  *o = (unsigned long long)((PATH_MAX) | 0);  /* check that PATH_MAX is an integer */
+  return n;
+}
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld_struct_fanotify_event_info(struct fanotify_event_info *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  (void)((p->mask) | 0);  /* check that 'struct fanotify_event_info.mask' is an integer */
+  (void)((p->fd) | 0);  /* check that 'struct fanotify_event_info.fd' is an integer */
+  (void)((p->pid) | 0);  /* check that 'struct fanotify_event_info.pid' is an integer */
+  (void)((p->vers) | 0);  /* check that 'struct fanotify_event_info.vers' is an integer */
+}
+struct _cffi_align_struct_fanotify_event_info { char x; struct fanotify_event_info y; };
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld_struct_fanotify_event_metadata(struct fanotify_event_metadata *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  (void)((p->event_len) | 0);  /* check that 'struct fanotify_event_metadata.event_len' is an integer */
+  (void)((p->vers) | 0);  /* check that 'struct fanotify_event_metadata.vers' is an integer */
+  (void)((p->reserved) | 0);  /* check that 'struct fanotify_event_metadata.reserved' is an integer */
+  (void)((p->metadata_len) | 0);  /* check that 'struct fanotify_event_metadata.metadata_len' is an integer */
+  (void)((p->mask) | 0);  /* check that 'struct fanotify_event_metadata.mask' is an integer */
+  (void)((p->fd) | 0);  /* check that 'struct fanotify_event_metadata.fd' is an integer */
+  (void)((p->pid) | 0);  /* check that 'struct fanotify_event_metadata.pid' is an integer */
+}
+struct _cffi_align_struct_fanotify_event_metadata { char x; struct fanotify_event_metadata y; };
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld_struct_fanotify_file_id(struct fanotify_file_id *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  (void)((p->dev) | 0);  /* check that 'struct fanotify_file_id.dev' is an integer */
+  (void)((p->ino) | 0);  /* check that 'struct fanotify_file_id.ino' is an integer */
+  (void)((p->btime_ns) | 0);  /* check that 'struct fanotify_file_id.btime_ns' is an integer */
+}
+struct _cffi_align_struct_fanotify_file_id { char x; struct fanotify_file_id y; };
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld_struct_fanotify_response(struct fanotify_response *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  (void)((p->fd) | 0);  /* check that 'struct fanotify_response.fd' is an integer */
+  (void)((p->response) | 0);  /* check that 'struct fanotify_response.response' is an integer */
+}
+struct _cffi_align_struct_fanotify_response { char x; struct fanotify_response y; };
+
+static const struct _cffi_global_s _cffi_globals[] = {
+  { "FAN_ACCESS", (void *)_cffi_const_FAN_ACCESS, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_ACCESS_PERM", (void *)_cffi_const_FAN_ACCESS_PERM, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_ALLOW", (void *)_cffi_const_FAN_ALLOW, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_ALL_EVENTS", (void *)_cffi_const_FAN_ALL_EVENTS, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_ALL_MARK_FLAGS", (void *)_cffi_const_FAN_ALL_MARK_FLAGS, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_CLASS_CONTENT", (void *)_cffi_const_FAN_CLASS_CONTENT, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_CLASS_NOTIF", (void *)_cffi_const_FAN_CLASS_NOTIF, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_CLASS_PRE_CONTENT", (void *)_cffi_const_FAN_CLASS_PRE_CONTENT, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_CLOEXEC", (void *)_cffi_const_FAN_CLOEXEC, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_CLOSE", (void *)_cffi_const_FAN_CLOSE, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_CLOSE_NOWRITE", (void *)_cffi_const_FAN_CLOSE_NOWRITE, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_CLOSE_WRITE", (void *)_cffi_const_FAN_CLOSE_WRITE, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_DENY", (void *)_cffi_const_FAN_DENY, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_EVENT_ON_CHILD", (void *)_cffi_const_FAN_EVENT_ON_CHILD, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_MARK_ADD", (void *)_cffi_const_FAN_MARK_ADD, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_MARK_DONT_FOLLOW", (void *)_cffi_const_FAN_MARK_DONT_FOLLOW, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_MARK_FLUSH", (void *)_cffi_const_FAN_MARK_FLUSH, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_MARK_IGNORED_MASK", (void *)_cffi_const_FAN_MARK_IGNORED_MASK, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_MARK_IGNORED_SURV_MODIFY", (void *)_cffi_const_FAN_MARK_IGNORED_SURV_MODIFY, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_MARK_MOUNT", (void *)_cffi_const_FAN_MARK_MOUNT, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_MARK_ONLYDIR", (void *)_cffi_const_FAN_MARK_ONLYDIR, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_MARK_REMOVE", (void *)_cffi_const_FAN_MARK_REMOVE, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_MODIFY", (void *)_cffi_const_FAN_MODIFY, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_MODIFY_DIR", (void *)_cffi_const_FAN_MODIFY_DIR, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_NONBLOCK", (void *)_cffi_const_FAN_NONBLOCK, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_ONDIR", (void *)_cffi_const_FAN_ONDIR, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_OPEN", (void *)_cffi_const_FAN_OPEN, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_OPEN_PERM", (void *)_cffi_const_FAN_OPEN_PERM, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_Q_OVERFLOW", (void *)_cffi_const_FAN_Q_OVERFLOW, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_UNLIMITED_MARKS", (void *)_cffi_const_FAN_UNLIMITED_MARKS, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "FAN_UNLIMITED_QUEUE", (void *)_cffi_const_FAN_UNLIMITED_QUEUE, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "PATH_MAX", (void *)_cffi_const_PATH_MAX, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "fanotify_decode_events", (void *)_cffi_f_fanotify_decode_events, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 11), (void *)_cffi_d_fanotify_decode_events },
+  { "fanotify_init", (void *)_cffi_f_fanotify_init, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 7), (void *)_cffi_d_fanotify_init },
+  { "fanotify_mark", (void *)_cffi_f_fanotify_mark, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 0), (void *)_cffi_d_fanotify_mark },
+  { "fanotify_readlink_fds", (void *)_cffi_f_fanotify_readlink_fds, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 24), (void *)_cffi_d_fanotify_readlink_fds },
+  { "fanotify_respond_many", (void *)_cffi_f_fanotify_respond_many, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 17), (void *)_cffi_d_fanotify_respond_many },
+  { "fanotify_stat_fds", (void *)_cffi_f_fanotify_stat_fds, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 32), (void *)_cffi_d_fanotify_stat_fds },
+};
+
+static const struct _cffi_field_s _cffi_fields[] = {
+  { "mask", offsetof(struct fanotify_event_info, mask),
+            sizeof(((struct fanotify_event_info *)0)->mask),
+            _CFFI_OP(_CFFI_OP_NOOP, 3) },
+  { "fd", offsetof(struct fanotify_event_info, fd),
+          sizeof(((struct fanotify_event_info *)0)->fd),
+          _CFFI_OP(_CFFI_OP_NOOP, 38) },
+  { "pid", offsetof(struct fanotify_event_info, pid),
+           sizeof(((struct fanotify_event_info *)0)->pid),
+           _CFFI_OP(_CFFI_OP_NOOP, 38) },
+  { "vers", offsetof(struct fanotify_event_info, vers),
+            sizeof(((struct fanotify_event_info *)0)->vers),
+            _CFFI_OP(_CFFI_OP_NOOP, 45) },
+  { "event_len", offsetof(struct fanotify_event_metadata, event_len),
+                 sizeof(((struct fanotify_event_metadata *)0)->event_len),
+                 _CFFI_OP(_CFFI_OP_NOOP, 45) },
+  { "vers", offsetof(struct fanotify_event_metadata, vers),
+            sizeof(((struct fanotify_event_metadata *)0)->vers),
+            _CFFI_OP(_CFFI_OP_NOOP, 46) },
+  { "reserved", offsetof(struct fanotify_event_metadata, reserved),
+                sizeof(((struct fanotify_event_metadata *)0)->reserved),
+                _CFFI_OP(_CFFI_OP_NOOP, 46) },
+  { "metadata_len", offsetof(struct fanotify_event_metadata, metadata_len),
+                    sizeof(((struct fanotify_event_metadata *)0)->metadata_len),
+                    _CFFI_OP(_CFFI_OP_NOOP, 44) },
+  { "mask", offsetof(struct fanotify_event_metadata, mask),
+            sizeof(((struct fanotify_event_metadata *)0)->mask),
+            _CFFI_OP(_CFFI_OP_NOOP, 3) },
+  { "fd", offsetof(struct fanotify_event_metadata, fd),
+          sizeof(((struct fanotify_event_metadata *)0)->fd),
+          _CFFI_OP(_CFFI_OP_NOOP, 38) },
+  { "pid", offsetof(struct fanotify_event_metadata, pid),
+           sizeof(((struct fanotify_event_metadata *)0)->pid),
+           _CFFI_OP(_CFFI_OP_NOOP, 38) },
+  { "dev", offsetof(struct fanotify_file_id, dev),
+           sizeof(((struct fanotify_file_id *)0)->dev),
+           _CFFI_OP(_CFFI_OP_NOOP, 3) },
+  { "ino", offsetof(struct fanotify_file_id, ino),
+           sizeof(((struct fanotify_file_id *)0)->ino),
+           _CFFI_OP(_CFFI_OP_NOOP, 3) },
+  { "btime_ns", offsetof(struct fanotify_file_id, btime_ns),
+                sizeof(((struct fanotify_file_id *)0)->btime_ns),
+                _CFFI_OP(_CFFI_OP_NOOP, 39) },
+  { "fd", offsetof(struct fanotify_response, fd),
+          sizeof(((struct fanotify_response *)0)->fd),
+          _CFFI_OP(_CFFI_OP_NOOP, 38) },
+  { "response", offsetof(struct fanotify_response, response),
+                sizeof(((struct fanotify_response *)0)->response),
+                _CFFI_OP(_CFFI_OP_NOOP, 45) },
+};
+
+static const struct _cffi_struct_union_s _cffi_struct_unions[] = {
+  { "fanotify_event_info", 40, 0,
+    sizeof(struct fanotify_event_info), offsetof(struct _cffi_align_struct_fanotify_event_info, y), 0, 4 },
+  { "fanotify_event_metadata", 41, _CFFI_F_CHECK_FIELDS,
+    sizeof(struct fanotify_event_metadata), offsetof(struct _cffi_align_struct_fanotify_event_metadata, y), 4, 7 },
+  { "fanotify_file_id", 42, _CFFI_F_CHECK_FIELDS,
+    sizeof(struct fanotify_file_id), offsetof(struct _cffi_align_struct_fanotify_file_id, y), 11, 3 },
+  { "fanotify_response", 43, _CFFI_F_CHECK_FIELDS,
+    sizeof(struct fanotify_response), offsetof(struct _cffi_align_struct_fanotify_response, y), 14, 2 },
+};
+
+static const struct _cffi_type_context_s _cffi_type_context = {
+  _cffi_types,
+  _cffi_globals,
+  _cffi_fields,
+  _cffi_struct_unions,
+  NULL,  /* no enums */
+  NULL,  /* no typenames */
+  38,  /* num_globals */
+  4,  /* num_struct_unions */
+  0,  /* num_enums */
+  0,  /* num_typenames */
+  NULL,  /* no includes */
+  48,  /* num_types */
+  0,  /* flags */
+};
+
+#ifdef __GNUC__
+#  pragma GCC visibility push(default)  /* for -fvisibility= */
+#endif
+
+#ifdef PYPY_VERSION
+PyMODINIT_FUNC
+_cffi_pypyinit__fanotify_c(const void *p[])
+{
+    p[0] = (const void *)0x2601;
+    p[1] = &_cffi_type_context;
+    return NULL;
+}
+#  ifdef _MSC_VER
+     PyMODINIT_FUNC
+     PyInit__fanotify_c(void) { return NULL; }
+#  endif
+#else
+PyMODINIT_FUNC
+PyInit__fanotify_c(void)
+{
+  return _cffi_init("_fanotify_c", 0x2601, &_cffi_type_context);
+}
+#endif
+
+#ifdef __GNUC__
+#  pragma GCC visibility pop
+#endif
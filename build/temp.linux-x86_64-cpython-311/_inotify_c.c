@@ -0,0 +1,1451 @@
+#define _CFFI_
+
+/* We try to define Py_LIMITED_API before including Python.h.
+
+   Mess: we can only define it if Py_DEBUG, Py_TRACE_REFS and
+   Py_REF_DEBUG are not defined.  This is a best-effort approximation:
+   we can learn about Py_DEBUG from pyconfig.h, but it is unclear if
+   the same works for the other two macros.  Py_DEBUG implies them,
+   but not the other way around.
+
+   The implementation is messy (issue #350): on Windows, with _MSC_VER,
+   we have to define Py_LIMITED_API even before including pyconfig.h.
+   In that case, we guess what pyconfig.h will do to the macros above,
+   and check our guess after the #include.
+
+   Note that on Windows, with CPython 3.x, you need >= 3.5 and virtualenv
+   version >= 16.0.0.  With older versions of either, you don't get a
+   copy of PYTHON3.DLL in the virtualenv.  We can't check the version of
+   CPython *before* we even include pyconfig.h.  ffi.set_source() puts
+   a ``#define _CFFI_NO_LIMITED_API'' at the start of this file if it is
+   running on Windows < 3.5, as an attempt at fixing it, but that's
+   arguably wrong because it may not be the target version of Python.
+   Still better than nothing I guess.  As another workaround, you can
+   remove the definition of Py_LIMITED_API here.
+
+   See also 'py_limited_api' in cffi/setuptools_ext.py.
+*/
+#if !defined(_CFFI_USE_EMBEDDING) && !defined(Py_LIMITED_API)
+#  ifdef _MSC_VER
+#    if !defined(_DEBUG) && !defined(Py_DEBUG) && !defined(Py_TRACE_REFS) && !defined(Py_REF_DEBUG) && !defined(_CFFI_NO_LIMITED_API)
+#      if !defined(Py_GIL_DISABLED)
+#        define Py_LIMITED_API
+#      else
+#        define Py_LIMITED_API 0x030f0000
+#      endif
+#    endif
+
+#    include <pyconfig.h>
+     /* sanity-check: Py_LIMITED_API will cause crashes if any of these
+        are also defined.  Normally, the Python file PC/pyconfig.h does not
+        cause any of these to be defined, with the exception that _DEBUG
+        causes Py_DEBUG.  Double-check that. */
+#    ifdef Py_LIMITED_API
+#      if defined(Py_DEBUG)
+#        error "pyconfig.h unexpectedly defines Py_DEBUG, but Py_LIMITED_API is set"
+#      endif
+#      if defined(Py_TRACE_REFS)
+#        error "pyconfig.h unexpectedly defines Py_TRACE_REFS, but Py_LIMITED_API is set"
+#      endif
+#      if defined(Py_REF_DEBUG)
+#        error "pyconfig.h unexpectedly defines Py_REF_DEBUG, but Py_LIMITED_API is set"
+#      endif
+#    endif
+#  else
+#    include <pyconfig.h>
+#    if !defined(Py_DEBUG) && !defined(Py_TRACE_REFS) && !defined(Py_REF_DEBUG) && !defined(_CFFI_NO_LIMITED_API)
+#      if !defined(Py_GIL_DISABLED)
+#        define Py_LIMITED_API
+#      else
+#        define Py_LIMITED_API 0x030f0000
+#      endif
+#    endif
+#  endif
+#endif
+
+#include <Python.h>
+#ifdef __cplusplus
+extern "C" {
+#endif
+#include <stddef.h>
+#include <stdlib.h>
+#include <string.h>
+
+
+/* This part is from file 'cffi/parse_c_type.h'.  It is copied at the
+   beginning of C sources generated by CFFI's ffi.set_source(). */
+
+typedef void *_cffi_opcode_t;
+
+#define _CFFI_OP(opcode, arg)   (_cffi_opcode_t)(opcode | (((uintptr_t)(arg)) << 8))
+#define _CFFI_GETOP(cffi_opcode)    ((unsigned char)(uintptr_t)cffi_opcode)
+#define _CFFI_GETARG(cffi_opcode)   (((intptr_t)cffi_opcode) >> 8)
+
+#define _CFFI_OP_PRIMITIVE       1
+#define _CFFI_OP_POINTER         3
+#define _CFFI_OP_ARRAY           5
+#define _CFFI_OP_OPEN_ARRAY      7
+#define _CFFI_OP_STRUCT_UNION    9
+#define _CFFI_OP_ENUM           11
+#define _CFFI_OP_FUNCTION       13
+#define _CFFI_OP_FUNCTION_END   15
+#define _CFFI_OP_NOOP           17
+#define _CFFI_OP_BITFIELD       19
+#define _CFFI_OP_TYPENAME       21
+#define _CFFI_OP_CPYTHON_BLTN_V 23   // varargs
+#define _CFFI_OP_CPYTHON_BLTN_N 25   // noargs
+#define _CFFI_OP_CPYTHON_BLTN_O 27   // O  (i.e. a single arg)
+#define _CFFI_OP_CONSTANT       29
+#define _CFFI_OP_CONSTANT_INT   31
+#define _CFFI_OP_GLOBAL_VAR     33
+#define _CFFI_OP_DLOPEN_FUNC    35
+#define _CFFI_OP_DLOPEN_CONST   37
+#define _CFFI_OP_GLOBAL_VAR_F   39
+#define _CFFI_OP_EXTERN_PYTHON  41
+
+#define _CFFI_PRIM_VOID          0
+#define _CFFI_PRIM_BOOL          1
+#define _CFFI_PRIM_CHAR          2
+#define _CFFI_PRIM_SCHAR         3
+#define _CFFI_PRIM_UCHAR         4
+#define _CFFI_PRIM_SHORT         5
+#define _CFFI_PRIM_USHORT        6
+#define _CFFI_PRIM_INT           7
+#define _CFFI_PRIM_UINT          8
+#define _CFFI_PRIM_LONG          9
+#define _CFFI_PRIM_ULONG        10
+#define _CFFI_PRIM_LONGLONG     11
+#define _CFFI_PRIM_ULONGLONG    12
+#define _CFFI_PRIM_FLOAT        13
+#define _CFFI_PRIM_DOUBLE       14
+#define _CFFI_PRIM_LONGDOUBLE   15
+
+#define _CFFI_PRIM_WCHAR        16
+#define _CFFI_PRIM_INT8         17
+#define _CFFI_PRIM_UINT8        18
+#define _CFFI_PRIM_INT16        19
+#define _CFFI_PRIM_UINT16       20
+#define _CFFI_PRIM_INT32        21
+#define _CFFI_PRIM_UINT32       22
+#define _CFFI_PRIM_INT64        23
+#define _CFFI_PRIM_UINT64       24
+#define _CFFI_PRIM_INTPTR       25
+#define _CFFI_PRIM_UINTPTR      26
+#define _CFFI_PRIM_PTRDIFF      27
+#define _CFFI_PRIM_SIZE         28
+#define _CFFI_PRIM_SSIZE        29
+#define _CFFI_PRIM_INT_LEAST8   30
+#define _CFFI_PRIM_UINT_LEAST8  31
+#define _CFFI_PRIM_INT_LEAST16  32
+#define _CFFI_PRIM_UINT_LEAST16 33
+#define _CFFI_PRIM_INT_LEAST32  34
+#define _CFFI_PRIM_UINT_LEAST32 35
+#define _CFFI_PRIM_INT_LEAST64  36
+#define _CFFI_PRIM_UINT_LEAST64 37
+#define _CFFI_PRIM_INT_FAST8    38
+#define _CFFI_PRIM_UINT_FAST8   39
+#define _CFFI_PRIM_INT_FAST16   40
+#define _CFFI_PRIM_UINT_FAST16  41
+#define _CFFI_PRIM_INT_FAST32   42
+#define _CFFI_PRIM_UINT_FAST32  43
+#define _CFFI_PRIM_INT_FAST64   44
+#define _CFFI_PRIM_UINT_FAST64  45
+#define _CFFI_PRIM_INTMAX       46
+#define _CFFI_PRIM_UINTMAX      47
+#define _CFFI_PRIM_FLOATCOMPLEX 48
+#define _CFFI_PRIM_DOUBLECOMPLEX 49
+#define _CFFI_PRIM_CHAR16       50
+#define _CFFI_PRIM_CHAR32       51
+
+#define _CFFI__NUM_PRIM         52
+#define _CFFI__UNKNOWN_PRIM           (-1)
+#define _CFFI__UNKNOWN_FLOAT_PRIM     (-2)
+#define _CFFI__UNKNOWN_LONG_DOUBLE    (-3)
+
+#define _CFFI__IO_FILE_STRUCT         (-1)
+
+
+struct _cffi_global_s {
+    const char *name;
+    void *address;
+    _cffi_opcode_t type_op;
+    void *size_or_direct_fn;  // OP_GLOBAL_VAR: size, or 0 if unknown
+                              // OP_CPYTHON_BLTN_*: addr of direct function
+};
+
+struct _cffi_getconst_s {
+    unsigned long long value;
+    const struct _cffi_type_context_s *ctx;
+    int gindex;
+};
+
+struct _cffi_struct_union_s {
+    const char *name;
+    int type_index;          // -> _cffi_types, on a OP_STRUCT_UNION
+    int flags;               // _CFFI_F_* flags below
+    size_t size;
+    int alignment;
+    int first_field_index;   // -> _cffi_fields array
+    int num_fields;
+};
+#define _CFFI_F_UNION         0x01   // is a union, not a struct
+#define _CFFI_F_CHECK_FIELDS  0x02   // complain if fields are not in the
+                                     // "standard layout" or if some are missing
+#define _CFFI_F_PACKED        0x04   // for CHECK_FIELDS, assume a packed struct
+#define _CFFI_F_EXTERNAL      0x08   // in some other ffi.include()
+#define _CFFI_F_OPAQUE        0x10   // opaque
+
+struct _cffi_field_s {
+    const char *name;
+    size_t field_offset;
+    size_t field_size;
+    _cffi_opcode_t field_type_op;
+};
+
+struct _cffi_enum_s {
+    const char *name;
+    int type_index;          // -> _cffi_types, on a OP_ENUM
+    int type_prim;           // _CFFI_PRIM_xxx
+    const char *enumerators; // comma-delimited string
+};
+
+struct _cffi_typename_s {
+    const char *name;
+    int type_index;   /* if opaque, points to a possibly artificial
+                         OP_STRUCT which is itself opaque */
+};
+
+struct _cffi_type_context_s {
+    _cffi_opcode_t *types;
+    const struct _cffi_global_s *globals;
+    const struct _cffi_field_s *fields;
+    const struct _cffi_struct_union_s *struct_unions;
+    const struct _cffi_enum_s *enums;
+    const struct _cffi_typename_s *typenames;
+    int num_globals;
+    int num_struct_unions;
+    int num_enums;
+    int num_typenames;
+    const char *const *includes;
+    int num_types;
+    int flags;      /* future extension */
+};
+
+struct _cffi_parse_info_s {
+    const struct _cffi_type_context_s *ctx;
+    _cffi_opcode_t *output;
+    unsigned int output_size;
+    size_t error_location;
+    const char *error_message;
+};
+
+struct _cffi_externpy_s {
+    const char *name;
+    size_t size_of_result;
+    void *reserved1, *reserved2;
+};
+
+#ifdef _CFFI_INTERNAL
+static int parse_c_type(struct _cffi_parse_info_s *info, const char *input);
+static int search_in_globals(const struct _cffi_type_context_s *ctx,
+                             const char *search, size_t search_len);
+static int search_in_struct_unions(const struct _cffi_type_context_s *ctx,
+                                   const char *search, size_t search_len);
+#endif
+
+/* this block of #ifs should be kept exactly identical between
+   c/_cffi_backend.c, cffi/vengine_cpy.py, cffi/vengine_gen.py
+   and cffi/_cffi_include.h */
+#if defined(_MSC_VER)
+# include <malloc.h>   /* for alloca() */
+# if _MSC_VER < 1600   /* MSVC < 2010 */
+   typedef __int8 int8_t;
+   typedef __int16 int16_t;
+   typedef __int32 int32_t;
+   typedef __int64 int64_t;
+   typedef unsigned __int8 uint8_t;
+   typedef unsigned __int16 uint16_t;
+   typedef unsigned __int32 uint32_t;
+   typedef unsigned __int64 uint64_t;
+   typedef __int8 int_least8_t;
+   typedef __int16 int_least16_t;
+   typedef __int32 int_least32_t;
+   typedef __int64 int_least64_t;
+   typedef unsigned __int8 uint_least8_t;
+   typedef unsigned __int16 uint_least16_t;
+   typedef unsigned __int32 uint_least32_t;
+   typedef unsigned __int64 uint_least64_t;
+   typedef __int8 int_fast8_t;
+   typedef __int16 int_fast16_t;
+   typedef __int32 int_fast32_t;
+   typedef __int64 int_fast64_t;
+   typedef unsigned __int8 uint_fast8_t;
+   typedef unsigned __int16 uint_fast16_t;
+   typedef unsigned __int32 uint_fast32_t;
+   typedef unsigned __int64 uint_fast64_t;
+   typedef __int64 intmax_t;
+   typedef unsigned __int64 uintmax_t;
+# else
+#  include <stdint.h>
+# endif
+# if _MSC_VER < 1800   /* MSVC < 2013 */
+#  ifndef __cplusplus
+    typedef unsigned char _Bool;
+#  endif
+# endif
+# define _cffi_float_complex_t   _Fcomplex    /* include <complex.h> for it */
+# define _cffi_double_complex_t  _Dcomplex    /* include <complex.h> for it */
+#else
+# include <stdint.h>
+# if (defined (__SVR4) && defined (__sun)) || defined(_AIX) || defined(__hpux)
+#  include <alloca.h>
+# endif
+# define _cffi_float_complex_t   float _Complex
+# define _cffi_double_complex_t  double _Complex
+#endif
+
+#ifdef __GNUC__
+# define _CFFI_UNUSED_FN  __attribute__((unused))
+#else
+# define _CFFI_UNUSED_FN  /* nothing */
+#endif
+
+#ifdef __cplusplus
+# ifndef _Bool
+   typedef bool _Bool;   /* semi-hackish: C++ has no _Bool; bool is builtin */
+# endif
+#endif
+
+/**********  CPython-specific section  **********/
+#ifndef PYPY_VERSION
+
+
+#define _cffi_from_c_double PyFloat_FromDouble
+#define _cffi_from_c_float PyFloat_FromDouble
+#define _cffi_from_c_long PyLong_FromLong
+#define _cffi_from_c_ulong PyLong_FromUnsignedLong
+#define _cffi_from_c_longlong PyLong_FromLongLong
+#define _cffi_from_c_ulonglong PyLong_FromUnsignedLongLong
+#define _cffi_from_c__Bool PyBool_FromLong
+
+#define _cffi_to_c_double PyFloat_AsDouble
+#define _cffi_to_c_float PyFloat_AsDouble
+
+#define _cffi_from_c_int(x, type)                                        \
+    (((type)-1) > 0 ? /* unsigned */                                     \
+        (sizeof(type) < sizeof(long) ?                                   \
+            PyLong_FromLong((long)x) :                                   \
+         sizeof(type) == sizeof(long) ?                                  \
+            PyLong_FromUnsignedLong((unsigned long)x) :                  \
+            PyLong_FromUnsignedLongLong((unsigned long long)x)) :        \
+        (sizeof(type) <= sizeof(long) ?                                  \
+            PyLong_FromLong((long)x) :                                   \
+            PyLong_FromLongLong((long long)x)))
+
+#define _cffi_to_c_int(o, type)                                          \
+    ((type)(                                                             \
+     sizeof(type) == 1 ? (((type)-1) > 0 ? (type)_cffi_to_c_u8(o)        \
+                                         : (type)_cffi_to_c_i8(o)) :     \
+     sizeof(type) == 2 ? (((type)-1) > 0 ? (type)_cffi_to_c_u16(o)       \
+                                         : (type)_cffi_to_c_i16(o)) :    \
+     sizeof(type) == 4 ? (((type)-1) > 0 ? (type)_cffi_to_c_u32(o)       \
+                                         : (type)_cffi_to_c_i32(o)) :    \
+     sizeof(type) == 8 ? (((type)-1) > 0 ? (type)_cffi_to_c_u64(o)       \
+                                         : (type)_cffi_to_c_i64(o)) :    \
+     (Py_FatalError("unsupported size for type " #type), (type)0)))
+
+#define _cffi_to_c_i8                                                    \
+                 ((int(*)(PyObject *))_cffi_exports[1])
+#define _cffi_to_c_u8                                                    \
+                 ((int(*)(PyObject *))_cffi_exports[2])
+#define _cffi_to_c_i16                                                   \
+                 ((int(*)(PyObject *))_cffi_exports[3])
+#define _cffi_to_c_u16                                                   \
+                 ((int(*)(PyObject *))_cffi_exports[4])
+#define _cffi_to_c_i32                                                   \
+                 ((int(*)(PyObject *))_cffi_exports[5])
+#define _cffi_to_c_u32                                                   \
+                 ((unsigned int(*)(PyObject *))_cffi_exports[6])
+#define _cffi_to_c_i64                                                   \
+                 ((long long(*)(PyObject *))_cffi_exports[7])
+#define _cffi_to_c_u64                                                   \
+                 ((unsigned long long(*)(PyObject *))_cffi_exports[8])
+#define _cffi_to_c_char                                                  \
+                 ((int(*)(PyObject *))_cffi_exports[9])
+#define _cffi_from_c_pointer                                             \
+    ((PyObject *(*)(char *, struct _cffi_ctypedescr *))_cffi_exports[10])
+#define _cffi_to_c_pointer                                               \
+    ((char *(*)(PyObject *, struct _cffi_ctypedescr *))_cffi_exports[11])
+#define _cffi_get_struct_layout                                          \
+    not used any more
+#define _cffi_restore_errno                                              \
+    ((void(*)(void))_cffi_exports[13])
+#define _cffi_save_errno                                                 \
+    ((void(*)(void))_cffi_exports[14])
+#define _cffi_from_c_char                                                \
+    ((PyObject *(*)(char))_cffi_exports[15])
+#define _cffi_from_c_deref                                               \
+    ((PyObject *(*)(char *, struct _cffi_ctypedescr *))_cffi_exports[16])
+#define _cffi_to_c                                                       \
+    ((int(*)(char *, struct _cffi_ctypedescr *, PyObject *))_cffi_exports[17])
+#define _cffi_from_c_struct                                              \
+    ((PyObject *(*)(char *, struct _cffi_ctypedescr *))_cffi_exports[18])
+#define _cffi_to_c_wchar_t                                               \
+    ((_cffi_wchar_t(*)(PyObject *))_cffi_exports[19])
+#define _cffi_from_c_wchar_t                                             \
+    ((PyObject *(*)(_cffi_wchar_t))_cffi_exports[20])
+#define _cffi_to_c_long_double                                           \
+    ((long double(*)(PyObject *))_cffi_exports[21])
+#define _cffi_to_c__Bool                                                 \
+    ((_Bool(*)(PyObject *))_cffi_exports[22])
+#define _cffi_prepare_pointer_call_argument                              \
+    ((Py_ssize_t(*)(struct _cffi_ctypedescr *,                           \
+                    PyObject *, char **))_cffi_exports[23])
+#define _cffi_convert_array_from_object                                  \
+    ((int(*)(char *, struct _cffi_ctypedescr *, PyObject *))_cffi_exports[24])
+#define _CFFI_CPIDX  25
+#define _cffi_call_python                                                \
+    ((void(*)(struct _cffi_externpy_s *, char *))_cffi_exports[_CFFI_CPIDX])
+#define _cffi_to_c_wchar3216_t                                           \
+    ((int(*)(PyObject *))_cffi_exports[26])
+#define _cffi_from_c_wchar3216_t                                         \
+    ((PyObject *(*)(int))_cffi_exports[27])
+#define _CFFI_NUM_EXPORTS 28
+
+struct _cffi_ctypedescr;
+
+static void *_cffi_exports[_CFFI_NUM_EXPORTS];
+
+#define _cffi_type(index)   (                           \
+    assert((((uintptr_t)_cffi_types[index]) & 1) == 0), \
+    (struct _cffi_ctypedescr *)_cffi_types[index])
+
+static PyObject *_cffi_init(const char *module_name, Py_ssize_t version,
+                            const struct _cffi_type_context_s *ctx)
+{
+    PyObject *module, *o_arg, *new_module;
+    void *raw[] = {
+        (void *)module_name,
+        (void *)version,
+        (void *)_cffi_exports,
+        (void *)ctx,
+    };
+
+    module = PyImport_ImportModule("_cffi_backend");
+    if (module == NULL)
+        goto failure;
+
+    o_arg = PyLong_FromVoidPtr((void *)raw);
+    if (o_arg == NULL)
+        goto failure;
+
+    new_module = PyObject_CallMethod(
+        module, (char *)"_init_cffi_1_0_external_module", (char *)"O", o_arg);
+
+    Py_DECREF(o_arg);
+    Py_DECREF(module);
+    return new_module;
+
+  failure:
+    Py_XDECREF(module);
+    return NULL;
+}
+
+
+#ifdef HAVE_WCHAR_H
+typedef wchar_t _cffi_wchar_t;
+#else
+typedef uint16_t _cffi_wchar_t;   /* same random pick as _cffi_backend.c */
+#endif
+
+_CFFI_UNUSED_FN static uint16_t _cffi_to_c_char16_t(PyObject *o)
+{
+    if (sizeof(_cffi_wchar_t) == 2)
+        return (uint16_t)_cffi_to_c_wchar_t(o);
+    else
+        return (uint16_t)_cffi_to_c_wchar3216_t(o);
+}
+
+_CFFI_UNUSED_FN static PyObject *_cffi_from_c_char16_t(uint16_t x)
+{
+    if (sizeof(_cffi_wchar_t) == 2)
+        return _cffi_from_c_wchar_t((_cffi_wchar_t)x);
+    else
+        return _cffi_from_c_wchar3216_t((int)x);
+}
+
+_CFFI_UNUSED_FN static int _cffi_to_c_char32_t(PyObject *o)
+{
+    if (sizeof(_cffi_wchar_t) == 4)
+        return (int)_cffi_to_c_wchar_t(o);
+    else
+        return (int)_cffi_to_c_wchar3216_t(o);
+}
+
+_CFFI_UNUSED_FN static PyObject *_cffi_from_c_char32_t(unsigned int x)
+{
+    if (sizeof(_cffi_wchar_t) == 4)
+        return _cffi_from_c_wchar_t((_cffi_wchar_t)x);
+    else
+        return _cffi_from_c_wchar3216_t((int)x);
+}
+
+union _cffi_union_alignment_u {
+    unsigned char m_char;
+    unsigned short m_short;
+    unsigned int m_int;
+    unsigned long m_long;
+    unsigned long long m_longlong;
+    float m_float;
+    double m_double;
+    long double m_longdouble;
+};
+
+struct _cffi_freeme_s {
+    struct _cffi_freeme_s *next;
+    union _cffi_union_alignment_u alignment;
+};
+
+_CFFI_UNUSED_FN static int
+_cffi_convert_array_argument(struct _cffi_ctypedescr *ctptr, PyObject *arg,
+                             char **output_data, Py_ssize_t datasize,
+                             struct _cffi_freeme_s **freeme)
+{
+    char *p;
+    if (datasize < 0)
+        return -1;
+
+    p = *output_data;
+    if (p == NULL) {
+        struct _cffi_freeme_s *fp = (struct _cffi_freeme_s *)PyObject_Malloc(
+            offsetof(struct _cffi_freeme_s, alignment) + (size_t)datasize);
+        if (fp == NULL)
+            return -1;
+        fp->next = *freeme;
+        *freeme = fp;
+        p = *output_data = (char *)&fp->alignment;
+    }
+    memset((void *)p, 0, (size_t)datasize);
+    return _cffi_convert_array_from_object(p, ctptr, arg);
+}
+
+_CFFI_UNUSED_FN static void
+_cffi_free_array_arguments(struct _cffi_freeme_s *freeme)
+{
+    do {
+        void *p = (void *)freeme;
+        freeme = freeme->next;
+        PyObject_Free(p);
+    } while (freeme != NULL);
+}
+
+/**********  end CPython-specific section  **********/
+#else
+_CFFI_UNUSED_FN
+static void (*_cffi_call_python_org)(struct _cffi_externpy_s *, char *);
+# define _cffi_call_python  _cffi_call_python_org
+#endif
+
+
+#define _cffi_array_len(array)   (sizeof(array) / sizeof((array)[0]))
+
+#define _cffi_prim_int(size, sign)                                      \
+    ((size) == 1 ? ((sign) ? _CFFI_PRIM_INT8  : _CFFI_PRIM_UINT8)  :    \
+     (size) == 2 ? ((sign) ? _CFFI_PRIM_INT16 : _CFFI_PRIM_UINT16) :    \
+     (size) == 4 ? ((sign) ? _CFFI_PRIM_INT32 : _CFFI_PRIM_UINT32) :    \
+     (size) == 8 ? ((sign) ? _CFFI_PRIM_INT64 : _CFFI_PRIM_UINT64) :    \
+     _CFFI__UNKNOWN_PRIM)
+
+#define _cffi_prim_float(size)                                          \
+    ((size) == sizeof(float) ? _CFFI_PRIM_FLOAT :                       \
+     (size) == sizeof(double) ? _CFFI_PRIM_DOUBLE :                     \
+     (size) == sizeof(long double) ? _CFFI__UNKNOWN_LONG_DOUBLE :       \
+     _CFFI__UNKNOWN_FLOAT_PRIM)
+
+#define _cffi_check_int(got, got_nonpos, expected)      \
+    ((got_nonpos) == (expected <= 0) &&                 \
+     (got) == (unsigned long long)expected)
+
+#ifdef MS_WIN32
+# define _cffi_stdcall  __stdcall
+#else
+# define _cffi_stdcall  /* nothing */
+#endif
+
+#ifdef __cplusplus
+}
+#endif
+
+/************************************************************/
+
+
+#include <sys/inotify.h>
+#include <sys/ioctl.h>
+#include <limits.h>
+#include <string.h>
+#include <errno.h>
+
+struct inotify_event_info {
+        int           wd;
+        uint32_t      mask;
+        uint32_t      cookie;
+        uint32_t      name_offset;
+        uint32_t      name_len;
+};
+
+struct inotify_watch_stats {
+        uint64_t      events;
+        uint64_t      bytes;
+        uint64_t      last_ns;
+};
+
+/* Add a watch for each of the n_paths NUL terminated paths packed back to
+ * back in 'paths', storing the watch descriptor or -errno for each path in
+ * 'wds' so a single failure does not abort the remainder of the batch
+ */
+static void inotify_add_watches(int fd, const char *paths, size_t n_paths, uint32_t mask, int *wds) {
+    size_t i;
+
+    for (i = 0; i < n_paths; i++) {
+        int wd = inotify_add_watch(fd, paths, mask);
+        wds[i] = wd < 0 ? -errno : wd;
+        paths += strlen(paths) + 1;
+    }
+}
+
+/* Walk a buffer read from an inotify fd in a single pass, returning the
+ * amount of events decoded into 'events'. Events whose mask has no bits in
+ * common with mask_filter are skipped. Truncated trailing records are
+ * ignored rather than read past the end of the buffer
+ */
+static size_t inotify_decode_events(const char *buf, size_t buf_len, uint32_t mask_filter,
+                                    struct inotify_event_info *events, size_t max_events) {
+    const size_t header_len = sizeof(struct inotify_event);
+    size_t offset = 0;
+    size_t count = 0;
+
+    while (count < max_events && offset + header_len <= buf_len) {
+        struct inotify_event event;
+        size_t name_offset = offset + header_len;
+
+        /* buffers handed to us from python have no alignment guarantees */
+        memcpy(&event, buf + offset, header_len);
+        if (event.len > buf_len - name_offset) {
+            break;
+        }
+        offset = name_offset + event.len;
+
+        if (!(event.mask & mask_filter)) {
+            continue;
+        }
+
+        events[count].wd = event.wd;
+        events[count].mask = event.mask;
+        events[count].cookie = event.cookie;
+        events[count].name_offset = name_offset;
+        events[count].name_len = strnlen(buf + name_offset, event.len);
+        count++;
+    }
+
+    return count;
+}
+
+/* Walk a buffer read from an inotify fd adding each event to the counters
+ * in stats[wd] for wds in [min_wd, n_stats). Returns the largest wd seen
+ * so the caller can grow the array and account the remainder
+ */
+static int inotify_account_events(const char *buf, size_t buf_len, uint64_t now_ns,
+                                  struct inotify_watch_stats *stats, int min_wd, int n_stats) {
+    const size_t header_len = sizeof(struct inotify_event);
+    size_t offset = 0;
+    int max_wd = -1;
+
+    while (offset + header_len <= buf_len) {
+        struct inotify_event event;
+
+        memcpy(&event, buf + offset, header_len);
+        if (event.len > buf_len - offset - header_len) {
+            break;
+        }
+        offset += header_len + event.len;
+
+        if (event.wd > max_wd) {
+            max_wd = event.wd;
+        }
+        if (event.wd >= min_wd && event.wd < n_stats) {
+            stats[event.wd].events++;
+            stats[event.wd].bytes += header_len + event.len;
+            stats[event.wd].last_ns = now_ns;
+        }
+    }
+
+    return max_wd;
+}
+
+
+/************************************************************/
+
+static void *_cffi_types[] = {
+/*  0 */ _CFFI_OP(_CFFI_OP_FUNCTION, 5), // int()(char const *, size_t, uint64_t, struct inotify_watch_stats *, int, int)
+/*  1 */ _CFFI_OP(_CFFI_OP_POINTER, 36), // char const *
+/*  2 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 28), // size_t
+/*  3 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 24), // uint64_t
+/*  4 */ _CFFI_OP(_CFFI_OP_POINTER, 39), // struct inotify_watch_stats *
+/*  5 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7), // int
+/*  6 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/*  7 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/*  8 */ _CFFI_OP(_CFFI_OP_FUNCTION, 5), // int()(int)
+/*  9 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 10 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 11 */ _CFFI_OP(_CFFI_OP_FUNCTION, 5), // int()(int, char const *, uint32_t)
+/* 12 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 13 */ _CFFI_OP(_CFFI_OP_NOOP, 1),
+/* 14 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 22), // uint32_t
+/* 15 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 16 */ _CFFI_OP(_CFFI_OP_FUNCTION, 5), // int()(int, int)
+/* 17 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 18 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 19 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 20 */ _CFFI_OP(_CFFI_OP_FUNCTION, 5), // int()(void)
+/* 21 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 22 */ _CFFI_OP(_CFFI_OP_FUNCTION, 2), // size_t()(char const *, size_t, uint32_t, struct inotify_event_info *, size_t)
+/* 23 */ _CFFI_OP(_CFFI_OP_NOOP, 1),
+/* 24 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 28),
+/* 25 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 22),
+/* 26 */ _CFFI_OP(_CFFI_OP_POINTER, 38), // struct inotify_event_info *
+/* 27 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 28),
+/* 28 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 29 */ _CFFI_OP(_CFFI_OP_FUNCTION, 40), // void()(int, char const *, size_t, uint32_t, int *)
+/* 30 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 31 */ _CFFI_OP(_CFFI_OP_NOOP, 1),
+/* 32 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 28),
+/* 33 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 22),
+/* 34 */ _CFFI_OP(_CFFI_OP_POINTER, 5), // int *
+/* 35 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 36 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 2), // char
+/* 37 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 0), // struct inotify_event
+/* 38 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 1), // struct inotify_event_info
+/* 39 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 2), // struct inotify_watch_stats
+/* 40 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 0), // void
+};
+
+static int _cffi_d_inotify_account_events(char const * x0, size_t x1, uint64_t x2, struct inotify_watch_stats * x3, int x4, int x5)
+{
+  return inotify_account_events(x0, x1, x2, x3, x4, x5);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_inotify_account_events(PyObject *self, PyObject *args)
+{
+  char const * x0;
+  size_t x1;
+  uint64_t x2;
+  struct inotify_watch_stats * x3;
+  int x4;
+  int x5;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  int result;
+  PyObject *pyresult;
+  PyObject *arg0;
+  PyObject *arg1;
+  PyObject *arg2;
+  PyObject *arg3;
+  PyObject *arg4;
+  PyObject *arg5;
+
+  if (!PyArg_UnpackTuple(args, "inotify_account_events", 6, 6, &arg0, &arg1, &arg2, &arg3, &arg4, &arg5))
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(1), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (char const *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(1), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x1 = _cffi_to_c_int(arg1, size_t);
+  if (x1 == (size_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  x2 = _cffi_to_c_int(arg2, uint64_t);
+  if (x2 == (uint64_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(4), arg3, (char **)&x3);
+  if (datasize != 0) {
+    x3 = ((size_t)datasize) <= 640 ? (struct inotify_watch_stats *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(4), arg3, (char **)&x3,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x4 = _cffi_to_c_int(arg4, int);
+  if (x4 == (int)-1 && PyErr_Occurred())
+    return NULL;
+
+  x5 = _cffi_to_c_int(arg5, int);
+  if (x5 == (int)-1 && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = inotify_account_events(x0, x1, x2, x3, x4, x5); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_int(result, int);
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  return pyresult;
+}
+#else
+#  define _cffi_f_inotify_account_events _cffi_d_inotify_account_events
+#endif
+
+static int _cffi_d_inotify_add_watch(int x0, char const * x1, uint32_t x2)
+{
+  return inotify_add_watch(x0, x1, x2);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_inotify_add_watch(PyObject *self, PyObject *args)
+{
+  int x0;
+  char const * x1;
+  uint32_t x2;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  int result;
+  PyObject *pyresult;
+  PyObject *arg0;
+  PyObject *arg1;
+  PyObject *arg2;
+
+  if (!PyArg_UnpackTuple(args, "inotify_add_watch", 3, 3, &arg0, &arg1, &arg2))
+    return NULL;
+
+  x0 = _cffi_to_c_int(arg0, int);
+  if (x0 == (int)-1 && PyErr_Occurred())
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(1), arg1, (char **)&x1);
+  if (datasize != 0) {
+    x1 = ((size_t)datasize) <= 640 ? (char const *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(1), arg1, (char **)&x1,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x2 = _cffi_to_c_int(arg2, uint32_t);
+  if (x2 == (uint32_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = inotify_add_watch(x0, x1, x2); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_int(result, int);
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  return pyresult;
+}
+#else
+#  define _cffi_f_inotify_add_watch _cffi_d_inotify_add_watch
+#endif
+
+static void _cffi_d_inotify_add_watches(int x0, char const * x1, size_t x2, uint32_t x3, int * x4)
+{
+  inotify_add_watches(x0, x1, x2, x3, x4);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_inotify_add_watches(PyObject *self, PyObject *args)
+{
+  int x0;
+  char const * x1;
+  size_t x2;
+  uint32_t x3;
+  int * x4;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  PyObject *arg0;
+  PyObject *arg1;
+  PyObject *arg2;
+  PyObject *arg3;
+  PyObject *arg4;
+
+  if (!PyArg_UnpackTuple(args, "inotify_add_watches", 5, 5, &arg0, &arg1, &arg2, &arg3, &arg4))
+    return NULL;
+
+  x0 = _cffi_to_c_int(arg0, int);
+  if (x0 == (int)-1 && PyErr_Occurred())
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(1), arg1, (char **)&x1);
+  if (datasize != 0) {
+    x1 = ((size_t)datasize) <= 640 ? (char const *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(1), arg1, (char **)&x1,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x2 = _cffi_to_c_int(arg2, size_t);
+  if (x2 == (size_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  x3 = _cffi_to_c_int(arg3, uint32_t);
+  if (x3 == (uint32_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(34), arg4, (char **)&x4);
+  if (datasize != 0) {
+    x4 = ((size_t)datasize) <= 640 ? (int *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(34), arg4, (char **)&x4,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { inotify_add_watches(x0, x1, x2, x3, x4); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  Py_INCREF(Py_None);
+  return Py_None;
+}
+#else
+#  define _cffi_f_inotify_add_watches _cffi_d_inotify_add_watches
+#endif
+
+static size_t _cffi_d_inotify_decode_events(char const * x0, size_t x1, uint32_t x2, struct inotify_event_info * x3, size_t x4)
+{
+  return inotify_decode_events(x0, x1, x2, x3, x4);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_inotify_decode_events(PyObject *self, PyObject *args)
+{
+  char const * x0;
+  size_t x1;
+  uint32_t x2;
+  struct inotify_event_info * x3;
+  size_t x4;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  size_t result;
+  PyObject *pyresult;
+  PyObject *arg0;
+  PyObject *arg1;
+  PyObject *arg2;
+  PyObject *arg3;
+  PyObject *arg4;
+
+  if (!PyArg_UnpackTuple(args, "inotify_decode_events", 5, 5, &arg0, &arg1, &arg2, &arg3, &arg4))
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(1), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (char const *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(1), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x1 = _cffi_to_c_int(arg1, size_t);
+  if (x1 == (size_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  x2 = _cffi_to_c_int(arg2, uint32_t);
+  if (x2 == (uint32_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(26), arg3, (char **)&x3);
+  if (datasize != 0) {
+    x3 = ((size_t)datasize) <= 640 ? (struct inotify_event_info *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(26), arg3, (char **)&x3,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x4 = _cffi_to_c_int(arg4, size_t);
+  if (x4 == (size_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = inotify_decode_events(x0, x1, x2, x3, x4); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_int(result, size_t);
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  return pyresult;
+}
+#else
+#  define _cffi_f_inotify_decode_events _cffi_d_inotify_decode_events
+#endif
+
+static int _cffi_d_inotify_init(void)
+{
+  return inotify_init();
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_inotify_init(PyObject *self, PyObject *noarg)
+{
+  int result;
+  PyObject *pyresult;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = inotify_init(); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  (void)noarg; /* unused */
+  pyresult = _cffi_from_c_int(result, int);
+  return pyresult;
+}
+#else
+#  define _cffi_f_inotify_init _cffi_d_inotify_init
+#endif
+
+static int _cffi_d_inotify_init1(int x0)
+{
+  return inotify_init1(x0);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_inotify_init1(PyObject *self, PyObject *arg0)
+{
+  int x0;
+  int result;
+  PyObject *pyresult;
+
+  x0 = _cffi_to_c_int(arg0, int);
+  if (x0 == (int)-1 && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = inotify_init1(x0); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_int(result, int);
+  return pyresult;
+}
+#else
+#  define _cffi_f_inotify_init1 _cffi_d_inotify_init1
+#endif
+
+static int _cffi_d_inotify_rm_watch(int x0, int x1)
+{
+  return inotify_rm_watch(x0, x1);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_inotify_rm_watch(PyObject *self, PyObject *args)
+{
+  int x0;
+  int x1;
+  int result;
+  PyObject *pyresult;
+  PyObject *arg0;
+  PyObject *arg1;
+
+  if (!PyArg_UnpackTuple(args, "inotify_rm_watch", 2, 2, &arg0, &arg1))
+    return NULL;
+
+  x0 = _cffi_to_c_int(arg0, int);
+  if (x0 == (int)-1 && PyErr_Occurred())
+    return NULL;
+
+  x1 = _cffi_to_c_int(arg1, int);
+  if (x1 == (int)-1 && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = inotify_rm_watch(x0, x1); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_int(result, int);
+  return pyresult;
+}
+#else
+#  define _cffi_f_inotify_rm_watch _cffi_d_inotify_rm_watch
+#endif
+
+static int _cffi_const_IN_ACCESS(unsigned long long *o)
+{
+  int n = (IN_ACCESS) <= 0;
+  *o = (unsigned long long)((IN_ACCESS) | 0);  /* check that IN_ACCESS is an integer */
+  return n;
+}
+
+static int _cffi_const_IN_ALL_EVENTS(unsigned long long *o)
+{
+  int n = (IN_ALL_EVENTS) <= 0;
+  *o = (unsigned long long)((IN_ALL_EVENTS) | 0);  /* check that IN_ALL_EVENTS is an integer */
+  return n;
+}
+
+static int _cffi_const_IN_ATTRIB(unsigned long long *o)
+{
+  int n = (IN_ATTRIB) <= 0;
+  *o = (unsigned long long)((IN_ATTRIB) | 0);  /* check that IN_ATTRIB is an integer */
+  return n;
+}
+
+static int _cffi_const_IN_CLOEXEC(unsigned long long *o)
+{
+  int n = (IN_CLOEXEC) <= 0;
+  *o = (unsigned long long)((IN_CLOEXEC) | 0);  /* check that IN_CLOEXEC is an integer */
+  return n;
+}
+
+static int _cffi_const_IN_CLOSE(unsigned long long *o)
+{
+  int n = (IN_CLOSE) <= 0;
+  *o = (unsigned long long)((IN_CLOSE) | 0);  /* check that IN_CLOSE is an integer */
+  return n;
+}
+
+static int _cffi_const_IN_CLOSE_NOWRITE(unsigned long long *o)
+{
+  int n = (IN_CLOSE_NOWRITE) <= 0;
+  *o = (unsigned long long)((IN_CLOSE_NOWRITE) | 0);  /* check that IN_CLOSE_NOWRITE is an integer */
+  return n;
+}
+
+static int _cffi_const_IN_CLOSE_WRITE(unsigned long long *o)
+{
+  int n = (IN_CLOSE_WRITE) <= 0;
+  *o = (unsigned long long)((IN_CLOSE_WRITE) | 0);  /* check that IN_CLOSE_WRITE is an integer */
+  return n;
+}
+
+static int _cffi_const_IN_CREATE(unsigned long long *o)
+{
+  int n = (IN_CREATE) <= 0;
+  *o = (unsigned long long)((IN_CREATE) | 0);  /* check that IN_CREATE is an integer */
+  return n;
+}
+
+static int _cffi_const_IN_DELETE(unsigned long long *o)
+{
+  int n = (IN_DELETE) <= 0;
+  *o = (unsigned long long)((IN_DELETE) | 0);  /* check that IN_DELETE is an integer */
+  return n;
+}
+
+static int _cffi_const_IN_DELETE_SELF(unsigned long long *o)
+{
+  int n = (IN_DELETE_SELF) <= 0;
+  *o = (unsigned long long)((IN_DELETE_SELF) | 0);  /* check that IN_DELETE_SELF is an integer */
+  return n;
+}
+
+static int _cffi_const_IN_DONT_FOLLOW(unsigned long long *o)
+{
+  int n = (IN_DONT_FOLLOW) <= 0;
+  *o = (unsigned long long)((IN_DONT_FOLLOW) | 0);  /* check that IN_DONT_FOLLOW is an integer */
+  return n;
+}
+
+static int _cffi_const_IN_EXCL_UNLINK(unsigned long long *o)
+{
+  int n = (IN_EXCL_UNLINK) <= 0;
+  *o = (unsigned long long)((IN_EXCL_UNLINK) | 0);  /* check that IN_EXCL_UNLINK is an integer */
+  return n;
+}
+
+static int _cffi_const_IN_IGNORED(unsigned long long *o)
+{
+  int n = (IN_IGNORED) <= 0;
+  *o = (unsigned long long)((IN_IGNORED) | 0);  /* check that IN_IGNORED is an integer */
+  return n;
+}
+
+static int _cffi_const_IN_ISDIR(unsigned long long *o)
+{
+  int n = (IN_ISDIR) <= 0;
+  *o = (unsigned long long)((IN_ISDIR) | 0);  /* check that IN_ISDIR is an integer */
+  return n;
+}
+
+static int _cffi_const_IN_MASK_ADD(unsigned long long *o)
+{
+  int n = (IN_MASK_ADD) <= 0;
+  *o = (unsigned long long)((IN_MASK_ADD) | 0);  /* check that IN_MASK_ADD is an integer */
+  return n;
+}
+
+static int _cffi_const_IN_MODIFY(unsigned long long *o)
+{
+  int n = (IN_MODIFY) <= 0;
+  *o = (unsigned long long)((IN_MODIFY) | 0);  /* check that IN_MODIFY is an integer */
+  return n;
+}
+
+static int _cffi_const_IN_MOVE(unsigned long long *o)
+{
+  int n = (IN_MOVE) <= 0;
+  *o = (unsigned long long)((IN_MOVE) | 0);  /* check that IN_MOVE is an integer */
+  return n;
+}
+
+static int _cffi_const_IN_MOVED_FROM(unsigned long long *o)
+{
+  int n = (IN_MOVED_FROM) <= 0;
+  *o = (unsigned long long)((IN_MOVED_FROM) | 0);  /* check that IN_MOVED_FROM is an integer */
+  return n;
+}
+
+static int _cffi_const_IN_MOVED_TO(unsigned long long *o)
+{
+  int n = (IN_MOVED_TO) <= 0;
+  *o = (unsigned long long)((IN_MOVED_TO) | 0);  /* check that IN_MOVED_TO is an integer */
+  return n;
+}
+
+static int _cffi_const_IN_MOVE_SELF(unsigned long long *o)
+{
+  int n = (IN_MOVE_SELF) <= 0;
+  *o = (unsigned long long)((IN_MOVE_SELF) | 0);  /* check that IN_MOVE_SELF is an integer */
+  return n;
+}
+
+static int _cffi_const_IN_NONBLOCK(unsigned long long *o)
+{
+  int n = (IN_NONBLOCK) <= 0;
+  *o = (unsigned long long)((IN_NONBLOCK) | 0);  /* check that IN_NONBLOCK is an integer */
+  return n;
+}
+
+static int _cffi_const_IN_ONESHOT(unsigned long long *o)
+{
+  int n = (IN_ONESHOT) <= 0;
+  *o = (unsigned long long)((IN_ONESHOT) | 0);  /* check that IN_ONESHOT is an integer */
+  return n;
+}
+
+static int _cffi_const_IN_ONLYDIR(unsigned long long *o)
+{
+  int n = (IN_ONLYDIR) <= 0;
+  *o = (unsigned long long)((IN_ONLYDIR) | 0);  /* check that IN_ONLYDIR is an integer */
+  return n;
+}
+
+static int _cffi_const_IN_OPEN(unsigned long long *o)
+{
+  int n = (IN_OPEN) <= 0;
+  *o = (unsigned long long)((IN_OPEN) | 0);  /* check that IN_OPEN is an integer */
+  return n;
+}
+
+static int _cffi_const_IN_Q_OVERFLOW(unsigned long long *o)
+{
+  int n = (IN_Q_OVERFLOW) <= 0;
+  *o = (unsigned long long)((IN_Q_OVERFLOW) | 0);  /* check that IN_Q_OVERFLOW is an integer */
+  return n;
+}
+
+static int _cffi_const_IN_UNMOUNT(unsigned long long *o)
+{
+  int n = (IN_UNMOUNT) <= 0;
+  *o = (unsigned long long)((IN_UNMOUNT) | 0);  /* check that IN_UNMOUNT is an integer */
+  return n;
+}
+
+static int _cffi_const_NAME_MAX(unsigned long long *o)
+{
+  int n = (NAME_MAX) <= 0;
+  *o = (unsigned long long)((NAME_MAX) | 0);  /* check that NAME_MAX is an integer */
+  return n;
+}
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld_struct_inotify_event(struct inotify_event *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  (void)((p->wd) | 0);  /* check that 'struct inotify_event.wd' is an integer */
+  (void)((p->mask) | 0);  /* check that 'struct inotify_event.mask' is an integer */
+  (void)((p->cookie) | 0);  /* check that 'struct inotify_event.cookie' is an integer */
+  (void)((p->len) | 0);  /* check that 'struct inotify_event.len' is an integer */
+}
+struct _cffi_align_struct_inotify_event { char x; struct inotify_event y; };
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld_struct_inotify_event_info(struct inotify_event_info *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  (void)((p->wd) | 0);  /* check that 'struct inotify_event_info.wd' is an integer */
+  (void)((p->mask) | 0);  /* check that 'struct inotify_event_info.mask' is an integer */
+  (void)((p->cookie) | 0);  /* check that 'struct inotify_event_info.cookie' is an integer */
+  (void)((p->name_offset) | 0);  /* check that 'struct inotify_event_info.name_offset' is an integer */
+  (void)((p->name_len) | 0);  /* check that 'struct inotify_event_info.name_len' is an integer */
+}
+struct _cffi_align_struct_inotify_event_info { char x; struct inotify_event_info y; };
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld_struct_inotify_watch_stats(struct inotify_watch_stats *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  (void)((p->events) | 0);  /* check that 'struct inotify_watch_stats.events' is an integer */
+  (void)((p->bytes) | 0);  /* check that 'struct inotify_watch_stats.bytes' is an integer */
+  (void)((p->last_ns) | 0);  /* check that 'struct inotify_watch_stats.last_ns' is an integer */
+}
+struct _cffi_align_struct_inotify_watch_stats { char x; struct inotify_watch_stats y; };
+
+static const struct _cffi_global_s _cffi_globals[] = {
+  { "IN_ACCESS", (void *)_cffi_const_IN_ACCESS, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "IN_ALL_EVENTS", (void *)_cffi_const_IN_ALL_EVENTS, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "IN_ATTRIB", (void *)_cffi_const_IN_ATTRIB, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "IN_CLOEXEC", (void *)_cffi_const_IN_CLOEXEC, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "IN_CLOSE", (void *)_cffi_const_IN_CLOSE, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "IN_CLOSE_NOWRITE", (void *)_cffi_const_IN_CLOSE_NOWRITE, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "IN_CLOSE_WRITE", (void *)_cffi_const_IN_CLOSE_WRITE, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "IN_CREATE", (void *)_cffi_const_IN_CREATE, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "IN_DELETE", (void *)_cffi_const_IN_DELETE, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "IN_DELETE_SELF", (void *)_cffi_const_IN_DELETE_SELF, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "IN_DONT_FOLLOW", (void *)_cffi_const_IN_DONT_FOLLOW, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "IN_EXCL_UNLINK", (void *)_cffi_const_IN_EXCL_UNLINK, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "IN_IGNORED", (void *)_cffi_const_IN_IGNORED, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "IN_ISDIR", (void *)_cffi_const_IN_ISDIR, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "IN_MASK_ADD", (void *)_cffi_const_IN_MASK_ADD, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "IN_MODIFY", (void *)_cffi_const_IN_MODIFY, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "IN_MOVE", (void *)_cffi_const_IN_MOVE, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "IN_MOVED_FROM", (void *)_cffi_const_IN_MOVED_FROM, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "IN_MOVED_TO", (void *)_cffi_const_IN_MOVED_TO, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "IN_MOVE_SELF", (void *)_cffi_const_IN_MOVE_SELF, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "IN_NONBLOCK", (void *)_cffi_const_IN_NONBLOCK, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "IN_ONESHOT", (void *)_cffi_const_IN_ONESHOT, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "IN_ONLYDIR", (void *)_cffi_const_IN_ONLYDIR, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "IN_OPEN", (void *)_cffi_const_IN_OPEN, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "IN_Q_OVERFLOW", (void *)_cffi_const_IN_Q_OVERFLOW, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "IN_UNMOUNT", (void *)_cffi_const_IN_UNMOUNT, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "NAME_MAX", (void *)_cffi_const_NAME_MAX, _CFFI_OP(_CFFI_OP_CONSTANT_INT, -1), (void *)0 },
+  { "inotify_account_events", (void *)_cffi_f_inotify_account_events, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 0), (void *)_cffi_d_inotify_account_events },
+  { "inotify_add_watch", (void *)_cffi_f_inotify_add_watch, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 11), (void *)_cffi_d_inotify_add_watch },
+  { "inotify_add_watches", (void *)_cffi_f_inotify_add_watches, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 29), (void *)_cffi_d_inotify_add_watches },
+  { "inotify_decode_events", (void *)_cffi_f_inotify_decode_events, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 22), (void *)_cffi_d_inotify_decode_events },
+  { "inotify_init", (void *)_cffi_f_inotify_init, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_N, 20), (void *)_cffi_d_inotify_init },
+  { "inotify_init1", (void *)_cffi_f_inotify_init1, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_O, 8), (void *)_cffi_d_inotify_init1 },
+  { "inotify_rm_watch", (void *)_cffi_f_inotify_rm_watch, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 16), (void *)_cffi_d_inotify_rm_watch },
+};
+
+static const struct _cffi_field_s _cffi_fields[] = {
+  { "wd", offsetof(struct inotify_event, wd),
+          sizeof(((struct inotify_event *)0)->wd),
+          _CFFI_OP(_CFFI_OP_NOOP, 5) },
+  { "mask", offsetof(struct inotify_event, mask),
+            sizeof(((struct inotify_event *)0)->mask),
+            _CFFI_OP(_CFFI_OP_NOOP, 14) },
+  { "cookie", offsetof(struct inotify_event, cookie),
+              sizeof(((struct inotify_event *)0)->cookie),
+              _CFFI_OP(_CFFI_OP_NOOP, 14) },
+  { "len", offsetof(struct inotify_event, len),
+           sizeof(((struct inotify_event *)0)->len),
+           _CFFI_OP(_CFFI_OP_NOOP, 14) },
+  { "wd", offsetof(struct inotify_event_info, wd),
+          sizeof(((struct inotify_event_info *)0)->wd),
+          _CFFI_OP(_CFFI_OP_NOOP, 5) },
+  { "mask", offsetof(struct inotify_event_info, mask),
+            sizeof(((struct inotify_event_info *)0)->mask),
+            _CFFI_OP(_CFFI_OP_NOOP, 14) },
+  { "cookie", offsetof(struct inotify_event_info, cookie),
+              sizeof(((struct inotify_event_info *)0)->cookie),
+              _CFFI_OP(_CFFI_OP_NOOP, 14) },
+  { "name_offset", offsetof(struct inotify_event_info, name_offset),
+                   sizeof(((struct inotify_event_info *)0)->name_offset),
+                   _CFFI_OP(_CFFI_OP_NOOP, 14) },
+  { "name_len", offsetof(struct inotify_event_info, name_len),
+                sizeof(((struct inotify_event_info *)0)->name_len),
+                _CFFI_OP(_CFFI_OP_NOOP, 14) },
+  { "events", offsetof(struct inotify_watch_stats, events),
+              sizeof(((struct inotify_watch_stats *)0)->events),
+              _CFFI_OP(_CFFI_OP_NOOP, 3) },
+  { "bytes", offsetof(struct inotify_watch_stats, bytes),
+             sizeof(((struct inotify_watch_stats *)0)->bytes),
+             _CFFI_OP(_CFFI_OP_NOOP, 3) },
+  { "last_ns", offsetof(struct inotify_watch_stats, last_ns),
+               sizeof(((struct inotify_watch_stats *)0)->last_ns),
+               _CFFI_OP(_CFFI_OP_NOOP, 3) },
+};
+
+static const struct _cffi_struct_union_s _cffi_struct_unions[] = {
+  { "inotify_event", 37, _CFFI_F_CHECK_FIELDS,
+    sizeof(struct inotify_event), offsetof(struct _cffi_align_struct_inotify_event, y), 0, 4 },
+  { "inotify_event_info", 38, _CFFI_F_CHECK_FIELDS,
+    sizeof(struct inotify_event_info), offsetof(struct _cffi_align_struct_inotify_event_info, y), 4, 5 },
+  { "inotify_watch_stats", 39, _CFFI_F_CHECK_FIELDS,
+    sizeof(struct inotify_watch_stats), offsetof(struct _cffi_align_struct_inotify_watch_stats, y), 9, 3 },
+};
+
+static const struct _cffi_type_context_s _cffi_type_context = {
+  _cffi_types,
+  _cffi_globals,
+  _cffi_fields,
+  _cffi_struct_unions,
+  NULL,  /* no enums */
+  NULL,  /* no typenames */
+  34,  /* num_globals */
+  3,  /* num_struct_unions */
+  0,  /* num_enums */
+  0,  /* num_typenames */
+  NULL,  /* no includes */
+  41,  /* num_types */
+  0,  /* flags */
+};
+
+#ifdef __GNUC__
+#  pragma GCC visibility push(default)  /* for -fvisibility= */
+#endif
+
+#ifdef PYPY_VERSION
+PyMODINIT_FUNC
+_cffi_pypyinit__inotify_c(const void *p[])
+{
+    p[0] = (const void *)0x2601;
+    p[1] = &_cffi_type_context;
+    return NULL;
+}
+#  ifdef _MSC_VER
+     PyMODINIT_FUNC
+     PyInit__inotify_c(void) { return NULL; }
+#  endif
+#else
+PyMODINIT_FUNC
+PyInit__inotify_c(void)
+{
+  return _cffi_init("_inotify_c", 0x2601, &_cffi_type_context);
+}
+#endif
+
+#ifdef __GNUC__
+#  pragma GCC visibility pop
+#endif
@@ -2,11 +2,15 @@
 """fanotify: wrapper around the fanotify family of syscalls for watching for file modifcation"""
 
 from .utils import PermissionError, UnknownError, CLOEXEC_DEFAULT
+from .utils import O_CLOEXEC, fsdecode, fsencode, iter_unpack, move_to_end
+from . import procinfo as _procinfo
 from collections import namedtuple
+from struct import Struct
 from os import O_RDONLY, O_WRONLY, O_RDWR
-from os import getpid, readlink
-from os import close
-from os.path import join
+from os import open as _open, O_DIRECTORY
+from os import close, getpid
+from collections import OrderedDict, deque
+import threading as _threading
 import errno
 
 READ_EVENTS_MAX = 10
@@ -82,28 +86,49 @@ def fanotify_mark(fd, path, mask, flags, dfd=0):
             raise UnknownError(err)
 
 class FanotifyEvent(object):
-    __slots__ = ['_filename', 'version', 'mask', 'fd', 'pid']
-    def __init__(self, version, mask, fd, pid):
+    __slots__ = ['_filename', '_process', '_batch', '_index', 'version', 'mask', 'fd', 'pid', 'received_ns']
+    def __init__(self, version, mask, fd, pid, received_ns=None):
         self.version = version
         self.mask = mask
         self.fd = fd
         self.pid = pid
+        # time.monotonic_ns() when the event was read, if known
+        self.received_ns = received_ns
 
         self._filename = None
+        self._process = None
+        # the FanotifyEventBatch (and record) the event was built from
+        self._batch = None
+        self._index = None
                 
     @property
     def filename(self):
         if not self._filename:
-            try:
-                name = readlink(join('/proc', str(getpid()), 'fd', str(self.fd)))
-                self._filename = name
-            except OSError:
-                self._filename = "<Unknown>"
+            # always the current path, the cache can not see renames
+            path = _resolver.readlink([self.fd])[0] if self.fd is not None else None
+            self._filename = "<Unknown>" if path is None else fsdecode(path)
     
         return self._filename
         
+    @property
+    def process(self):
+        """The ProcessInfo of the process that caused the event (see
+        butter.procinfo), or None if it has exited and was not cached"""
+        if self._process is None:
+            self._process = _procinfo.default_cache.get(self.pid)
+        return self._process
+
     def close(self):
-        close(self.fd)
+        if self._batch is not None:
+            self._batch._close_fd(self._index)
+        elif self.fd is not None and self.fd >= 0:
+            close(self.fd)
+        self.fd = None
+
+    def _forget_fd(self):
+        """The fd has been closed elsewhere (eg by fanotify_respond_many)"""
+        if self._batch is not None:
+            self._batch._infos[self._index].fd = -1
         self.fd = None
 
     def __repr__(self):
@@ -155,19 +180,453 @@ class FanotifyEvent(object):
         return True if self.mask & FAN_EVENT_ON_CHILD else False
 
 
-def str_to_events(str):
-    event_struct_size = ffi.sizeof('struct fanotify_event_metadata')
+# scratch space that is always written before it is read
+_new_uncleared = ffi.new_allocator(should_clear_after_alloc=False)
+
+
+class PathResolver(object):
+    """Resolve event fds to the paths they refer to, with a cache
+
+    Each batch of fds is fstat'd and resolved with readlinkat() against a
+    cached /proc/self/fd directory fd in C without holding the GIL. Paths
+    are cached against the device, inode and birth time of the file so
+    repeated events against the same file (including the stream of
+    FAN_MODIFY events a file being written produces) skip the readlink, the
+    least recently used entry is evicted once maxsize paths are cached
+
+    The birth time tells apart a new file that reuses the inode of a
+    deleted one, on filesystems that do not record it (statx() STATX_BTIME)
+    callers should invalidate() deleted paths. The cache cannot see a file
+    being renamed, so callers that care should pass the old path to
+    invalidate(), eg from the IN_MOVED_FROM events of an inotify watch on
+    the same tree, or use readlink() which skips the cache. A resolver may
+    be shared between threads
+    """
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        # (dev, ino) -> path, and the reverse used by invalidate()
+        self._cache = OrderedDict()
+        self._keys = {}
+        self._lock = _threading.Lock()
+        self._dirfd = None
+        # pid of the process that opened the dirfd
+        self._pid = None
+
+    def _check_fork(self):
+        if self._pid is not None and self._pid != getpid():
+            self._after_fork()
+
+    def _proc_fd(self):
+        self._check_fork()
+        with self._lock:
+            if self._dirfd is None:
+                self._dirfd = _open('/proc/self/fd', O_RDONLY | O_DIRECTORY | O_CLOEXEC)
+                self._pid = getpid()
+            return self._dirfd
+
+    def resolve(self, fds):
+        """Return the path (bytes) of each fd in fds, or None for fds that
+        could not be resolved"""
+        n = len(fds)
+        if n == 0:
+            return []
+        c_fds = ffi.new('int32_t[]', fds)
+        ids = ffi.new('struct fanotify_file_id[]', n)
+        lib.fanotify_stat_fds(c_fds, n, ids)
+
+        cache = self._cache
+        paths = [None] * n
+        # key -> indexes of fds needing a readlink, only the first is read
+        misses = OrderedDict()
+        hits = 0
+        self._check_fork()
+        with self._lock:
+            for i in range(n):
+                key = (ids[i].dev, ids[i].ino, ids[i].btime_ns)
+                if key[0] == 0 and key[1] == 0:
+                    # not a valid fd
+                    continue
+                path = cache.get(key)
+                if path is not None:
+                    move_to_end(cache, key)
+                    paths[i] = path
+                    hits += 1
+                elif key in misses:
+                    misses[key].append(i)
+                    hits += 1
+                else:
+                    misses[key] = [i]
+            self.hits += hits
+            self.misses += n - hits
+        if not misses:
+            return paths
+
+        read = self.readlink([fds[indexes[0]] for indexes in misses.values()])
+
+        keys = self._keys
+        with self._lock:
+            for path, (key, indexes) in zip(read, misses.items()):
+                if path is None:
+                    continue
+                old = cache.get(key)
+                if old is not None:
+                    keys.pop(old, None)
+                cache[key] = path
+                keys[path] = key
+                for i in indexes:
+                    paths[i] = path
+            while len(cache) > self.maxsize:
+                keys.pop(cache.popitem(last=False)[1], None)
+
+        return paths
+
+    def readlink(self, fds):
+        """Return the current path (bytes) of each fd in fds, or None for
+        fds that could not be resolved, without using the cache"""
+        n = len(fds)
+        if n == 0:
+            return []
+        c_fds = ffi.new('int32_t[]', fds)
+        buf = _new_uncleared('char[]', n * lib.PATH_MAX)
+        lengths = ffi.new('int32_t[]', n)
+        lib.fanotify_readlink_fds(self._proc_fd(), c_fds, n, buf, lib.PATH_MAX, lengths)
+
+        raw = ffi.buffer(buf)
+        paths = [None] * n
+        for i in range(n):
+            length = lengths[i]
+            if length >= 0:
+                start = i * lib.PATH_MAX
+                paths[i] = raw[start:start + length]
+        return paths
+
+    def invalidate(self, path):
+        """Forget the cached path of a file that was renamed or deleted,
+        along with everything cached beneath it if it is a directory.
+        Returns the amount of entries dropped"""
+        if isinstance(path, str):
+            path = fsencode(path)
+        prefix = path.rstrip(b'/') + b'/'
+        cache = self._cache
+        keys = self._keys
+        with self._lock:
+            stale = [cached for cached in keys
+                     if cached == path or cached.startswith(prefix)]
+            for cached in stale:
+                del cache[keys.pop(cached)]
+        return len(stale)
+
+    def clear(self):
+        """Discard all cached paths"""
+        with self._lock:
+            self._cache.clear()
+            self._keys.clear()
+
+    def close(self):
+        """Close the /proc/self/fd directory, it is reopened when next needed"""
+        with self._lock:
+            if self._dirfd is not None:
+                close(self._dirfd)
+                self._dirfd = None
+
+    def _after_fork(self):
+        # /proc/self was resolved when the dirfd was opened and now refers
+        # to the parent process. The lock may have been held by another
+        # thread of the parent at the time of the fork
+        self._lock = _threading.Lock()
+        if self._dirfd is not None:
+            close(self._dirfd)
+        self._dirfd = None
+        self._pid = None
+
+    def __len__(self):
+        return len(self._cache)
+
+
+# Events that wait for a response, their fds are closed by answering them
+PERM_EVENTS = FAN_OPEN_PERM | FAN_ACCESS_PERM
+
+
+# used by FanotifyEvent.filename and FanotifyEventBatch.resolve_paths() for
+# its /proc/self/fd dirfd, its cache is not used unless asked for
+_resolver = PathResolver()
+
+
+EVENT_STRUCT_SIZE = ffi.sizeof('struct fanotify_event_metadata')
+_EVENT_INFO = Struct('QiiI4x')
+assert _EVENT_INFO.size == ffi.sizeof('struct fanotify_event_info')
+
+
+class FanotifyEventBatch(object):
+    """A batch of events decoded from a buffer read from a fanotify fd
 
-    events = []
+    The records are held in a C array of (mask, fd, pid) and FanotifyEvent
+    objects are only built when individual events are accessed, so callers
+    that only need the masks, fds or pids of a batch never create a python
+    object per event. Indexing or iterating the batch returns FanotifyEvents
 
-    str_buf = ffi.new('char[]', len(str))
-    str_buf[0:len(str)] = str
+    The batch owns the fds of its events, see close(). The fd of a record
+    that has been closed (via the batch, its FanotifyEvent or an FdTable)
+    reads as -1
+    """
+    __slots__ = ['_infos', '_count', '_events', '_paths', '_table', 'received_ns']
+
+    def __init__(self, infos, count, received_ns=None):
+        self._infos = infos
+        self._count = count
+        self._events = None
+        self._paths = None
+        # the FdTable tracking the fds of the batch, if any
+        self._table = None
+        self.received_ns = received_ns
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if self._events is None:
+            self._events = [None] * self._count
+        event = self._events[index]
+        if event is None:
+            if index < 0:
+                index += self._count
+            info = self._infos[index]
+            event = FanotifyEvent(info.vers, info.mask, info.fd, info.pid, self.received_ns)
+            event._batch = self
+            event._index = index
+            self._events[index] = event
+            if self._paths is not None:
+                event._filename = self._paths[index]
+        return event
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self[i]
+
+    def records(self):
+        """Return the events as a list of (mask, fd, pid) tuples"""
+        return [(mask, fd, pid) for mask, fd, pid, vers in iter_unpack(_EVENT_INFO, self._buffer())]
+
+    @property
+    def masks(self):
+        return [info[0] for info in iter_unpack(_EVENT_INFO, self._buffer())]
+
+    @property
+    def fds(self):
+        return [info[1] for info in iter_unpack(_EVENT_INFO, self._buffer())]
+
+    @property
+    def pids(self):
+        return [info[2] for info in iter_unpack(_EVENT_INFO, self._buffer())]
+
+    def events(self):
+        """Return every event in the batch as a list of FanotifyEvents"""
+        if self._events is None:
+            received_ns = self.received_ns
+            self._events = [FanotifyEvent(vers, mask, fd, pid, received_ns)
+                            for mask, fd, pid, vers in iter_unpack(_EVENT_INFO, self._buffer())]
+            for index, event in enumerate(self._events):
+                event._batch = self
+                event._index = index
+            if self._paths is not None:
+                for event, path in zip(self._events, self._paths):
+                    event._filename = path
+            return list(self._events)
+        return list(self)
+
+    def resolve_paths(self, resolver=None):
+        """Resolve the path of every event in the batch in a single call
+
+        The paths are also used as the filename of the FanotifyEvents of the
+        batch, events whose path cannot be resolved get '<Unknown>'
+
+        By default every fd is resolved to its current path. Passing a
+        PathResolver opts in to its cache, which skips the readlink for
+        files seen before but returns the old path of a renamed file until
+        it is invalidated (see PathResolver)
+
+        Arguments
+        ----------
+        :param PathResolver resolver: The resolver (and cache) to use, if
+                                      None the paths are not cached
+
+        Returns
+        --------
+        :return: The path (str) of each event
+        :rtype: list
+        """
+        if resolver is None:
+            paths = _resolver.readlink(self.fds)
+        else:
+            paths = resolver.resolve(self.fds)
+        self._paths = ["<Unknown>" if path is None else fsdecode(path) for path in paths]
+        if self._events is not None:
+            for event, path in zip(self._events, self._paths):
+                if event is not None and not event._filename:
+                    event._filename = path
+        return list(self._paths)
+
+    def processes(self, cache=None):
+        """Look up the ProcessInfo of every event in the batch in one pass
+
+        The results are also attached to the FanotifyEvents of the batch
+
+        Arguments
+        ----------
+        :param ProcessInfoCache cache: Defaults to butter.procinfo.default_cache
+
+        Returns
+        --------
+        :return: The ProcessInfo (or None) for each event
+        :rtype: list
+        """
+        infos = (cache or _procinfo.default_cache).get_many(self.pids)
+        for event, info in zip(self.events(), infos):
+            event._process = info
+        return infos
+
+    def close(self):
+        """Close the fd of every event in the batch not already closed via
+        its FanotifyEvent, the records are left with an fd of -1 (FAN_NOFD)"""
+        for i in range(self._count):
+            self._close_fd(i)
+
+    def _close_fd(self, index):
+        """Close the fd of a record (if still open) and of its FanotifyEvent"""
+        info = self._infos[index]
+        if info.fd < 0:
+            return
+        close(info.fd)
+        info.fd = -1
+        if self._events is not None and self._events[index] is not None:
+            self._events[index].fd = None
+        if self._table is not None and not info.mask & PERM_EVENTS:
+            self._table._open -= 1
+
+    def _buffer(self):
+        return ffi.buffer(self._infos, self._count * _EVENT_INFO.size)
+
+    def __repr__(self):
+        return "<FanotifyEventBatch events={}>".format(self._count)
 
-    i = 0
-    while i < len(str_buf):
-        event = ffi.cast('struct fanotify_event_metadata *', str_buf[i:i+event_struct_size])
-        events.append(FanotifyEvent(event.vers, event.mask, event.fd, event.pid))
 
-        i += event.event_len
+class FdTable(object):
+    """Bound the amount of event fds held open at once
 
-    return events
+    Batches are added as they are read and once more than limit fds are
+    open, the oldest still open are closed to make room (their records read
+    as -1 and the fd of their FanotifyEvent, if one was built, is set to
+    None). Fds are tracked by their index in the batch so no FanotifyEvent
+    is built to track them. Fds closed by the user free their slot,
+    permission events are never tracked as their fd is closed when they are
+    answered
+    """
+    def __init__(self, limit):
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        self.limit = limit
+        # number of fds closed to make room
+        self.evicted = 0
+        # open tracked fds, kept up to date by FanotifyEventBatch._close_fd()
+        self._open = 0
+        # (batch, index) of tracked records, oldest first. Records closed
+        # by the user are skipped when evicting
+        self._records = deque()
+
+    def add_batch(self, batch):
+        """Track the fds of a batch, evicting the oldest if over the limit"""
+        records = self._records
+        batch._table = self
+        for index, (mask, fd, pid, vers) in enumerate(iter_unpack(_EVENT_INFO, batch._buffer())):
+            if fd >= 0 and not mask & PERM_EVENTS:
+                records.append((batch, index))
+                self._open += 1
+
+        while self._open > self.limit:
+            batch, index = records.popleft()
+            if batch._infos[index].fd >= 0:
+                batch._close_fd(index)
+                self.evicted += 1
+
+        # drop the records the user has closed so they do not pile up
+        if len(records) > 2 * self.limit:
+            self._records = deque(record for record in records
+                                  if record[0]._infos[record[1]].fd >= 0)
+
+    def close_all(self):
+        """Close every tracked fd that is still open"""
+        records = self._records
+        while records:
+            batch, index = records.popleft()
+            batch._close_fd(index)
+
+    def __len__(self):
+        """The amount of tracked fds that are still open"""
+        return self._open
+
+
+def buffer_to_batch(buf, length=None, received_ns=None):
+    """Decode a buffer read from a fanotify fd into a FanotifyEventBatch
+
+    Arguments
+    ----------
+    :param buf: A bytes like object holding events read from a fanotify fd
+    :param int length: The amount of valid bytes at the start of buf,
+                       defaults to all of it
+    :param int received_ns: The time.monotonic_ns() the buffer was read at
+
+    Returns
+    --------
+    :return: The events contained in the buffer
+    :rtype: FanotifyEventBatch
+    """
+    if length is None:
+        length = len(buf)
+    max_events = length // EVENT_STRUCT_SIZE
+    infos = ffi.new('struct fanotify_event_info[]', max(max_events, 1))
+    count = 0
+    if max_events > 0:
+        count = lib.fanotify_decode_events(ffi.from_buffer(buf), length, infos, max_events)
+    return FanotifyEventBatch(infos, count, received_ns)
+
+
+def fanotify_respond_many(fd, responses, close_fds=True):
+    """Answer many permission events with a single writev()
+
+    Arguments
+    ----------
+    :param int fd: The fanotify fd the events were read from
+    :param responses: A sequence of (event fd, FAN_ALLOW or FAN_DENY) pairs
+    :param bool close_fds: Close each event fd once its response is written
+
+    Returns
+    --------
+    :return: The status of each response, 0 if it was accepted otherwise the
+             (positive) errno the kernel rejected it with
+    :rtype: list
+
+    Exceptions
+    -----------
+    Rejected responses do not stop the rest of the batch, the errors are
+    returned rather than raised:
+    ENOENT: The event fd is not awaiting a response (or was already answered)
+    EINVAL: The response was not FAN_ALLOW or FAN_DENY
+    """
+    if hasattr(fd, 'fileno'):
+        fd = fd.fileno()
+    n = len(responses)
+    if n == 0:
+        return []
+
+    c_responses = ffi.new('struct fanotify_response[]', responses)
+    status = ffi.new('int32_t[]', n)
+    lib.fanotify_respond_many(fd, c_responses, n, 1 if close_fds else 0, status)
+
+    return [-err for err in status]
+
+
+def str_to_events(str):
+    """Decode a buffer read from a fanotify fd into a list of FanotifyEvents"""
+    return buffer_to_batch(str).events()
@@ -2,7 +2,11 @@
 """inotify: Wrapper around the inotify syscalls providing both a function based and file like interface"""
 
 from collections import namedtuple
+from struct import Struct
+from enum import IntEnum
+from heapq import nlargest
 from .utils import PermissionError, UnknownError, CLOEXEC_DEFAULT
+from .utils import monotonic_ns, iter_unpack
 import errno
 
 from ._inotify_c import ffi, lib
@@ -103,26 +107,73 @@ def inotify_add_watch(fd, path, mask):
     wd = lib.inotify_add_watch(fd, path, mask)
 
     if wd < 0:
-        err = ffi.errno
-        if err == errno.EINVAL:
-            raise ValueError("The event mask contains no valid events; or fd is not an inotify file descriptor")
-        elif err == errno.EACCES:
-            raise PermissionError("You do not have permission to read the specified path")
-        elif err == errno.EBADF:
-            raise ValueError("fd is not a valid file descriptor")
-        elif err == errno.EFAULT:
-            raise ValueError("path points to a file/folder outside the processes accessible address space")
-        elif err == errno.ENOENT:
-            raise ValueError("File/Folder pointed to by path does not exist")
-        elif err == errno.ENOSPC:
-            raise OSError("Maximum number of watches hit or insufficent kernel resources")
-        elif err == errno.ENOMEM:
-            raise MemoryError("Insufficent kernel memory avalible")
-        else:
-            # If you are here, its a bug. send us the traceback
-            raise UnknownError(err)
+        raise _add_watch_error(ffi.errno)
             
     return wd
+
+def _add_watch_error(err):
+    """Map an errno from inotify_add_watch to the exception to raise"""
+    if err == errno.EINVAL:
+        return ValueError("The event mask contains no valid events; or fd is not an inotify file descriptor")
+    elif err == errno.EACCES:
+        return PermissionError("You do not have permission to read the specified path")
+    elif err == errno.EBADF:
+        return ValueError("fd is not a valid file descriptor")
+    elif err == errno.EFAULT:
+        return ValueError("path points to a file/folder outside the processes accessible address space")
+    elif err == errno.ENOENT:
+        return ValueError("File/Folder pointed to by path does not exist")
+    elif err == errno.ENOTDIR:
+        return ValueError("IN_ONLYDIR was specified and path is not a directory")
+    elif err == errno.ENOSPC:
+        return OSError("Maximum number of watches hit or insufficent kernel resources")
+    elif err == errno.ENOMEM:
+        return MemoryError("Insufficent kernel memory avalible")
+    else:
+        # If you are here, its a bug. send us the traceback
+        return UnknownError(err)
+
+def inotify_add_watches(fd, paths, mask, ignore_errors=(errno.ENOENT, errno.ENOTDIR, errno.EACCES)):
+    """Start watching multiple filepaths for events in a single call
+
+    Arguments:
+    -----------
+    fd:            The inotify file descriptor to attach the watches to
+    paths:         A sequence of paths (bytes) to be monitored for events
+    mask:          The events to listen for (see inotify_add_watch)
+    ignore_errors: errno values that only cause the affected path to be
+                   skipped instead of raising an exception, by default
+                   paths that vanished or are unreadable are skipped
+
+    Returns:
+    ---------
+    list: A watch descriptor for each path, or -errno for skipped paths
+
+    Exceptions:
+    ------------
+    As for inotify_add_watch, raised for the first failed path whose
+    errno is not in ignore_errors, watches added before it remain in place
+    """
+    if hasattr(fd, "fileno"):
+        fd = fd.fileno()
+
+    assert isinstance(fd, int), "fd must by an integer"
+    assert isinstance(mask, int), "mask must be an integer"
+
+    if not paths:
+        return []
+
+    packed = b'\0'.join(paths) + b'\0'
+    wds = ffi.new('int[]', len(paths))
+    lib.inotify_add_watches(fd, packed, len(paths), mask, wds)
+    wds = list(wds)
+
+    for wd in wds:
+        if wd < 0 and -wd not in ignore_errors:
+            raise _add_watch_error(-wd)
+
+    return wds
+    
     
 def inotify_rm_watch(fd, wd):
     """Stop watching a path for events
@@ -160,27 +211,237 @@ def inotify_rm_watch(fd, wd):
             raise UnknownError(err)
 
 
-def str_to_events(str):
-    event_struct_size = ffi.sizeof('struct inotify_event')
+EVENT_STRUCT_SIZE = ffi.sizeof('struct inotify_event')
+# Smallest buffer guaranteed to hold at least one event, reads into a
+# smaller buffer fail with EINVAL if the next event has a long filename
+EVENT_BUFFER_MIN = EVENT_STRUCT_SIZE + lib.NAME_MAX + 1
+
+# unpacks the struct inotify_event_info records produced by the C decoder
+# directly into python ints without going through cffi's attribute access
+_EVENT_INFO = Struct('iIIII')
+assert _EVENT_INFO.size == ffi.sizeof('struct inotify_event_info')
+
+
+def new_event_infos(buf_len):
+    """Allocate scratch space for decoding a buffer of up to buf_len bytes
+    with buffer_to_events, this can be reused between calls
+    """
+    return ffi.new('struct inotify_event_info[]', max(buf_len // EVENT_STRUCT_SIZE, 1))
+
 
-    events = []
+# Passed as a mask to the decoding functions to keep every event
+ALL_MASK = 0xffffffff
 
-    str_buf = ffi.new('char[]', len(str))
-    str_buf[0:len(str)] = str
 
-    i = 0
-    while i < len(str_buf):
-        event = ffi.cast('struct inotify_event *', str_buf[i:i+event_struct_size])
+def buffer_to_events(buf, length, infos, mask=ALL_MASK):
+    """Decode the first length bytes of a (reusable) buffer into InotifyEvents
+
+    Arguments
+    ----------
+    :param buf: A bytes like object holding events read from an inotify fd
+    :param int length: The amount of valid bytes at the start of buf
+    :param infos: Scratch space as allocated by new_event_infos(length)
+    :param int mask: Only return events with one of these bits set in their
+                     mask, the rest are skipped in C before any python
+                     objects are created for them
+
+    Returns
+    --------
+    :return: The events contained in the buffer
+    :rtype: list
+    """
+    max_events = min(length // EVENT_STRUCT_SIZE, len(infos))
+    if max_events == 0:
+        return []
+
+    count = lib.inotify_decode_events(ffi.from_buffer(buf), length, mask, infos, max_events)
+    infos = ffi.buffer(infos, count * _EVENT_INFO.size)
+
+    new = tuple.__new__
+    if isinstance(buf, bytes):
+        return [new(InotifyEvent, (wd, mask, cookie, buf[offset:offset + length]))
+                for wd, mask, cookie, offset, length in iter_unpack(_EVENT_INFO, infos)]
+
+    # mutable buffers get reused, copy the filename out as bytes
+    view = memoryview(buf)
+    return [new(InotifyEvent, (wd, mask, cookie, view[offset:offset + length].tobytes()))
+            for wd, mask, cookie, offset, length in iter_unpack(_EVENT_INFO, infos)]
+
+
+InotifyEventArray = namedtuple("InotifyEventArray", "events name_offsets names")
+class InotifyEventArray(InotifyEventArray):
+    """A batch of inotify events as numpy arrays
+
+    events:       structured array with int32 'wd' and uint32 'mask' and 'cookie' fields
+    name_offsets: int64 array of len(events) + 1 offsets into names, the filename of
+                  events[i] is names[name_offsets[i]:name_offsets[i + 1]]
+    names:        bytes holding every filename back to back
+    """
+    __slots__ = []
 
-        filename_start = i + event_struct_size
-        filename_end = filename_start + event.len
-        filename = ffi.string(str_buf[filename_start:filename_end])
-        
-        events.append(InotifyEvent(event.wd, event.mask, event.cookie, filename))
-        
-        i += event_struct_size + event.len
 
-    return events
+# dtype of the 'events' array in an InotifyEventArray
+EVENT_DTYPE = [('wd', 'i4'), ('mask', 'u4'), ('cookie', 'u4')]
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("numpy is required to decode inotify events into arrays")
+    return numpy
+
+
+def buffer_to_arrays(buf, length, infos, mask=ALL_MASK):
+    """Decode the first length bytes of a buffer into an InotifyEventArray
+
+    The arguments are as for buffer_to_events(), the events are decoded in C
+    and then copied into numpy arrays without creating a python object per
+    event. numpy is imported on first use
+
+    Returns
+    --------
+    :return: The events contained in the buffer
+    :rtype: InotifyEventArray
+    """
+    np = _numpy()
+
+    max_events = min(length // EVENT_STRUCT_SIZE, len(infos))
+    count = 0
+    if max_events > 0:
+        count = lib.inotify_decode_events(ffi.from_buffer(buf), length, mask, infos, max_events)
+
+    info_dtype = np.dtype([('wd', 'i4'), ('mask', 'u4'), ('cookie', 'u4'),
+                           ('name_offset', 'u4'), ('name_len', 'u4')])
+    decoded = np.frombuffer(ffi.buffer(infos, count * info_dtype.itemsize), dtype=info_dtype)
+
+    events = np.empty(count, dtype=EVENT_DTYPE)
+    for field in ('wd', 'mask', 'cookie'):
+        events[field] = decoded[field]
+
+    lengths = decoded['name_len'].astype(np.int64)
+    name_offsets = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(lengths, out=name_offsets[1:])
+
+    # gather every name from the source buffer in one fancy index, each
+    # byte's position in names is shifted by the start of its name in buf
+    shift = decoded['name_offset'].astype(np.int64) - name_offsets[:-1]
+    index = np.repeat(shift, lengths) + np.arange(name_offsets[-1], dtype=np.int64)
+    names = np.frombuffer(buf, dtype=np.uint8, count=length)[index].tobytes()
+
+    return InotifyEventArray(events, name_offsets, names)
+
+
+def events_to_arrays(events):
+    """Convert a list of InotifyEvents into an InotifyEventArray"""
+    np = _numpy()
+
+    array = np.array([(event.wd, event.mask, event.cookie) for event in events], dtype=EVENT_DTYPE)
+    name_offsets = np.zeros(len(events) + 1, dtype=np.int64)
+    np.cumsum([len(event.filename) for event in events], out=name_offsets[1:])
+    names = b''.join(event.filename for event in events)
+
+    return InotifyEventArray(array, name_offsets, names)
+
+
+WatchStat = namedtuple("WatchStat", "events bytes last_event_ns")
+_WATCH_STAT = Struct('QQQ')
+
+
+class WatchStats(object):
+    """Per watch counters of the events read from an inotify fd
+
+    The counters live in a C array indexed by wd and are updated in C from
+    the raw buffer as each batch is read (see Inotify(stats=True)), so
+    keeping them costs a single walk over the buffer and one clock read per
+    batch. All events are counted, including those later dropped by a mask
+
+    For each wd the number of events, the bytes of events (header and
+    padded filename) and the time.monotonic_ns() at which its last event
+    was read are kept
+    """
+    def __init__(self, size=1024):
+        self._stats = ffi.new('struct inotify_watch_stats[]', max(size, 1))
+
+    def account(self, buf, length):
+        """Add the events in the first length bytes of buf to the counters"""
+        if length == 0:
+            return
+        buf = ffi.from_buffer(buf)
+        now = monotonic_ns()
+        size = len(self._stats)
+
+        max_wd = lib.inotify_account_events(buf, length, now, self._stats, 0, size)
+        if max_wd >= size:
+            self._grow(max_wd + 1)
+            lib.inotify_account_events(buf, length, now, self._stats, size, len(self._stats))
+
+    def _grow(self, size):
+        stats = ffi.new('struct inotify_watch_stats[]', max(size, len(self._stats) * 2))
+        ffi.memmove(stats, self._stats, ffi.sizeof(self._stats))
+        self._stats = stats
+
+    def __getitem__(self, wd):
+        if 0 <= wd < len(self._stats):
+            stat = self._stats[wd]
+            return WatchStat(stat.events, stat.bytes, stat.last_ns)
+        return WatchStat(0, 0, 0)
+
+    def snapshot(self):
+        """Return a copy of the counters of every wd that has seen events
+
+        Returns
+        --------
+        :return: wd -> WatchStat
+        :rtype: dict
+        """
+        stats = ffi.buffer(self._stats)
+        return {wd: WatchStat(*stat) for wd, stat in enumerate(iter_unpack(_WATCH_STAT, stats)) if stat[0]}
+
+    def top_n(self, n=10, key='bytes'):
+        """Return the n wds with the largest value of key
+
+        Arguments
+        ----------
+        :param int n: The amount of watches to return
+        :param str key: The WatchStat field to rank by ('events', 'bytes'
+                        or 'last_event_ns')
+
+        Returns
+        --------
+        :return: (wd, WatchStat) pairs, largest first
+        :rtype: list
+        """
+        index = WatchStat._fields.index(key)
+        return nlargest(n, self.snapshot().items(), key=lambda item: item[1][index])
+
+    def forget(self, wd):
+        """Reset the counters for a single wd, eg once it has been removed"""
+        if 0 <= wd < len(self._stats):
+            self._stats[wd] = (0, 0, 0)
+
+    def reset(self):
+        """Reset all counters to zero"""
+        ffi.memmove(self._stats, b'\0' * ffi.sizeof(self._stats), ffi.sizeof(self._stats))
+
+
+def str_to_events(str, mask=ALL_MASK):
+    """Decode a buffer read from an inotify fd into a list of InotifyEvents
+
+    The buffer is walked in C without being copied, only the filenames are
+    copied out of the buffer when the InotifyEvent objects are created
+
+    Arguments
+    ----------
+    :param bytes str: The raw bytes read from the inotify fd
+    :param int mask: Only return events with one of these bits set in their mask
+
+    Returns
+    --------
+    :return: The events contained in the buffer
+    :rtype: list
+    """
+    return buffer_to_events(str, len(str), new_event_infos(len(str)), mask)
 
 
 InotifyEvent = namedtuple("InotifyEvent", "wd mask cookie filename")
@@ -242,6 +503,33 @@ class InotifyEvent(InotifyEvent):
     def is_dir_event(self):
         return True if self.mask & IN_ISDIR else False
 
+    @property
+    def kind(self):
+        """The EventKind of this event, see event_kind()"""
+        mask = self.mask & _KIND_BITS
+        return KIND_TABLE[(mask & -mask).bit_length()]
+
+MoveEvent = namedtuple("MoveEvent", "src dst")
+class MoveEvent(MoveEvent):
+    """A rename, pairing the IN_MOVED_FROM (src) and IN_MOVED_TO (dst)
+    InotifyEvents that share a cookie"""
+    __slots__ = []
+    @property
+    def mask(self):
+        return self.src.mask | self.dst.mask
+
+    @property
+    def cookie(self):
+        return self.src.cookie
+
+    @property
+    def is_dir_event(self):
+        return True if self.src.mask & IN_ISDIR else False
+
+    @property
+    def kind(self):
+        return EventKind.MOVE
+
 # update the local namespace with flags and provide
 # a handy dict for reversable lookups
 event_name = {}
@@ -252,3 +540,98 @@ for key in dir(lib):
         _l[key] = val
         event_name[key] = val
         event_name[val] = key
+
+
+class EventKind(IntEnum):
+    """A small integer per type of inotify event, suitable for indexing a
+    list of handlers, see event_kind() and dispatch()"""
+    ACCESS = 0
+    MODIFY = 1
+    ATTRIB = 2
+    CLOSE_WRITE = 3
+    CLOSE_NOWRITE = 4
+    OPEN = 5
+    MOVED_FROM = 6
+    MOVED_TO = 7
+    CREATE = 8
+    DELETE = 9
+    DELETE_SELF = 10
+    MOVE_SELF = 11
+    UNMOUNT = 12
+    Q_OVERFLOW = 13
+    IGNORED = 14
+    # a paired rename from InotifyMovePairer
+    MOVE = 15
+    # no event bit set in the mask
+    UNKNOWN = 16
+
+# every bit that identifies a type of event, masks are reduced to these
+# bits before their lowest set bit is looked up in KIND_TABLE
+_KIND_BITS = 0xFFFF
+_KIND_FLAGS = [(IN_ACCESS, EventKind.ACCESS), (IN_MODIFY, EventKind.MODIFY),
+               (IN_ATTRIB, EventKind.ATTRIB), (IN_CLOSE_WRITE, EventKind.CLOSE_WRITE),
+               (IN_CLOSE_NOWRITE, EventKind.CLOSE_NOWRITE), (IN_OPEN, EventKind.OPEN),
+               (IN_MOVED_FROM, EventKind.MOVED_FROM), (IN_MOVED_TO, EventKind.MOVED_TO),
+               (IN_CREATE, EventKind.CREATE), (IN_DELETE, EventKind.DELETE),
+               (IN_DELETE_SELF, EventKind.DELETE_SELF), (IN_MOVE_SELF, EventKind.MOVE_SELF),
+               (IN_UNMOUNT, EventKind.UNMOUNT), (IN_Q_OVERFLOW, EventKind.Q_OVERFLOW),
+               (IN_IGNORED, EventKind.IGNORED)]
+assert all(flag & _KIND_BITS == flag for flag, _ in _KIND_FLAGS)
+
+def _build_kind_table():
+    # (lowest bit set).bit_length() -> kind, 0 being no event bit set. masks
+    # with multiple event bits set (eg merged by InotifyCoalescer) classify
+    # as their lowest bit
+    table = bytearray([EventKind.UNKNOWN]) * (_KIND_BITS.bit_length() + 1)
+    for flag, kind in _KIND_FLAGS:
+        table[flag.bit_length()] = kind
+    return tuple(table)
+
+# (mask & 0xFFFF & -mask).bit_length() -> EventKind value as a plain int
+KIND_TABLE = _build_kind_table()
+del _build_kind_table
+
+
+def event_kind(mask):
+    """Classify an inotify event mask as an EventKind with a table lookup
+
+    Masks with more than one event bit set classify as the lowest bit set
+    (eg IN_MODIFY|IN_CLOSE_WRITE is EventKind.MODIFY), flags such as
+    IN_ISDIR are ignored. The value returned is a plain int equal to the
+    EventKind member
+    """
+    mask &= _KIND_BITS
+    return KIND_TABLE[(mask & -mask).bit_length()]
+
+
+def dispatch(events, handlers, default=None):
+    """Call the handler for the kind of each event in turn
+
+    Arguments
+    ----------
+    :param events: An iterable of InotifyEvents (or MoveEvents)
+    :param handlers: A dict of EventKind -> callable, or a sequence of
+                     callables indexed by EventKind
+    :param default: Called for events with no handler, if None they are skipped
+
+    >>> dispatch(inotify.read_events(), {EventKind.CREATE: on_create,
+    ...                                  EventKind.DELETE: on_delete})
+    """
+    if isinstance(handlers, dict):
+        handlers = [handlers.get(kind, default) for kind in EventKind]
+    else:
+        handlers = list(handlers)
+        handlers.extend([default] * (len(EventKind) - len(handlers)))
+        handlers = [default if handler is None else handler for handler in handlers]
+
+    table = KIND_TABLE
+    bits = _KIND_BITS
+    move = EventKind.MOVE
+    for event in events:
+        if event.__class__ is MoveEvent:
+            handler = handlers[move]
+        else:
+            mask = event.mask & bits
+            handler = handlers[table[(mask & -mask).bit_length()]]
+        if handler is not None:
+            handler(event)
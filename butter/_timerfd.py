@@ -178,6 +178,19 @@ def timerfd(clock_type=CLOCK_MONOTONIC, flags=0, closefd=CLOEXEC_DEFAULT):
     return fd
 
 
+def _gettime_error(err):
+    """Turn the errno of a failed timerfd_gettime into an exception"""
+    if err == errno.EBADF:
+        return ValueError("fd is not a valid file descriptor")
+    elif err == errno.EFAULT:
+        return InternalError("curr_val is not a valid pointer (internal/bug, let us know)")
+    elif err == errno.EINVAL:
+        return ValueError("fd is not a valid timerfd")
+    else:
+        # If you are here, its a bug. send us the traceback
+        return UnknownError(err)
+
+
 def timerfd_gettime(fd):
     """Get the current expiry time of a timerfd
     
@@ -207,22 +220,41 @@ def timerfd_gettime(fd):
     ret = lib.timerfd_gettime(fd, curr_val)
     
     if ret < 0:
-        err = ffi.errno
-        if err == errno.EBADF:
-            raise ValueError("fd is not a valid file descriptor")
-        elif err == errno.EFAULT:
-            raise InternalError("curr_val is not a valid pointer (internal/bug, let us know)")
-        elif err == errno.EINVAL:
-            raise ValueError("fd is not a valid timerfd")
-        else:
-            # If you are here, its a bug. send us the traceback
-            raise UnknownError(err)
+        raise _gettime_error(ffi.errno)
 
     curr_val = TimerVal(timerspec=curr_val)
     return curr_val
 
 
-def timerfd_settime(fd, timer_spec, flags=0):
+def _settime_error(err, timer_spec):
+    """Turn the errno of a failed timerfd_settime into an exception"""
+    if err == errno.EINVAL:
+        if timer_spec.it_interval.tv_sec > 999999999:
+            return ValueError("Repeat Seconds > 999,999,999")
+        elif timer_spec.it_interval.tv_nsec > 999999999:
+            return ValueError("Repeat Nano seconds > 999,999,999")
+        elif timer_spec.it_value.tv_sec > 999999999:
+            return ValueError("Offset Seconds > 999,999,999")
+        elif timer_spec.it_value.tv_nsec > 999999999:
+            return ValueError("Offset Nano seconds > 999,999,999")
+        else:
+            return ValueError('flags is invalid or fd not a timerfd')
+    elif err == errno.EFAULT:
+        return InternalError("timer_spec does not point to a valid timer specfication")
+    elif err == errno.EMFILE:
+        return OSError("Max per process FD limit reached")
+    elif err == errno.ENFILE:
+        return OSError("Max system FD limit reached")
+    elif err == errno.ENODEV:
+        return OSError("Could not mount (internal) anonymous inode device")
+    elif err == errno.ENOMEM:
+        return MemoryError("Insufficent kernel memory available")
+    else:
+        # If you are here, its a bug. send us the traceback
+        return UnknownError(err)
+
+
+def timerfd_settime(fd, timer_spec, flags=0, old=True):
     """Set the expiry time of a timerfd
     
     Arguments
@@ -237,8 +269,8 @@ def timerfd_settime(fd, timer_spec, flags=0):
         
     Returns
     --------
-    :return: The file descriptor representing the timerfd
-    :rtype: int
+    :return: The previous value of the timer or None if old is False
+    :rtype: TimerVal
     
     Exceptions
     -----------
@@ -259,36 +291,123 @@ def timerfd_settime(fd, timer_spec, flags=0):
 
     assert isinstance(timer_spec, ffi.CData) # ensure passed in value is what we want
     
-    old_timer_spec = ffi.new('struct itimerspec *')
+    # skip allocating the old value if the caller does not want it
+    old_timer_spec = ffi.new('struct itimerspec *') if old else ffi.NULL
 
     ret = lib.timerfd_settime(fd, flags, timer_spec, old_timer_spec)
     
     if ret < 0:
-        err = ffi.errno
-        if err == errno.EINVAL:
-            if timer_spec.it_interval.tv_sec > 999999999:
-                raise ValueError("Repeat Seconds > 999,999,999")
-            elif timer_spec.it_interval.tv_nsec > 999999999:
-                raise ValueError("Repeat Nano seconds > 999,999,999")
-            elif timer_spec.it_value.tv_sec > 999999999:
-                raise ValueError("Offset Seconds > 999,999,999")
-            elif timer_spec.it_value.tv_nsec > 999999999:
-                raise ValueError("Offset Nano seconds > 999,999,999")
-            else:
-                raise ValueError('flags is invalid or fd not a timerfd')
-        elif err == errno.EFAULT:
-            raise InternalError("timer_spec does not point to a valid timer specfication")
-        elif err == errno.EMFILE:
-            raise OSError("Max per process FD limit reached")
-        elif err == errno.ENFILE:
-            raise OSError("Max system FD limit reached")
-        elif err == errno.ENODEV:
-            raise OSError("Could not mount (internal) anonymous inode device")
-        elif err == errno.ENOMEM:
-            raise MemoryError("Insufficent kernel memory available")
-        else:
-            # If you are here, its a bug. send us the traceback
-            raise UnknownError(err)
-            
+        raise _settime_error(ffi.errno, timer_spec)
+
+    if not old:
+        return None
     old_timer_spec = TimerVal(timerspec=old_timer_spec)
     return old_timer_spec
+
+
+def timerfd_settime_ns(fd, value_ns, interval_ns=0, flags=0, timer_spec=None):
+    """Set the expiry time of a timerfd from nanosecond counts
+
+    A faster timerfd_settime() for code that rearms a timer often: no
+    TimerVal is built and the old value is not fetched
+
+    Arguments
+    ----------
+    :param int fd: File descriptor representing the timerfd
+    :param int value_ns: Nanoseconds until the timer first expires (or the
+                         absolute time with TFD_TIMER_ABSTIME), 0 disarms it
+    :param int interval_ns: Nanoseconds between expirations after the first,
+                            0 for a one shot timer
+    :param int flags: Flags to specify extra options, see timerfd_settime()
+    :param timer_spec: A 'struct itimerspec *' to reuse rather than allocating
+                       one, it is left holding the values set
+
+    Exceptions
+    -----------
+    :raises ValueError: value_ns or interval_ns is negative
+    :raises ValueError: flags is invalid or fd not a timerfd
+    """
+    if value_ns < 0 or interval_ns < 0:
+        raise ValueError("value_ns and interval_ns must not be negative")
+    if timer_spec is None:
+        timer_spec = ffi.new('struct itimerspec *')
+
+    ret = lib.timerfd_settime_ns(fd, flags, value_ns, interval_ns, timer_spec)
+
+    if ret < 0:
+        raise _settime_error(ffi.errno, timer_spec)
+
+
+def timerfd_remaining_ns(fd, timer_spec=None):
+    """Get the nanoseconds until a timerfd next expires
+
+    Arguments
+    ----------
+    :param int fd: File descriptor representing the timerfd
+    :param timer_spec: A 'struct itimerspec *' to reuse rather than allocating
+                       one, it is left holding the current value of the timer
+
+    Returns
+    --------
+    :return: Nanoseconds until the timer expires, 0 if it is disarmed
+    :rtype: int
+
+    Exceptions
+    -----------
+    :raises ValueError: fd is not a valid timerfd
+    """
+    if timer_spec is None:
+        timer_spec = ffi.new('struct itimerspec *')
+
+    remaining = lib.timerfd_remaining_ns(fd, timer_spec)
+
+    if remaining < 0:
+        raise _gettime_error(ffi.errno)
+
+    return remaining
+
+
+def timerfd_settime_many(settings):
+    """Set the expiry time of many timerfds in a single call
+
+    The timers are armed in a loop in C with the GIL released, so rearming
+    thousands of timers costs little more than the syscalls themselves.
+    The old values are not fetched
+
+    Arguments
+    ----------
+    :param settings: A sequence of (fd, timer_spec, flags) tuples as passed to
+                     timerfd_settime(), a Timer can be used as both fd and
+                     timer_spec: [(timer, timer, 0) for timer in timers]
+
+    Returns
+    --------
+    :return: The status of each setting, 0 if the timer was armed otherwise
+             the (positive) errno it failed with
+    :rtype: list
+
+    Exceptions
+    -----------
+    Failures do not stop the rest of the batch, the errors are returned
+    rather than raised:
+    EBADF: fd is not a valid file descriptor
+    EINVAL: fd is not a timerfd, or the flags or timer_spec are invalid
+    """
+    n = len(settings)
+    if n == 0:
+        return []
+
+    c_settings = ffi.new('struct timerfd_setting[]', n)
+    for setting, (fd, timer_spec, flags) in zip(c_settings, settings):
+        if hasattr(fd, 'fileno'):
+            fd = fd.fileno()
+        if hasattr(timer_spec, '__timerspec__'):
+            timer_spec = timer_spec.__timerspec__()
+        setting.fd = fd
+        setting.flags = flags
+        setting.value = timer_spec[0]
+
+    status = ffi.new('int32_t[]', n)
+    lib.timerfd_settime_many(c_settings, n, status)
+
+    return [-err for err in status]
@@ -1,139 +1,94 @@
 #!/usr/bih/env python
 from ..fanotify import FAN_CLASS_NOTIF as _FAN_CLASS_NOTIF
+from ..fanotify import FAN_NONBLOCK as _FAN_NONBLOCK
 from ..fanotify import Fanotify as _Fanotify
-from collections import deque as _deque
+from .utils import Eventlike_async as _Eventlike_async
+from asyncio import QueueEmpty
 from os import O_RDONLY as _O_RDONLY
-import asyncio as _asyncio
 
-class Fanotify_async:
-    def __init__(self, flags=_FAN_CLASS_NOTIF, event_flags=_O_RDONLY, *, loop=None, maxsize=0):
-        self._loop = loop or _asyncio.get_event_loop()
-        self._maxsize = maxsize
+class Fanotify_async(_Eventlike_async):
+    """asyncio interface to fanotify
 
-        self._fanotify = fanotify = _Fanotify(flags, event_flags)
+    The fanotify fd stays registered with the event loop while there is
+    room in the queue, each time it becomes readable every batch waiting in
+    the kernel is read into the queue. Once the queue holds maxsize events
+    reading is paused, leaving further events queued in the kernel, until
+    the queue is drained below maxsize again. As events are read a batch at
+    a time the queue may go over maxsize by up to one batch
 
-        self._getters = _deque()
-        self._events = _deque()
-        
-    def watch(self, path, event_mask, flags=0, dfd=0):
-        self._fanotify.watch(flags, event_mask, path, dfd)
+    Each event holds an open fd that must be closed (or the event answered
+    with respond_many() for permission events), see fd_limit to bound them
 
-    def ignore(self, path, event_mask, flags=0, dfd=0):
-        self._fanotify.ignore(flags, event_mask, path, dfd)
-         
-    @_asyncio.coroutine
-    def get_event(self):
-        """Remove and return an item from the queue.
+    >>> fanotify = Fanotify_async(maxsize=10000)
+    >>> fanotify.watch('/tmp', FAN_MODIFY|FAN_EVENT_ON_CHILD)
+    >>> async for event in fanotify:
+    ...     print(event)
+    ...     event.close()
+    """
+    def __init__(self, flags=_FAN_CLASS_NOTIF, event_flags=_O_RDONLY, *, loop=None, maxsize=0, fd_limit=None):
+        super().__init__(loop=loop, maxsize=maxsize)
 
-        If you yield from get(), wait until a item is available.
-        """
-        # if event then consume it
-        # otherwise register for fd callback
-        #   add self to callback queue
-        if self._events:
-            return self._get()
-        else:
-            self._loop.add_reader(self._fanotify.fileno(), self._read_event)
+        self._fanotify = _Fanotify(flags | _FAN_NONBLOCK, event_flags, fd_limit=fd_limit)
 
-            waiter = _asyncio.Future(loop=self._loop)
+        self._start_reading()
 
-            self._getters.append(waiter)
+    @property
+    def _eventlike(self):
+        return self._fanotify
 
-            return (yield from waiter)
+    def _read_batch(self):
+        return self._fanotify.read_batch()
 
-    def get_event_nowait(self):
-        """Remove and return an item from the queue.
+    def watch(self, path, event_mask, flags=0, dfd=0):
+        self._fanotify.watch(path, event_mask, flags, dfd)
 
-        Return an item if one is immediately available, else raise QueueEmpty.
-        """
-        self._consume_done_putters()
-        if self._events:
-            return self._get()
-        else:
-            raise QueueEmpty
+    def ignore(self, path, event_mask, flags=0, dfd=0):
+        self._fanotify.ignore(path, event_mask, flags, dfd)
 
-    @property
-    def maxsize(self):
-        """Number of items allowed in the queue."""
-        return self._maxsize
-
-    def _consume_done_getters(self):
-        # Delete waiters at the head of the get() queue who've timed out.
-        while self._getters and self._getters[0].done():
-            self._getters.popleft()
-
-    def _get(self):
-        return self._events.popleft()
-
-    def _put(self, item):
-        self._events.append(item)
-
-    def _read_event(self):
-        """Read an event from the inotify fd and place it in the queue"""
-        for event in self._fanotify.read_events():
-            self._put_event(event)
-        
-    def _put_event(self, event):
-        """Put an item into the queue without blocking.
-
-        If no free slot is immediately available, raise QueueFull.
+    def respond_many(self, responses, close=True):
+        """Answer permission events, see Fanotify.respond_many()"""
+        return self._fanotify.respond_many(responses, close)
+
+    async def get_batch(self, max_n=None):
+        """Remove and return up to max_n items (all of them if None) from
+        the queue as a list
+
+        If the queue is empty, wait until an item is available.
         """
-        self._consume_done_getters()
-        if self._getters:
-            assert not self._events, ('queue non-empty, why are getters waiting?')
-
-            getter = self._getters.popleft()
-
-            # Use _put and _get instead of passing item straight to getter, in
-            # case a subclass has logic that must run (e.g. JoinableQueue).
-            self._put(event)
-            getter.set_result(self._get())
-        elif self._maxsize > 0 and self._maxsize == self.qsize():
-            self.loop.remove_reader(self._fanotify.fileno())
-            raise QueueFull
+        await self._wait_for_events()
+        events = self._events
+        if max_n is None or max_n >= len(events):
+            batch = list(events)
+            events.clear()
         else:
-            # No listeners so queue up the data and stop 
-            # listening for events on the FD
-            self._put(event)
-            self._loop.remove_reader(self._fanotify.fileno())
-
-    def qsize(self):
-        """Returns the current size of the Queue
-        
-        Returns
-        --------
-        int: The current length of the queue
-        """
-        return len(self._events)
-    
-    def close(self):
-        self._fanotify.close()
+            batch = [events.popleft() for i in range(max_n)]
+        self._start_reading()
+        return batch
 
-    def __repr__(self):
-        fd = self._fanotify._fd or "closed"
-        return "<{} fd={}>".format(self.__class__.__name__, fd)
-
-def _watcher(loop):
+async def _watcher():
     from ..fanotify import FAN_MODIFY, FAN_ONDIR, FAN_ACCESS, FAN_EVENT_ON_CHILD, FAN_OPEN, FAN_CLOSE
-    
-    fanotify = Fanotify_async(loop=loop)
+
+    fanotify = Fanotify_async()
     event_mask = FAN_MODIFY|FAN_ONDIR|FAN_ACCESS|FAN_EVENT_ON_CHILD|FAN_OPEN|FAN_CLOSE
-    wd = fanotify.watch('/tmp', event_mask)
+    fanotify.watch('/tmp', event_mask)
 
     print(fanotify)
 
     print("Listening for events on /tmp")
-    for i in range(5):
-        event = yield from fanotify.get_event()
+    i = 0
+    async for event in fanotify:
         print(event)
         event.close()
+        i += 1
+        if i >= 5:
+            break
 
     fanotify.ignore('/tmp', event_mask)
     print('done')
 
-    event = yield from fanotify.get_event()
-    print(event)
-    event.close()
+    for event in await fanotify.get_batch():
+        print(event)
+        event.close()
 
     fanotify.close()
     print(fanotify)
@@ -141,18 +96,14 @@ def _watcher(loop):
 def _main():
     import logging
     import asyncio
-    
+
     log = logging.getLogger()
     log.setLevel(logging.DEBUG)
     log.addHandler(logging.StreamHandler())
-    
+
     loop = asyncio.get_event_loop()
-    
-    from asyncio import Task
-    task = Task(_watcher(loop))
-    
-    loop.run_until_complete(task)
-    
+    loop.run_until_complete(_watcher())
+
 
 if __name__ == "__main__":
     _main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+from asyncio import QueueEmpty
+from collections import deque as _deque
+import asyncio as _asyncio
+
+
+class Eventlike_async:
+    """Bounded async queue of the events read from an Eventlike object
+
+    The fd stays registered with the event loop while there is room in the
+    queue, each time it becomes readable every batch waiting in the kernel
+    is read into the queue. Once the queue holds maxsize events reading is
+    paused, leaving further events queued in the kernel, until the queue is
+    drained below maxsize again. As events are read a batch at a time the
+    queue may go over maxsize by up to one batch
+
+    Subclasses provide the _eventlike property (the wrapped non blocking
+    Eventlike object) and _read_batch() (a list of events or an empty list
+    once the kernel has nothing more for us) and call _start_reading() at
+    the end of __init__
+    """
+    _closed = False
+
+    def __init__(self, *, loop=None, maxsize=0):
+        self._loop = loop or _asyncio.get_event_loop()
+        self._maxsize = maxsize
+
+        self._getters = _deque()
+        self._events = _deque()
+        self._reading = False
+
+    @property
+    def _eventlike(self):
+        raise NotImplementedError
+
+    def _read_batch(self):
+        raise NotImplementedError
+
+    async def get_event(self):
+        """Remove and return an item from the queue.
+
+        If the queue is empty, wait until an item is available.
+        """
+        await self._wait_for_events()
+        return self._get()
+
+    def get_event_nowait(self):
+        """Remove and return an item from the queue.
+
+        Return an item if one is immediately available, else raise QueueEmpty.
+        """
+        if not self._events:
+            raise QueueEmpty
+        return self._get()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.get_event()
+
+    @property
+    def maxsize(self):
+        """Number of items allowed in the queue."""
+        return self._maxsize
+
+    @property
+    def paused(self):
+        """True if reading from the kernel is paused as the queue is full"""
+        return not self._reading
+
+    def full(self):
+        """Return True if there are maxsize items in the queue."""
+        return 0 < self._maxsize <= len(self._events)
+
+    async def _wait_for_events(self):
+        while not self._events:
+            if self._closed:
+                # nothing more will be read, see close()
+                raise _asyncio.CancelledError()
+            getter = self._loop.create_future()
+            self._getters.append(getter)
+            try:
+                await getter
+            except:
+                getter.cancel()
+                try:
+                    self._getters.remove(getter)
+                except ValueError:
+                    pass
+                # we may have been woken and cancelled at the same time,
+                # pass the wakeup on to the next getter
+                self._wakeup_getters()
+                raise
+
+    def _start_reading(self):
+        if not self._reading and not self.full():
+            self._loop.add_reader(self._eventlike.fileno(), self._read_events)
+            self._reading = True
+
+    def _stop_reading(self):
+        if self._reading:
+            self._loop.remove_reader(self._eventlike.fileno())
+            self._reading = False
+
+    def _wakeup_getters(self):
+        # wake one getter per queued event
+        woken = 0
+        while self._getters and woken < len(self._events):
+            getter = self._getters.popleft()
+            if not getter.done():
+                getter.set_result(None)
+                woken += 1
+
+    def _get(self):
+        event = self._events.popleft()
+        # resume reading now there is room in the queue
+        self._start_reading()
+        return event
+
+    def _read_events(self):
+        """Drain the batches waiting in the kernel into the queue"""
+        events = self._events
+        while not self.full():
+            batch = self._read_batch()
+            if not batch:
+                break
+            events.extend(batch)
+
+        if self.full():
+            self._stop_reading()
+
+        self._wakeup_getters()
+
+    def qsize(self):
+        """Returns the current size of the Queue
+
+        Returns
+        --------
+        int: The current length of the queue
+        """
+        return len(self._events)
+
+    def close(self):
+        """Stop reading and close the fd, anything waiting on an event
+        (including later calls once the queue is empty) is cancelled. Events
+        already in the queue can still be taken"""
+        self._closed = True
+        self._stop_reading()
+        while self._getters:
+            self._getters.popleft().cancel()
+        self._eventlike.close()
+
+    def __repr__(self):
+        fd = self._eventlike._fd or "closed"
+        return "<{} fd={}>".format(self.__class__.__name__, fd)
@@ -65,18 +65,219 @@ struct fanotify_event_metadata {
     int32_t pid;
 };
 
+/*
+ * struct fanotify_event_info - the fields of a fanotify_event_metadata
+ * record as extracted by fanotify_decode_events
+ */
+struct fanotify_event_info {
+    uint64_t mask;
+    int32_t fd;
+    int32_t pid;
+    uint32_t vers;
+    ...;
+};
 
 int fanotify_init(unsigned int flags, unsigned int event_f_flags);
 int fanotify_mark (int fanotify_fd, unsigned int flags, uint64_t mask, int dfd, const char *pathname);
+
+size_t fanotify_decode_events(const char *buf, size_t buf_len,
+                              struct fanotify_event_info *events, size_t max_events);
+
+/*
+ * struct fanotify_file_id - the device, inode and birth time (0 if the
+ * filesystem does not record it) of the file an event fd refers to
+ */
+struct fanotify_file_id {
+    uint64_t dev;
+    uint64_t ino;
+    int64_t btime_ns;
+};
+
+#define PATH_MAX ...
+
+void fanotify_stat_fds(const int32_t *fds, size_t n_fds, struct fanotify_file_id *ids);
+void fanotify_readlink_fds(int proc_fd_dirfd, const int32_t *fds, size_t n_fds,
+                           char *paths, size_t path_size, int32_t *lengths);
+
+size_t fanotify_respond_many(int fanotify_fd, struct fanotify_response *responses, size_t n_responses,
+                             int close_fds, int32_t *status);
 """)
 
 ffi.set_source("_fanotify_c", """
 #include <linux/fcntl.h>
 #include <sys/fanotify.h>
 
+#include <sys/stat.h>
+#include <sys/sysmacros.h>
+#include <limits.h>
+#include <string.h>
+#include <stdio.h>
+#include <errno.h>
+#include <unistd.h>
+#include <sys/uio.h>
+
 #ifndef FAN_MODIFY_DIR
 #define FAN_MODIFY_DIR 0x00040000
 #endif
+
+struct fanotify_event_info {
+    uint64_t mask;
+    int32_t fd;
+    int32_t pid;
+    uint32_t vers;
+    uint32_t reserved;
+};
+
+/* Walk a buffer read from a fanotify fd in a single pass, returning the
+ * amount of events decoded into 'events'. Decoding stops at the first
+ * truncated or malformed record (see FAN_EVENT_OK)
+ */
+static size_t fanotify_decode_events(const char *buf, size_t buf_len,
+                                     struct fanotify_event_info *events, size_t max_events) {
+    const size_t header_len = sizeof(struct fanotify_event_metadata);
+    size_t offset = 0;
+    size_t count = 0;
+
+    while (count < max_events && offset + header_len <= buf_len) {
+        struct fanotify_event_metadata event;
+
+        /* buffers handed to us from python have no alignment guarantees */
+        memcpy(&event, buf + offset, header_len);
+        if (event.event_len < header_len || event.event_len > buf_len - offset) {
+            break;
+        }
+        offset += event.event_len;
+
+        events[count].mask = event.mask;
+        events[count].fd = event.fd;
+        events[count].pid = event.pid;
+        events[count].vers = event.vers;
+        events[count].reserved = 0;
+        count++;
+    }
+
+    return count;
+}
+
+struct fanotify_file_id {
+    uint64_t dev;
+    uint64_t ino;
+    int64_t btime_ns;
+};
+
+/* stat each fd storing its device, inode and birth time in 'ids', fds
+ * that are invalid or cannot be stat'd get an id of 0/0/0. The birth time
+ * tells apart files that reuse the inode number of a deleted file, unlike
+ * the ctime it does not change when the file is written
+ */
+static void fanotify_stat_fds(const int32_t *fds, size_t n_fds, struct fanotify_file_id *ids) {
+    size_t i;
+#ifdef STATX_BTIME
+    struct statx stx;
+
+    for (i = 0; i < n_fds; i++) {
+        if (fds[i] >= 0 && statx(fds[i], "", AT_EMPTY_PATH, STATX_INO | STATX_BTIME, &stx) == 0) {
+            ids[i].dev = makedev(stx.stx_dev_major, stx.stx_dev_minor);
+            ids[i].ino = stx.stx_ino;
+            ids[i].btime_ns = (stx.stx_mask & STATX_BTIME) ?
+                (int64_t)stx.stx_btime.tv_sec * 1000000000 + stx.stx_btime.tv_nsec : 0;
+#else
+    struct stat st;
+
+    for (i = 0; i < n_fds; i++) {
+        if (fds[i] >= 0 && fstat(fds[i], &st) == 0) {
+            ids[i].dev = st.st_dev;
+            ids[i].ino = st.st_ino;
+            ids[i].btime_ns = 0;
+#endif
+        } else {
+            ids[i].dev = 0;
+            ids[i].ino = 0;
+            ids[i].btime_ns = 0;
+        }
+    }
+}
+
+/* Resolve each fd to the path it refers to by reading the link of the
+ * same name in proc_fd_dirfd (an open /proc/self/fd). The path for fds[i]
+ * is stored (without a NUL) at paths + i * path_size and its length in
+ * lengths[i], or -errno if it could not be read
+ */
+static void fanotify_readlink_fds(int proc_fd_dirfd, const int32_t *fds, size_t n_fds,
+                                  char *paths, size_t path_size, int32_t *lengths) {
+    size_t i;
+    char name[16];
+
+    for (i = 0; i < n_fds; i++) {
+        ssize_t len;
+
+        if (fds[i] < 0) {
+            lengths[i] = -EBADF;
+            continue;
+        }
+        snprintf(name, sizeof(name), "%d", fds[i]);
+        len = readlinkat(proc_fd_dirfd, name, paths + i * path_size, path_size);
+        if (len < 0) {
+            lengths[i] = -errno;
+        } else if ((size_t)len == path_size) {
+            lengths[i] = -ENAMETOOLONG;
+        } else {
+            lengths[i] = len;
+        }
+    }
+}
+
+/* Write every response with writev(), the kernel consumes one response
+ * per iovec so a batch costs one syscall per IOV_MAX responses rather than
+ * one each. A response that is rejected ends the writev early, its error
+ * is recorded in status[i] (0 on success, -errno on failure) and writing
+ * resumes with the next one. With close_fds set each response's event fd
+ * is closed afterwards. Returns the amount of responses accepted
+ */
+static size_t fanotify_respond_many(int fanotify_fd, struct fanotify_response *responses, size_t n_responses,
+                                    int close_fds, int32_t *status) {
+    const size_t response_len = sizeof(struct fanotify_response);
+    struct iovec iov[IOV_MAX];
+    size_t accepted = 0;
+    size_t i = 0;
+
+    while (i < n_responses) {
+        size_t n_iov = n_responses - i < IOV_MAX ? n_responses - i : IOV_MAX;
+        size_t j;
+        ssize_t written;
+
+        for (j = 0; j < n_iov; j++) {
+            iov[j].iov_base = &responses[i + j];
+            iov[j].iov_len = response_len;
+        }
+
+        written = writev(fanotify_fd, iov, n_iov);
+        if (written < 0) {
+            if (errno == EINTR) {
+                continue;
+            }
+            /* the first response was rejected, skip over it */
+            status[i] = -errno;
+            i++;
+            continue;
+        }
+
+        for (j = 0; j < (size_t)written / response_len; j++) {
+            status[i++] = 0;
+            accepted++;
+        }
+    }
+
+    if (close_fds) {
+        for (i = 0; i < n_responses; i++) {
+            if (responses[i].fd >= 0) {
+                close(responses[i].fd);
+            }
+        }
+    }
+
+    return accepted;
+}
 """, libraries=[])
 
 if __name__ == "__main__":
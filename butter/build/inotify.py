@@ -18,6 +18,29 @@ struct inotify_event {
 //        char          name[0]; # we calculate this manually in str_to_event
 };
 
+/*
+ * struct inotify_event_info - a decoded inotify_event as produced by
+ * inotify_decode_events, the name is not copied but instead referenced
+ * by its offset and length (excluding NUL padding) into the source buffer
+ */
+struct inotify_event_info {
+        int           wd;
+        uint32_t      mask;
+        uint32_t      cookie;
+        uint32_t      name_offset;
+        uint32_t      name_len;
+};
+
+/*
+ * struct inotify_watch_stats - per watch counters maintained by
+ * inotify_account_events, stored in an array indexed by wd
+ */
+struct inotify_watch_stats {
+        uint64_t      events;
+        uint64_t      bytes;
+        uint64_t      last_ns;
+};
+
 /* the following are legal, implemented events that user-space can watch for */
 #define IN_ACCESS        ...  /* File was accessed */
 #define IN_MODIFY        ...  /* File was modified */
@@ -56,6 +79,9 @@ struct inotify_event {
  */
 #define IN_ALL_EVENTS  ...
 
+/* Longest filename that can be returned in an event (excluding the NUL) */
+#define NAME_MAX ...
+
 /* Flags for sys_inotify_init1.  */
 #define IN_CLOEXEC  ...
 #define IN_NONBLOCK ...
@@ -64,11 +90,119 @@ int inotify_init(void);
 int inotify_init1(int flags);
 int inotify_add_watch(int fd, const char *pathname, uint32_t mask);
 int inotify_rm_watch(int fd, int wd);
+
+void inotify_add_watches(int fd, const char *paths, size_t n_paths, uint32_t mask, int *wds);
+
+size_t inotify_decode_events(const char *buf, size_t buf_len, uint32_t mask_filter,
+                             struct inotify_event_info *events, size_t max_events);
+
+int inotify_account_events(const char *buf, size_t buf_len, uint64_t now_ns,
+                           struct inotify_watch_stats *stats, int min_wd, int n_stats);
 """)
 
 ffi.set_source("_inotify_c", """
 #include <sys/inotify.h>
 #include <sys/ioctl.h>
+#include <limits.h>
+#include <string.h>
+#include <errno.h>
+
+struct inotify_event_info {
+        int           wd;
+        uint32_t      mask;
+        uint32_t      cookie;
+        uint32_t      name_offset;
+        uint32_t      name_len;
+};
+
+struct inotify_watch_stats {
+        uint64_t      events;
+        uint64_t      bytes;
+        uint64_t      last_ns;
+};
+
+/* Add a watch for each of the n_paths NUL terminated paths packed back to
+ * back in 'paths', storing the watch descriptor or -errno for each path in
+ * 'wds' so a single failure does not abort the remainder of the batch
+ */
+static void inotify_add_watches(int fd, const char *paths, size_t n_paths, uint32_t mask, int *wds) {
+    size_t i;
+
+    for (i = 0; i < n_paths; i++) {
+        int wd = inotify_add_watch(fd, paths, mask);
+        wds[i] = wd < 0 ? -errno : wd;
+        paths += strlen(paths) + 1;
+    }
+}
+
+/* Walk a buffer read from an inotify fd in a single pass, returning the
+ * amount of events decoded into 'events'. Events whose mask has no bits in
+ * common with mask_filter are skipped. Truncated trailing records are
+ * ignored rather than read past the end of the buffer
+ */
+static size_t inotify_decode_events(const char *buf, size_t buf_len, uint32_t mask_filter,
+                                    struct inotify_event_info *events, size_t max_events) {
+    const size_t header_len = sizeof(struct inotify_event);
+    size_t offset = 0;
+    size_t count = 0;
+
+    while (count < max_events && offset + header_len <= buf_len) {
+        struct inotify_event event;
+        size_t name_offset = offset + header_len;
+
+        /* buffers handed to us from python have no alignment guarantees */
+        memcpy(&event, buf + offset, header_len);
+        if (event.len > buf_len - name_offset) {
+            break;
+        }
+        offset = name_offset + event.len;
+
+        if (!(event.mask & mask_filter)) {
+            continue;
+        }
+
+        events[count].wd = event.wd;
+        events[count].mask = event.mask;
+        events[count].cookie = event.cookie;
+        events[count].name_offset = name_offset;
+        events[count].name_len = strnlen(buf + name_offset, event.len);
+        count++;
+    }
+
+    return count;
+}
+
+/* Walk a buffer read from an inotify fd adding each event to the counters
+ * in stats[wd] for wds in [min_wd, n_stats). Returns the largest wd seen
+ * so the caller can grow the array and account the remainder
+ */
+static int inotify_account_events(const char *buf, size_t buf_len, uint64_t now_ns,
+                                  struct inotify_watch_stats *stats, int min_wd, int n_stats) {
+    const size_t header_len = sizeof(struct inotify_event);
+    size_t offset = 0;
+    int max_wd = -1;
+
+    while (offset + header_len <= buf_len) {
+        struct inotify_event event;
+
+        memcpy(&event, buf + offset, header_len);
+        if (event.len > buf_len - offset - header_len) {
+            break;
+        }
+        offset += header_len + event.len;
+
+        if (event.wd > max_wd) {
+            max_wd = event.wd;
+        }
+        if (event.wd >= min_wd && event.wd < n_stats) {
+            stats[event.wd].events++;
+            stats[event.wd].bytes += header_len + event.len;
+            stats[event.wd].last_ns = now_ns;
+        }
+    }
+
+    return max_wd;
+}
 """, libraries=[])
 
 if __name__ == "__main__":
@@ -41,12 +41,72 @@ int timerfd_settime(int fd, int flags,
                     struct itimerspec *old_value);
 
 int timerfd_gettime(int fd, struct itimerspec *curr_value);
+
+int timerfd_settime_ns(int fd, int flags, int64_t value_ns, int64_t interval_ns,
+                       struct itimerspec *new_value);
+int64_t timerfd_remaining_ns(int fd, struct itimerspec *curr_value);
+
+struct timerfd_setting {
+    int fd;
+    int flags;
+    struct itimerspec value;
+};
+
+size_t timerfd_settime_many(const struct timerfd_setting *settings, size_t n_settings, int32_t *status);
 """)
 
 ffi.set_source("_timerfd_c", """
 #include <sys/timerfd.h>
 #include <stdint.h> /* Definition of uint64_t */
 #include <time.h>
+#include <errno.h>
+
+#define NS_PER_SEC 1000000000LL
+
+/* Fill new_value from nanosecond counts and arm the timer without asking
+   for the old value, new_value is left holding what was set */
+static int timerfd_settime_ns(int fd, int flags, int64_t value_ns, int64_t interval_ns,
+                              struct itimerspec *new_value){
+    new_value->it_value.tv_sec = value_ns / NS_PER_SEC;
+    new_value->it_value.tv_nsec = value_ns % NS_PER_SEC;
+    new_value->it_interval.tv_sec = interval_ns / NS_PER_SEC;
+    new_value->it_interval.tv_nsec = interval_ns % NS_PER_SEC;
+    return timerfd_settime(fd, flags, new_value, NULL);
+}
+
+/* Return the nanoseconds until the timer next expires (0 if disarmed) or
+   -1 with errno set */
+static int64_t timerfd_remaining_ns(int fd, struct itimerspec *curr_value){
+    if(timerfd_gettime(fd, curr_value) < 0){
+        return -1;
+    }
+    return curr_value->it_value.tv_sec * NS_PER_SEC + curr_value->it_value.tv_nsec;
+}
+
+struct timerfd_setting {
+    int fd;
+    int flags;
+    struct itimerspec value;
+};
+
+/* Arm each timerfd in settings, recording 0 or -errno per setting in
+ * status. A failure does not stop the rest of the batch. Returns the
+ * amount of timers armed
+ */
+static size_t timerfd_settime_many(const struct timerfd_setting *settings, size_t n_settings, int32_t *status){
+    size_t armed = 0;
+    size_t i;
+
+    for (i = 0; i < n_settings; i++) {
+        if (timerfd_settime(settings[i].fd, settings[i].flags, &settings[i].value, NULL) < 0) {
+            status[i] = -errno;
+        } else {
+            status[i] = 0;
+            armed++;
+        }
+    }
+    return armed;
+}
 """, libraries=[])
 
 if __name__ == "__main__":
@@ -5,10 +5,26 @@ from cffi import FFI
 ffi = FFI()
 ffi.cdef("""
 #define FIONREAD ...
+
+#define CLOCK_REALTIME ...
+#define CLOCK_MONOTONIC ...
+
+int64_t clock_gettime_ns(int clock_id);
 """)
 
 ffi.set_source("_utils_c", """
 #include <sys/ioctl.h>
+#include <stdint.h>
+#include <time.h>
+
+/* time.clock_gettime_ns() for pythons older than 3.7 */
+static int64_t clock_gettime_ns(int clock_id){
+    struct timespec ts;
+    if(clock_gettime(clock_id, &ts) < 0){
+        return -1;
+    }
+    return (int64_t)ts.tv_sec * 1000000000 + ts.tv_nsec;
+}
 """, libraries=[])
 
 if __name__ == "__main__":
@@ -4,24 +4,55 @@
 from .utils import get_buffered_length as _get_buffered_length
 from .utils import Eventlike as _Eventlike
 from .utils import CLOEXEC_DEFAULT as _CLOEXEC_DEFAULT
+from .utils import LatencyHistogram
+from .utils import monotonic_ns as _monotonic_ns
+from .eventfd import Eventfd as _Eventfd
 
 from os import O_RDONLY, O_WRONLY, O_RDWR
 from os import read as _read
+from collections import OrderedDict as _OrderedDict
+from collections import namedtuple as _namedtuple
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
+from select import select as _select
+import errno as _errno
+import threading as _threading
 
 from ._fanotify import fanotify_init, fanotify_mark, str_to_events
+from ._fanotify import FanotifyEvent, FanotifyEventBatch, buffer_to_batch
+from ._fanotify import fanotify_respond_many, PathResolver
+from ._fanotify import EVENT_STRUCT_SIZE, FdTable, PERM_EVENTS
 from .fanotify_constants import *
 
+# Smallest read made from a fanotify fd, large enough for a batch of events
+EVENT_BUFFER_MIN = 256 * EVENT_STRUCT_SIZE
+
+
+
 class Fanotify(_Eventlike):
     blocking = True
+    _fd_table = None
     
-    def __init__(self, flags, event_flags=O_RDONLY, closefd=_CLOEXEC_DEFAULT):
+    def __init__(self, flags, event_flags=O_RDONLY, closefd=_CLOEXEC_DEFAULT, fd_limit=None):
+        """Create a new Fanotify object
+
+        Arguments
+        ----------
+        :param int flags: Flags to create the fanotify fd with (FAN_CLASS_*, FAN_NONBLOCK ...)
+        :param int event_flags: The flags each event fd is opened with
+        :param int fd_limit: Keep at most this many event fds open, closing the
+                             oldest when more events are read (see FdTable).
+                             Permission events are not counted
+        """
         super(self.__class__, self).__init__()
         self._fd = fanotify_init(flags, event_flags, closefd=closefd)
 
         self._events = []
+        self._fd_table = FdTable(fd_limit) if fd_limit is not None else None
+        # time from reading a permission event to answering it
+        self.response_latency = LatencyHistogram()
 
         if flags & FAN_NONBLOCK:
-            self.blocking = false
+            self.blocking = False
         
         if event_flags & O_RDWR|O_WRONLY:
             self._mode = 'w+'
@@ -41,12 +72,334 @@ class Fanotify(_Eventlike):
         flags |= FAN_MARK_REMOVE
         fanotify_mark(self.fileno(), path, mask, flags, dfd)
 
+    def read_batch(self):
+        """Read a batch of events from the kernel without creating an object
+        per event
+
+        The metadata is decoded in C into a FanotifyEventBatch, FanotifyEvents
+        are only built for the events that are accessed. Events already
+        queued by read_event() are not included, use read_events() to
+        retrieve those first
+
+        Returns
+        --------
+        :return: The events read
+        :rtype: FanotifyEventBatch
+        """
+        buf = self._read_buffer()
+        batch = buffer_to_batch(buf, received_ns=_monotonic_ns())
+        if self._fd_table is not None:
+            self._fd_table.add_batch(batch)
+        return batch
+
+    def handle_batch(self, callback, resolve_paths=True):
+        """Read a batch of events, pass each to callback and close their fds
+
+        Everything the callback needs from the fd (eg the filename, resolved
+        for the whole batch up front when resolve_paths is set) must be
+        gathered while it runs as the fd is closed as soon as it returns.
+        Permission events are left open so they can be answered
+
+        Returns
+        --------
+        :return: The amount of events handled
+        :rtype: int
+        """
+        batch = self.read_batch()
+        if resolve_paths:
+            batch.resolve_paths()
+        for event in batch:
+            try:
+                callback(event)
+            finally:
+                if event.fd is not None and event.fd >= 0 and not event.mask & PERM_EVENTS:
+                    event.close()
+        return len(batch)
+
+    @property
+    def open_fds(self):
+        """The amount of event fds held open by the fd table (see fd_limit)"""
+        return len(self._fd_table) if self._fd_table is not None else None
+
+    def close(self):
+        if self._fd_table is not None:
+            self._fd_table.close_all()
+        super(Fanotify, self).close()
+
+    def respond(self, event, allow):
+        """Answer a single permission event, see respond_many()"""
+        return self.respond_many([(event, allow)])[0]
+
+    def respond_many(self, responses, close=True):
+        """Answer permission events (FAN_OPEN_PERM, FAN_ACCESS_PERM)
+
+        The responses are packed into a single buffer and handed to the
+        kernel in one writev(), the processes waiting on the events are
+        released as soon as it returns. The time from each event being read
+        to being answered is added to response_latency
+
+        Arguments
+        ----------
+        :param responses: A sequence of (FanotifyEvent, allow) pairs, the
+                          access is allowed if allow is true and denied
+                          otherwise
+        :param bool close: Close the fd of each event once it is answered
+
+        Returns
+        --------
+        :return: The status of each response, 0 if it was accepted otherwise
+                 the errno it was rejected with (see fanotify_respond_many)
+        :rtype: list
+        """
+        status = fanotify_respond_many(self.fileno(),
+                                       [(event.fd, FAN_ALLOW if allow else FAN_DENY)
+                                        for event, allow in responses],
+                                       close_fds=close)
+
+        now = _monotonic_ns()
+        latency = self.response_latency
+        for event, allow in responses:
+            if event.received_ns is not None:
+                latency.record(now - event.received_ns)
+            if close:
+                event._forget_fd()
+
+        return status
+
     def _read_events(self):
+        return self.read_batch().events()
+
+    def _read_buffer(self):
         fd = self.fileno()
 
-        buf_len = _get_buffered_length(fd)
-        raw_events = _read(fd, buf_len)
+        # reads smaller than an event fail with EINVAL, so if nothing is
+        # queued yet we block reading up to a buffer's worth of events
+        buf_len = max(_get_buffered_length(fd), EVENT_BUFFER_MIN)
+        try:
+            return _read(fd, buf_len)
+        except OSError as err:
+            if err.errno != _errno.EAGAIN:
+                raise
+            return b''
+
+
+EngineMetrics = _namedtuple("EngineMetrics", "pending decided timed_out late errors p50_ns p99_ns p999_ns")
+
+
+# states of an event answered with the default before its decision finished
+_ANSWERING = 0
+_ANSWERED = 1
+_DECIDED = 2
+
+
+class PermissionEngine(object):
+    """Answer fanotify permission events from a pool of worker threads
+
+    Each permission event read from the Fanotify object is handed to
+    decide(event) on a worker thread, it returns true to allow the access
+    and false to deny it. Decisions are answered (with respond_many) as
+    they complete so a slow decision only holds up the process it is
+    about, not every other process on the box
+
+    An event that has not been decided within deadline seconds of being read
+    is answered with default, the decision is discarded when it finally
+    completes (counted as late). The event's fd is kept open until then so
+    decide can keep using event.fd and event.filename after the deadline
+    without the fd number being reused for another file. A decision that
+    raises is also answered with default (counted as an error)
+
+    >>> fanotify = Fanotify(FAN_CLASS_CONTENT)
+    >>> fanotify.watch('/srv', FAN_OPEN_PERM|FAN_EVENT_ON_CHILD)
+    >>> engine = PermissionEngine(fanotify, scan, workers=8, deadline=0.5)
+    >>> engine.start()
+    >>> ...
+    >>> engine.metrics.p99_ns
+    """
+    def __init__(self, fanotify, decide, workers=4, deadline=1.0, default=True, on_event=None):
+        """Create a new PermissionEngine
+
+        Arguments
+        ----------
+        :param Fanotify fanotify: The Fanotify object to read and answer events on,
+                                  it is read from a thread owned by the engine
+        :param decide: Called as decide(event) on a worker thread, returns
+                       true to allow the access
+        :param int workers: The amount of worker threads
+        :param float deadline: Seconds an event may wait for a decision
+        :param bool default: The answer given when the deadline passes or
+                             decide raises
+        :param on_event: Called with each non permission event, if None their
+                         fds are closed
+        """
+        self.fanotify = fanotify
+        self._decide = decide
+        self._deadline_ns = int(deadline * 1e9)
+        self._default = default
+        self._on_event = on_event
+        self._workers = workers
+
+        self._cond = _threading.Condition()
+        # event -> deadline (monotonic ns), events arrive in deadline order
+        self._pending = _OrderedDict()
+        self._decisions = []
+        # events answered with the default while decide is still running on
+        # them: event -> ANSWERING, ANSWERED or DECIDED, see _close_late()
+        self._timed_out = {}
+        self._running = False
+        self._threads = []
+        self._pool = None
+        self._wakeup = None
+
+        self.decided = 0
+        self.timed_out = 0
+        self.late = 0
+        self.errors = 0
+
+    @property
+    def queue_depth(self):
+        """The amount of permission events waiting for a response"""
+        return len(self._pending)
+
+    @property
+    def metrics(self):
+        latency = self.fanotify.response_latency
+        return EngineMetrics(len(self._pending), self.decided, self.timed_out, self.late, self.errors,
+                             latency.percentile(50), latency.percentile(99), latency.percentile(99.9))
+
+    def start(self):
+        """Start reading and answering events in background threads"""
+        if self._running:
+            return
+        self._running = True
+        self._wakeup = _Eventfd()
+        self._pool = _ThreadPoolExecutor(self._workers)
+        self._threads = [_threading.Thread(target=self._read_loop),
+                         _threading.Thread(target=self._respond_loop)]
+        for thread in self._threads:
+            thread.daemon = True
+            thread.start()
+
+    def stop(self):
+        """Stop reading events, events still pending are answered with the
+        default before this returns"""
+        if not self._running:
+            return
+        reader, responder = self._threads
+        self._wakeup.increment()
+        reader.join()
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        responder.join()
+        self._pool.shutdown(wait=False)
+        self._wakeup.close()
+        self._threads = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *tb):
+        self.stop()
+        return False
+
+    def _read_loop(self):
+        fanotify = self.fanotify
+        while True:
+            rd, _, _ = _select([fanotify, self._wakeup], [], [])
+            if self._wakeup in rd:
+                return
+
+            for event in fanotify.read_batch():
+                if not event.mask & PERM_EVENTS:
+                    if self._on_event is not None:
+                        self._on_event(event)
+                    else:
+                        event.close()
+                    continue
+
+                with self._cond:
+                    self._pending[event] = event.received_ns + self._deadline_ns
+                    self._cond.notify()
+                self._pool.submit(self._run_decision, event)
+
+    def _run_decision(self, event):
+        try:
+            allow = bool(self._decide(event))
+            error = False
+        except Exception:
+            allow = self._default
+            error = True
+        with self._cond:
+            state = self._timed_out.get(event)
+            if state is None:
+                self._decisions.append((event, allow, error))
+                self._cond.notify()
+                return
+            # already answered with the default
+            self.late += 1
+            if state == _ANSWERING:
+                # the responder closes the fd once the answer is written
+                self._timed_out[event] = _DECIDED
+                return
+            del self._timed_out[event]
+        event.close()
+
+    def _close_late(self, events):
+        """Close the fds of events answered with the default whose decision
+        has finished, the rest are closed as their decisions finish"""
+        done = []
+        with self._cond:
+            for event in events:
+                if self._timed_out[event] == _DECIDED:
+                    del self._timed_out[event]
+                    done.append(event)
+                else:
+                    self._timed_out[event] = _ANSWERED
+        for event in done:
+            event.close()
+
+    def _respond_loop(self):
+        cond = self._cond
+        pending = self._pending
+        while True:
+            with cond:
+                while self._running and not self._decisions:
+                    if pending:
+                        timeout = (next(iter(pending.values())) - _monotonic_ns()) / 1e9
+                        if timeout <= 0:
+                            break
+                        cond.wait(timeout)
+                    else:
+                        cond.wait()
+
+                # decisions are only queued for events still pending
+                responses = []
+                for event, allow, error in self._decisions:
+                    del pending[event]
+                    responses.append((event, allow))
+                    self.decided += 1
+                    self.errors += error
+                self._decisions = []
+
+                now = _monotonic_ns()
+                defaults = []
+                while pending:
+                    event, deadline = next(iter(pending.items()))
+                    if self._running and deadline > now:
+                        break
+                    del pending[event]
+                    self._timed_out[event] = _ANSWERING
+                    defaults.append((event, self._default))
+                    self.timed_out += 1
 
-        events = str_to_events(raw_events)
+                running = self._running
 
-        return events
+            if responses:
+                self.fanotify.respond_many(responses)
+            if defaults:
+                # decide is still running on these, keep their fds open
+                self.fanotify.respond_many(defaults, close=False)
+                self._close_late([event for event, allow in defaults])
+            if not running:
+                return
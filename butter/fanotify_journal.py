@@ -0,0 +1,371 @@
+#!/usr/bin/env python
+"""fanotify_journal: Record fanotify events to a segmented on disk log
+
+A journal is a directory holding:
+
+  paths       The path table, each path recorded once as a little endian
+              uint32 length followed by the path. A path's id is its index
+              in the file (id 0 is reserved for paths that could not be
+              resolved)
+  <seq>.seg   Segments of fixed size records named after the sequence
+              number of their first record, see RECORD
+
+Records are never modified once written, so segments can be mmap'd and
+read while the writer appends to the last one. Every record carries its
+sequence number, which consumers use as the offset to resume reading
+from. Sealed segments may be compacted (see JournalWriter.compact()) which
+drops records but never changes the sequence number of those kept
+"""
+
+from .fanotify import FAN_MODIFY, FAN_CLOSE_WRITE
+from .utils import time_ns as _time_ns
+from .utils import O_CLOEXEC as _O_CLOEXEC
+from .utils import pread as _pread
+from .utils import fsencode as _fsencode
+from .utils import iter_unpack as _iter_unpack
+from .utils import replace as _replace
+
+from collections import namedtuple as _namedtuple
+from struct import Struct as _Struct
+from bisect import bisect_right as _bisect_right
+import errno as _errno
+import mmap as _mmap
+import os as _os
+
+# seq, timestamp (ns since the epoch), mask, pid, path id
+RECORD = _Struct('<QQQiI')
+_PATH_LENGTH = _Struct('<I')
+
+PATHS_FILE = 'paths'
+SEGMENT_SUFFIX = '.seg'
+
+# Records against the same path with only these bits set are merged by
+# compaction
+COMPACT_EVENTS = FAN_MODIFY | FAN_CLOSE_WRITE
+
+UNKNOWN_PATH = 0
+
+JournalRecord = _namedtuple("JournalRecord", "seq timestamp_ns mask pid path")
+
+
+def _segment_name(seq):
+    return '{:020d}{}'.format(seq, SEGMENT_SUFFIX)
+
+
+def _list_segments(directory):
+    """Return the starting sequence number of each segment, in order"""
+    return sorted(int(name[:-len(SEGMENT_SUFFIX)]) for name in _os.listdir(directory)
+                  if name.endswith(SEGMENT_SUFFIX))
+
+
+class _PathTable(object):
+    def __init__(self, directory):
+        self._filename = _os.path.join(directory, PATHS_FILE)
+        self.paths = [b'']
+        self._ids = {}
+        self._size = 0
+        self.load()
+
+    def load(self):
+        """Read any paths added to the file since it was last loaded"""
+        try:
+            with open(self._filename, 'rb') as f:
+                f.seek(self._size)
+                data = f.read()
+        except (IOError, OSError) as err:
+            if err.errno != _errno.ENOENT:
+                raise
+            return
+        offset = 0
+        while offset + _PATH_LENGTH.size <= len(data):
+            length, = _PATH_LENGTH.unpack_from(data, offset)
+            end = offset + _PATH_LENGTH.size + length
+            if end > len(data):
+                # a partially written entry
+                break
+            path = data[offset + _PATH_LENGTH.size:end]
+            self._ids[path] = len(self.paths)
+            self.paths.append(path)
+            offset = end
+        self._size += offset
+        return offset
+
+    def get(self, path_id):
+        if path_id >= len(self.paths):
+            self.load()
+        return self.paths[path_id] if path_id < len(self.paths) else None
+
+
+class JournalWriter(object):
+    """Append fanotify events to a journal directory
+
+    Opening an existing journal continues it after its last complete
+    record. Only one writer may use a journal at a time
+
+    >>> journal = JournalWriter('/var/lib/myindexer/journal')
+    >>> fanotify = Fanotify(FAN_CLASS_NOTIF)
+    >>> fanotify.watch('/srv', FAN_MODIFY|FAN_CLOSE_WRITE, FAN_MARK_MOUNT)
+    >>> while True:
+    ...     journal.pump(fanotify)
+    """
+    def __init__(self, directory, segment_records=1 << 20):
+        """Open (creating if needed) a journal for writing
+
+        Arguments
+        ----------
+        :param str directory: The journal directory
+        :param int segment_records: Start a new segment once the current one
+                                    holds this many records
+        """
+        try:
+            _os.makedirs(directory)
+        except OSError as err:
+            if err.errno != _errno.EEXIST:
+                raise
+        self.directory = directory
+        self.segment_records = segment_records
+
+        self._table = _PathTable(directory)
+        # drop a partially written trailing entry so appends line up
+        paths_fd = _os.open(_os.path.join(directory, PATHS_FILE),
+                            _os.O_WRONLY | _os.O_CREAT | _os.O_APPEND | _O_CLOEXEC, 0o644)
+        _os.ftruncate(paths_fd, self._table._size)
+        self._paths_fd = paths_fd
+
+        self._segment_fd = None
+        self._segment_start = None
+        self._segment_count = 0
+        self.next_seq = 0
+
+        segments = _list_segments(directory)
+        if segments:
+            self._open_segment(segments[-1])
+            if self._segment_count:
+                self.next_seq = self._segment_last_record()[0] + 1
+            else:
+                self.next_seq = segments[-1]
+
+    def _open_segment(self, start_seq):
+        filename = _os.path.join(self.directory, _segment_name(start_seq))
+        fd = _os.open(filename, _os.O_RDWR | _os.O_CREAT | _os.O_APPEND | _O_CLOEXEC, 0o644)
+        size = _os.fstat(fd).st_size
+        if size % RECORD.size:
+            # drop a partially written trailing record
+            size -= size % RECORD.size
+            _os.ftruncate(fd, size)
+        if self._segment_fd is not None:
+            _os.close(self._segment_fd)
+        self._segment_fd = fd
+        self._segment_start = start_seq
+        self._segment_count = size // RECORD.size
+
+    def _segment_last_record(self):
+        offset = (self._segment_count - 1) * RECORD.size
+        return RECORD.unpack(_pread(self._segment_fd, RECORD.size, offset))
+
+    def path_id(self, path):
+        """Return the id of path, adding it to the path table if needed"""
+        if isinstance(path, str):
+            path = _fsencode(path)
+        path_id = self._table._ids.get(path)
+        if path_id is None:
+            entry = _PATH_LENGTH.pack(len(path)) + path
+            _os.write(self._paths_fd, entry)
+            self._table._size += len(entry)
+            path_id = self._table._ids[path] = len(self._table.paths)
+            self._table.paths.append(path)
+        return path_id
+
+    def append(self, records):
+        """Append (timestamp_ns, mask, pid, path) records, returning the
+        sequence number of the first one. Paths may be str, bytes or None
+        (unknown)"""
+        first = self.next_seq
+        packed = []
+        for timestamp_ns, mask, pid, path in records:
+            path_id = UNKNOWN_PATH if path is None else self.path_id(path)
+            packed.append((timestamp_ns, mask, pid, path_id))
+        self._write(packed)
+        return first
+
+    def write_events(self, events, timestamp_ns=None):
+        """Append FanotifyEvents (or a FanotifyEventBatch) to the journal
+
+        The events must still hold their fds for their paths to be resolved,
+        resolve the paths of a batch first (FanotifyEventBatch.resolve_paths)
+        to do so in a single pass. The fds are not closed
+        """
+        if timestamp_ns is None:
+            timestamp_ns = _time_ns()
+        return self.append((timestamp_ns, event.mask, event.pid,
+                            None if event.filename == "<Unknown>" else event.filename)
+                           for event in events)
+
+    def pump(self, fanotify):
+        """Read a batch of events from fanotify, journal them and close their
+        fds. Returns the amount of events journalled"""
+        batch = fanotify.read_batch()
+        batch.resolve_paths()
+        try:
+            self.write_events(batch)
+        finally:
+            batch.close()
+        return len(batch)
+
+    def _write(self, records):
+        i = 0
+        while i < len(records):
+            if self._segment_fd is None or self._segment_count >= self.segment_records:
+                self._open_segment(self.next_seq)
+            n = min(len(records) - i, self.segment_records - self._segment_count)
+            seq = self.next_seq
+            data = b''.join(RECORD.pack(seq + j, timestamp_ns, mask, pid, path_id)
+                            for j, (timestamp_ns, mask, pid, path_id) in enumerate(records[i:i + n]))
+            _os.write(self._segment_fd, data)
+            self._segment_count += n
+            self.next_seq += n
+            i += n
+
+    def sync(self):
+        """fsync() the path table and current segment"""
+        _os.fsync(self._paths_fd)
+        if self._segment_fd is not None:
+            _os.fsync(self._segment_fd)
+
+    def compact(self, compact_events=COMPACT_EVENTS):
+        """Merge repeated writes to the same path in each sealed segment
+
+        Within a segment, records whose mask only has bits of compact_events
+        set are merged into the last such record against the same path
+        (their masks are or'd together), other records are kept as is.
+        The current segment is never compacted as readers may be following
+        it. Segments are rewritten to a temporary file and renamed into
+        place so readers see either the old or new segment
+
+        Returns
+        --------
+        :return: The amount of records dropped
+        :rtype: int
+        """
+        dropped = 0
+        for start_seq in _list_segments(self.directory):
+            if start_seq == self._segment_start:
+                continue
+            dropped += self._compact_segment(start_seq, compact_events)
+        return dropped
+
+    def _compact_segment(self, start_seq, compact_events):
+        filename = _os.path.join(self.directory, _segment_name(start_seq))
+        with open(filename, 'rb') as f:
+            data = f.read()
+        data = data[:len(data) - len(data) % RECORD.size]
+        records = list(_iter_unpack(RECORD, data))
+
+        # index of the last compactable record per path and the merged mask
+        last = {}
+        for i, (seq, timestamp_ns, mask, pid, path_id) in enumerate(records):
+            if mask & ~compact_events == 0 and path_id != UNKNOWN_PATH:
+                previous = last.get(path_id)
+                last[path_id] = (i, mask | (previous[1] if previous else 0))
+
+        keep_masks = {i: mask for i, mask in last.values()}
+        kept = []
+        for i, record in enumerate(records):
+            seq, timestamp_ns, mask, pid, path_id = record
+            if mask & ~compact_events == 0 and path_id != UNKNOWN_PATH:
+                if i not in keep_masks:
+                    continue
+                record = (seq, timestamp_ns, keep_masks[i], pid, path_id)
+            kept.append(record)
+
+        if len(kept) == len(records):
+            return 0
+
+        tmp = filename + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(b''.join(RECORD.pack(*record) for record in kept))
+            f.flush()
+            _os.fsync(f.fileno())
+        _replace(tmp, filename)
+        return len(records) - len(kept)
+
+    def close(self):
+        if self._segment_fd is not None:
+            _os.close(self._segment_fd)
+            self._segment_fd = None
+        if self._paths_fd is not None:
+            _os.close(self._paths_fd)
+            self._paths_fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *tb):
+        self.close()
+        return False
+
+
+class JournalReader(object):
+    """Read records from a journal directory, possibly while it is written
+
+    >>> reader = JournalReader('/var/lib/myindexer/journal')
+    >>> for record in reader.read(offset):
+    ...     index(record.path)
+    ...     offset = record.seq + 1
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        self._table = _PathTable(directory)
+
+    def path(self, path_id):
+        """Return the path (bytes) with the given id"""
+        return self._table.get(path_id)
+
+    def read_raw(self, offset=0):
+        """Iterate over (seq, timestamp_ns, mask, pid, path_id) tuples for
+        every record with a sequence number of at least offset
+
+        Segments are mmap'd and the starting record is found by binary
+        search, so resuming from an offset does not read the records
+        before it
+        """
+        segments = _list_segments(self.directory)
+        start = max(_bisect_right(segments, offset) - 1, 0)
+        for start_seq in segments[start:]:
+            filename = _os.path.join(self.directory, _segment_name(start_seq))
+            try:
+                with open(filename, 'rb') as f:
+                    size = _os.fstat(f.fileno()).st_size
+                    size -= size % RECORD.size
+                    if size == 0:
+                        continue
+                    view = _mmap.mmap(f.fileno(), size, prot=_mmap.PROT_READ)
+            except (IOError, OSError) as err:
+                if err.errno != _errno.ENOENT:
+                    raise
+                continue
+            try:
+                count = size // RECORD.size
+                for i in range(self._find(view, count, offset), count):
+                    yield RECORD.unpack_from(view, i * RECORD.size)
+            finally:
+                view.close()
+
+    def read(self, offset=0):
+        """As read_raw() but yielding JournalRecords with their paths (bytes,
+        or None if the path could not be resolved when the event was read)"""
+        for seq, timestamp_ns, mask, pid, path_id in self.read_raw(offset):
+            path = None if path_id == UNKNOWN_PATH else self._table.get(path_id)
+            yield JournalRecord(seq, timestamp_ns, mask, pid, path)
+
+    @staticmethod
+    def _find(view, count, offset):
+        """Index of the first record in view with a seq of at least offset"""
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if RECORD.unpack_from(view, mid * RECORD.size)[0] < offset:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
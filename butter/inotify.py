@@ -4,13 +4,39 @@
 from .utils import get_buffered_length as _get_buffered_length
 from .utils import Eventlike as _Eventlike
 from .utils import CLOEXEC_DEFAULT as _CLOEXEC_DEFAULT
+from .utils import monotonic as _monotonic
+from .utils import move_to_end as _move_to_end
+from .utils import fsencode as _fsencode
+from .utils import scandir as _scandir
+from .utils import readv as _readv
+from .utils import mtime_ns as _mtime_ns
+from .utils import ctime_ns as _ctime_ns
 
-from ._inotify import inotify_init, inotify_add_watch, inotify_rm_watch
-from ._inotify import str_to_events
+from ._inotify import inotify_init, inotify_add_watch, inotify_add_watches, inotify_rm_watch
+from ._inotify import InotifyEvent, MoveEvent
+from ._inotify import str_to_events, buffer_to_events, new_event_infos
+from ._inotify import buffer_to_arrays, events_to_arrays, InotifyEventArray, EVENT_DTYPE
+from ._inotify import EVENT_BUFFER_MIN, ALL_MASK
+from ._inotify import WatchStats, WatchStat
 from ._inotify import event_name
+from ._inotify import EventKind, KIND_TABLE, event_kind, dispatch
+from .timerfd import Timer as _Timer
+from .timerfd import CLOCK_MONOTONIC as _CLOCK_MONOTONIC
+from .timerfd import TFD_NONBLOCK as _TFD_NONBLOCK
 
+from collections import OrderedDict as _OrderedDict
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
+from zlib import crc32 as _crc32
 from errno import EINVAL as _EINVAL
+from errno import EAGAIN as _EAGAIN
+from errno import ENOSPC as _ENOSPC
+from errno import ENOENT as _ENOENT
+from errno import ENOTDIR as _ENOTDIR
+from errno import EACCES as _EACCES
+from collections import namedtuple as _namedtuple
+from stat import S_ISDIR as _S_ISDIR
 
+import select as _select
 import os as _os
 
 # Import all the constants
@@ -21,9 +47,52 @@ for key in dir(_lib):
         _l[key] = getattr(_lib, key)
 del key, _lib, _l
 
+# A reasonable size for Inotify's buffer_size, holds ~2000 short named events
+EVENT_BUFFER_DEFAULT = 64 * 1024
+
+
 class Inotify(_Eventlike):
-    def __init__(self, flags=0, closefd=_CLOEXEC_DEFAULT):
-        super(self.__class__, self).__init__()
+    _buffer = None
+    _stats = None
+    # bytes of events read from the kernel by the last _read_buffer()
+    _last_read = 0
+    _NO_INFOS = new_event_infos(0)
+
+    def __init__(self, flags=0, closefd=_CLOEXEC_DEFAULT, buffer_size=None, stats=False):
+        """Create a new Inotify object
+
+        Arguments
+        ----------
+        :param int flags: Flags to open the inotify fd with
+        :param int buffer_size: Read events into a reusable buffer of this many
+                                bytes instead of allocating a new one for each
+                                batch of events (see EVENT_BUFFER_DEFAULT)
+        :param stats: Keep per watch counters of the events read, see
+                      the stats property. True to count into a new
+                      WatchStats or a WatchStats instance to count into
+
+        Flags
+        ------
+        IN_CLOEXEC: Automatically close the inotify handle on exec()
+        IN_NONBLOCK: Place the file descriptor in non blocking mode
+
+        When buffer_size is set each read is a single readv() into the buffer
+        rather than an ioctl(FIONREAD) followed by a read() of the
+        reported size, at most buffer_size bytes of events are read at once
+        """
+        super(Inotify, self).__init__()
+        
+        if buffer_size is not None:
+            if buffer_size < EVENT_BUFFER_MIN:
+                raise ValueError("buffer_size must be at least {} bytes".format(EVENT_BUFFER_MIN))
+            self._buffer = bytearray(buffer_size)
+            self._infos = new_event_infos(buffer_size)
+
+        if isinstance(stats, WatchStats):
+            self._stats = stats
+        elif stats:
+            self._stats = WatchStats()
+
         fd = inotify_init(flags, closefd=closefd)
         self._fd = fd
         
@@ -45,8 +114,129 @@ class Inotify(_Eventlike):
     def ignore(self, wd):
         inotify_rm_watch(self.fileno(), wd)
         
-    def _read_events(self):
+    @property
+    def stats(self):
+        """The WatchStats of this object or None if it was created without
+        stats=True
+
+        >>> inotify = Inotify(stats=True)
+        >>> ...
+        >>> for wd, stat in inotify.stats.top_n(5):
+        ...     print(wd, stat.events, stat.bytes)
+        """
+        return self._stats
+
+    def read_events(self, mask=None):
+        """Read and return multiple events from the kernel
+
+        Arguments
+        ----------
+        :param int mask: Only return events with one of these IN_* bits set,
+                         events read from the kernel are filtered while they
+                         are decoded so unwanted events never become python
+                         objects. Blocking objects keep reading until an
+                         event matches
+
+        Returns
+        --------
+        :return: The events read
+        :rtype: list
+        """
+        if mask is None:
+            return super(Inotify, self).read_events()
+
+        events = [event for event in self._events if event.mask & mask]
+        self._events = []
+        while not events:
+            events = self._read_events(mask)
+            if not self._blocking:
+                break
+
+        return events
+
+    def iter_events(self, mask=None):
+        """Iterate over events one at a time, reading them from the kernel a
+        batch at a time, see read_events() for mask
+
+        Iterating a blocking object never ends, for a non blocking object the
+        iterator stops once no more events are waiting in the kernel (a
+        batch with no events matching mask does not end the iteration)
+        """
+        events = self._events
+        self._events = []
+        for event in events:
+            if mask is None or event.mask & mask:
+                yield event
+
+        if mask is None:
+            mask = ALL_MASK
+        while True:
+            events = self._read_events(mask)
+            if not events and not self._last_read:
+                if not self._blocking:
+                    return
+                # wait for events rather than spinning on an empty read
+                _select.select([self], [], [])
+            for event in events:
+                yield event
+
+    def read_events_array(self, mask=None):
+        """Read multiple events from the kernel into numpy arrays
+
+        Like read_events() but rather than a list of InotifyEvents this
+        returns an InotifyEventArray of a structured 'events' array (int32
+        wd, uint32 mask and cookie) and the filenames packed into a single
+        bytes object with their offsets, decoded straight from the buffer
+        read from the kernel. This makes statistics over large batches
+        (eg np.bincount(batch.events['wd'])) cheap to compute
+
+        numpy is an optional dependency of butter and is only imported when
+        this method is first used
+
+        Arguments
+        ----------
+        :param int mask: Only return events with one of these IN_* bits set
+
+        Returns
+        --------
+        :return: The events read
+        :rtype: InotifyEventArray
+        """
+        if self._events:
+            events = self._events
+            self._events = []
+            if mask is not None:
+                events = [event for event in events if event.mask & mask]
+            return events_to_arrays(events)
+
+        buf, length, infos = self._read_buffer()
+        return buffer_to_arrays(buf, length, infos, ALL_MASK if mask is None else mask)
+
+    def _read_events(self, mask=ALL_MASK):
+        buf, length, infos = self._read_buffer()
+        return buffer_to_events(buf, length, infos, mask)
+
+    def _read_buffer(self):
+        """Read a batch of events from the kernel
+
+        Returns the buffer holding the events, how many bytes of it were
+        read and scratch space for decoding it with buffer_to_events()
+        """
         fd = self.fileno()
+
+        if self._buffer is not None:
+            # blocking fd's block in readv until events arrive, non blocking
+            # fd's raise EAGAIN which we map to no events
+            try:
+                length = _readv(fd, [self._buffer])
+            except OSError as err:
+                if err.errno != _EAGAIN:
+                    raise
+                length = 0
+            self._last_read = length
+            if self._stats is not None:
+                self._stats.account(self._buffer, length)
+            return self._buffer, length, self._infos
         
         # The following code is complex but required to get the same values with
         # expected behavior with blocking/non-blocking fd's
@@ -60,22 +250,964 @@ class Inotify(_Eventlike):
                 # between the _get_buffered_length and here, we eat the exception and try again
                 # so the caller does not ahve to deal with it. if there is a greater issue
                 # the second read should blow up
+                if err.errno == _EAGAIN:
+                    self._last_read = 0
+                    return b'', 0, self._NO_INFOS
                 if err.errno != _EINVAL:
                     raise
                 pass
             buf_len = _get_buffered_length(fd)
         raw_events = _os.read(fd, buf_len)
+        self._last_read = len(raw_events)
+        if self._stats is not None:
+            self._stats.account(raw_events, len(raw_events))
+
+        return raw_events, len(raw_events), new_event_infos(len(raw_events))
+
+# Amount of directories passed to inotify_add_watches in one go when
+# populating a RecursiveInotify
+WATCH_BATCH_SIZE = 1024
+
+
+class RecursiveInotify(Inotify):
+    """An Inotify object that watches entire directory trees
+
+    Watches are added for every directory below the watched path and new
+    directories are watched as they are created (or moved into the tree).
+    An index of watch descriptor to directory path is kept so that the
+    filename of each returned InotifyEvent is the full path (bytes) of the
+    file or directory the event occurred against
+
+    >>> notifier = RecursiveInotify()
+    >>> root_wd = notifier.watch('/tmp', IN_CREATE|IN_DELETE)
+    >>> for event in notifier:
+    ...     print(event.filename)
+
+    Watches are dropped from the index when their IN_IGNORED event is read
+    (eg the directory was deleted). Events not tied to a watch such as
+    IN_Q_OVERFLOW are returned unchanged
+
+    Overflow Recovery
+    ------------------
+    When created with recover=True a snapshot of (inode, mtime, size) for
+    every entry of every watched directory is kept up to date from the
+    events read. If the kernel queue overflows the IN_Q_OVERFLOW event is
+    followed by IN_CREATE, IN_DELETE and IN_MODIFY events synthesised by
+    rescanning the watched directories and diffing them against the
+    snapshot, directories that have vanished get a synthesised IN_IGNORED.
+    Synthesised events have a cookie of 0 and only cover what changed, not
+    every event that was lost (eg a file created and removed during the
+    overflow is never seen)
+
+    Keeping the snapshot costs an lstat() per entry when a directory is
+    first watched and per event afterwards
+    """
+    # events we need from every directory to keep the tree up to date
+    # regardless of what the caller asked for
+    _TRACKING_EVENTS = IN_CREATE | IN_MOVED_TO
+    # additional events needed to keep snapshots accurate for recovery
+    _SNAPSHOT_EVENTS = IN_DELETE | IN_MOVED_FROM | IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE
+    # events that are always returned to the caller
+    _ALWAYS_EVENTS = IN_IGNORED | IN_Q_OVERFLOW | IN_UNMOUNT
+
+    def __init__(self, flags=0, closefd=_CLOEXEC_DEFAULT, buffer_size=None, recover=False, stats=False):
+        """Create a new RecursiveInotify object
+
+        Arguments
+        ----------
+        :param int flags: Flags to open the inotify fd with (see Inotify)
+        :param int buffer_size: Size of the reusable read buffer (see Inotify)
+        :param bool recover: Keep directory snapshots and synthesise the events
+                             lost when the kernel queue overflows
+        :param stats: Keep per watch counters (see Inotify and hot_paths())
+        """
+        super(RecursiveInotify, self).__init__(flags, closefd=closefd, buffer_size=buffer_size, stats=stats)
+        self._paths = {}
+        self._masks = {}
+
+        self._recover = recover
+        # wd -> {name: (inode, mtime_ns, size, is_dir)}
+        self._snapshots = {}
+        if recover:
+            self._tracking = self._TRACKING_EVENTS | self._SNAPSHOT_EVENTS
+        else:
+            self._tracking = self._TRACKING_EVENTS
+
+    def watch(self, path, events=IN_ALL_EVENTS):
+        """Watch a directory and all directories below it
+
+        Arguments
+        ----------
+        :param str path: The directory to watch
+        :param int events: The inotify IN_* events to watch the tree for
+
+        Returns
+        --------
+        :return: The watch descriptor for path
+        :rtype: int
+        """
+        path = _fsencode(path)
+        wd = inotify_add_watch(self.fileno(), path, events | self._tracking | IN_ONLYDIR)
+        self._paths[wd] = path
+        self._masks[wd] = events
+
+        self._watch_children([(wd, path)], events)
+
+        return wd
+
+    def ignore(self, wd):
+        """Stop watching the directory for wd and all directories below it"""
+        root = self._paths.get(wd)
+        if root is None:
+            return super(RecursiveInotify, self).ignore(wd)
+
+        prefix = _os.path.join(root, b'')
+        for child_wd, path in list(self._paths.items()):
+            if child_wd != wd and path.startswith(prefix):
+                self._ignore_quietly(child_wd)
+        super(RecursiveInotify, self).ignore(wd)
+
+    def _ignore_quietly(self, wd):
+        # the directory may already be gone with an IN_IGNORED in flight
+        try:
+            super(RecursiveInotify, self).ignore(wd)
+        except ValueError:
+            pass
+
+    def path(self, wd):
+        """Return the path of the directory watched by wd"""
+        return self._paths[wd]
+
+    def hot_paths(self, n=10, key='bytes'):
+        """Return the n watched directories generating the most events
+
+        Requires the object to be created with stats=True, see
+        WatchStats.top_n() for key. Directories no longer watched are skipped
+
+        Returns
+        --------
+        :return: (path, WatchStat) pairs, busiest first
+        :rtype: list
+        """
+        if self._stats is None:
+            raise ValueError("RecursiveInotify was created without stats=True")
+        top = self._stats.top_n(len(self._paths), key)
+        return [(self._paths[wd], stat) for wd, stat in top if wd in self._paths][:n]
+
+    def read_events_array(self, mask=None):
+        """As Inotify.read_events_array() with full paths as the names
+
+        The events are processed as for read_events() to keep the tree up to
+        date so this is not any faster than converting the list yourself
+        """
+        return events_to_arrays(self.read_events(mask))
+
+    def _forget(self, wd):
+        if self._stats is not None:
+            self._stats.forget(wd)
+        del self._paths[wd]
+        del self._masks[wd]
+        self._snapshots.pop(wd, None)
+
+    def _watch_tree(self, path, events):
+        """Watch path and everything under it, used for directories that
+        appear after the tree was first watched"""
+        wds = inotify_add_watches(self.fileno(), [path], events | self._tracking | IN_ONLYDIR)
+        if wds[0] >= 0:
+            self._paths[wds[0]] = path
+            self._masks[wds[0]] = events
+            self._watch_children([(wds[0], path)], events)
+
+    def _scan(self, dirpath):
+        """List dirpath returning its subdirectories and its snapshot (None
+        if recovery is disabled), raises OSError if it can't be listed"""
+        subdirs = []
+        snapshot = {} if self._recover else None
+
+        for entry in _scandir(dirpath):
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if snapshot is not None:
+                    st = entry.stat(follow_symlinks=False)
+                    snapshot[entry.name] = (st.st_ino, _mtime_ns(st), st.st_size, is_dir)
+            except OSError:
+                # removed since it was listed
+                continue
+            if is_dir:
+                subdirs.append(entry.path)
+
+        return subdirs, snapshot
+
+    def _watch_children(self, dirs, events):
+        """Breadth first walk of the subdirectories of dirs, a list of
+        (wd, path) pairs that are already watched, adding watches in batches
+
+        Each directory is watched before it is listed so a subdirectory
+        created while walking is either found by the listing or reported
+        via IN_CREATE, never neither
+        """
+        fd = self.fileno()
+        mask = events | self._tracking | IN_ONLYDIR
+        paths = self._paths
+        masks = self._masks
+        snapshots = self._snapshots
+
+        pending = []
+        while dirs or pending:
+            for wd, dirpath in dirs:
+                try:
+                    subdirs, snapshot = self._scan(dirpath)
+                except OSError:
+                    # removed or unreadable since we saw it
+                    continue
+                pending.extend(subdirs)
+                if snapshot is not None:
+                    snapshots[wd] = snapshot
+
+            # oldest first, so each level is watched before the one below it
+            batch = pending[:WATCH_BATCH_SIZE]
+            del pending[:WATCH_BATCH_SIZE]
+
+            dirs = []
+            for dirpath, wd in zip(batch, inotify_add_watches(fd, batch, mask)):
+                if wd >= 0:
+                    paths[wd] = dirpath
+                    masks[wd] = events
+                    dirs.append((wd, dirpath))
+
+    def _update_snapshot(self, wd, mask, filename, path):
+        snapshot = self._snapshots.get(wd)
+        if snapshot is None or not filename:
+            return
+
+        if mask & (IN_DELETE | IN_MOVED_FROM):
+            snapshot.pop(filename, None)
+            return
+
+        try:
+            st = _os.lstat(path)
+        except OSError:
+            snapshot.pop(filename, None)
+        else:
+            snapshot[filename] = (st.st_ino, _mtime_ns(st), st.st_size, bool(mask & IN_ISDIR))
+
+    def _recover_overflow(self):
+        """Rescan every watched directory and synthesise the events needed
+        to bring the caller up to date with its snapshot"""
+        new = tuple.__new__
+        events = []
+
+        # directories found by this rescan are watched and snapshotted by
+        # _watch_tree() and are not part of the copy iterated here
+        for wd, dirpath in list(self._paths.items()):
+            old = self._snapshots.get(wd, {})
+            try:
+                _, current = self._scan(dirpath)
+            except OSError:
+                events.append(new(InotifyEvent, (wd, IN_IGNORED, 0, dirpath)))
+                self._ignore_quietly(wd)
+                self._forget(wd)
+                continue
+            self._snapshots[wd] = current
+
+            for name, (inode, mtime, size, is_dir) in current.items():
+                path = _os.path.join(dirpath, name)
+                prev = old.get(name)
+                dir_flag = IN_ISDIR if is_dir else 0
+                if prev is None or prev[0] != inode:
+                    if prev is not None:
+                        events.append(new(InotifyEvent, (wd, IN_DELETE | (IN_ISDIR if prev[3] else 0), 0, path)))
+                    events.append(new(InotifyEvent, (wd, IN_CREATE | dir_flag, 0, path)))
+                    if is_dir:
+                        self._watch_tree(path, self._masks[wd])
+                elif not is_dir and (prev[1] != mtime or prev[2] != size):
+                    events.append(new(InotifyEvent, (wd, IN_MODIFY, 0, path)))
+
+            for name, prev in old.items():
+                if name not in current:
+                    path = _os.path.join(dirpath, name)
+                    events.append(new(InotifyEvent, (wd, IN_DELETE | (IN_ISDIR if prev[3] else 0), 0, path)))
+
+        masks = self._masks
+        return [event for event in events
+                if event.mask & (masks.get(event.wd, 0) | self._ALWAYS_EVENTS)]
+
+    def _read_events(self, mask=ALL_MASK):
+        # a batch may hold nothing but the events we track the tree with,
+        # blocking objects keep reading until something is left for the caller
+        while True:
+            events = self._read_tree_events(mask)
+            if events or not self._blocking:
+                return events
+
+    def _read_tree_events(self, mask):
+        paths = self._paths
+        masks = self._masks
+        recover = self._recover
+        always = self._ALWAYS_EVENTS
+        new = tuple.__new__
+
+        # events needed to maintain the tree are always decoded and then
+        # filtered here once they have been processed
+        kernel_mask = mask | self._tracking | always
+
+        events = []
+        for event in super(RecursiveInotify, self)._read_events(kernel_mask):
+            wd, mask_, cookie, filename = event
+            dirpath = paths.get(wd)
+            if dirpath is None:
+                if mask_ & mask:
+                    events.append(event)
+                if recover and mask_ & IN_Q_OVERFLOW:
+                    events.extend(e for e in self._recover_overflow() if e.mask & mask)
+                continue
+
+            path = _os.path.join(dirpath, filename) if filename else dirpath
+            wanted = (masks[wd] | always) & mask
+
+            if recover:
+                self._update_snapshot(wd, mask_, filename, path)
+
+            if mask_ & IN_ISDIR and mask_ & self._TRACKING_EVENTS:
+                # moving an already watched directory within the tree
+                # returns its existing wd, updating the path in the index
+                self._watch_tree(path, masks[wd])
+
+            if mask_ & IN_IGNORED:
+                self._forget(wd)
+
+            if mask_ & wanted:
+                events.append(new(InotifyEvent, (wd, mask_, cookie, path)))
+
+        return events
+
+class InotifyPool(_Eventlike):
+    """Spread a large amount of watches over multiple inotify instances
+
+    Each watched path is assigned to one of 'shards' Inotify objects by a
+    hash of its path. When several shards have events waiting they are
+    read and decoded in parallel on a thread pool, the read and the C
+    decoder both run with the GIL released. fileno() is an epoll fd that is
+    readable when any shard is
+
+    >>> pool = InotifyPool(shards=4)
+    >>> wds = [pool.watch(path, IN_CREATE) for path in paths]
+    >>> for event in pool:
+    ...     print(event)
+
+    Watch descriptors returned by watch() and found in events are global
+    to the pool (the shard's wd * shards + the shard index) and must be
+    passed to ignore() as is, use shard_of() to split them. Events from a
+    single shard are returned in the order the kernel queued them, when
+    multiple shards are read at once their events are returned one shard
+    after another in shard order
+    """
+    def __init__(self, shards=4, flags=0, closefd=_CLOEXEC_DEFAULT, buffer_size=EVENT_BUFFER_DEFAULT):
+        """Create a new InotifyPool
+
+        Arguments
+        ----------
+        :param int shards: The amount of inotify instances to spread watches over
+        :param int flags: Flags to open each inotify fd with (see Inotify)
+        :param int buffer_size: Size of each shard's read buffer (see Inotify)
+        """
+        super(InotifyPool, self).__init__()
+        if shards < 1:
+            raise ValueError("An InotifyPool needs at least 1 shard")
+
+        self._blocking = not flags & IN_NONBLOCK
+        self._shards = []
+        self._epoll = _select.epoll()
+        try:
+            for i in range(shards):
+                # shards are only read once epoll says they are ready
+                shard = Inotify(flags | IN_NONBLOCK, closefd=closefd, buffer_size=buffer_size)
+                self._shards.append(shard)
+                self._epoll.register(shard.fileno(), _select.EPOLLIN)
+        except Exception:
+            self._close_shards()
+            raise
+        self._shard_fds = {shard.fileno(): i for i, shard in enumerate(self._shards)}
+        self._executor = _ThreadPoolExecutor(max_workers=shards)
+        self._fd = self._epoll.fileno()
+
+    @property
+    def shards(self):
+        """The amount of inotify instances in the pool"""
+        return len(self._shards)
+
+    def shard_of(self, wd):
+        """Split a pool wd into (shard index, the shard's wd)"""
+        shard_wd, index = divmod(wd, len(self._shards))
+        return index, shard_wd
 
-        events = str_to_events(raw_events)
+    def watch(self, path, events=IN_ALL_EVENTS):
+        """Watch path on the shard it hashes to, returning a pool wide wd"""
+        index = (_crc32(_fsencode(path)) & 0xFFFFFFFF) % len(self._shards)
+        wd = self._shards[index].watch(path, events)
+        return wd * len(self._shards) + index
+
+    def del_watch(self, wd):
+        self.ignore(wd)
+
+    def ignore(self, wd):
+        index, shard_wd = self.shard_of(wd)
+        self._shards[index].ignore(shard_wd)
+
+    def _close_shards(self):
+        for shard in self._shards:
+            shard.close()
+        self._epoll.close()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self._close_shards()
+        self._fd = None
+
+    def _read_shard(self, index):
+        n_shards = len(self._shards)
+        new = tuple.__new__
+        # wd's < 0 (IN_Q_OVERFLOW) are not tied to a watch, leave them be
+        return [new(InotifyEvent, (wd * n_shards + index if wd > 0 else wd, mask, cookie, filename))
+                for wd, mask, cookie, filename in self._shards[index]._read_events()]
+
+    def _read_events(self):
+        timeout = -1 if self._blocking else 0
+
+        while True:
+            ready = sorted(self._shard_fds[fd] for fd, _ in self._epoll.poll(timeout))
+
+            if len(ready) == 1:
+                # not worth a trip through the thread pool
+                events = self._read_shard(ready[0])
+            else:
+                events = []
+                for batch in self._executor.map(self._read_shard, ready):
+                    events.extend(batch)
+
+            if events or not self._blocking:
+                return events
+
+
+class _InotifyStage(_Eventlike):
+    """Base class for objects that post process the events read from an
+    Inotify object and need to emit events at a later deadline
+
+    The inotify fd and a single timerfd armed for the earliest pending
+    deadline are combined in an epoll fd, which is what fileno() returns,
+    so the stage can be waited on or added to an event loop like any other
+    event like object. The stage takes ownership of the Inotify object and
+    closes it when closed
+
+    Subclasses implement _process(events, now) which is called with each
+    batch of events read from inotify and _expire(now) which is called to
+    collect events whose deadline has passed, both return a list of events
+    to hand to the caller. _next_deadline() returns the earliest pending
+    deadline (time.monotonic() based) or None
+    """
+    def __init__(self, inotify, blocking=True):
+        super(_InotifyStage, self).__init__()
+        self._inotify = inotify
+        self._blocking = blocking
+        self._armed = None
+
+        self._timer = _Timer(_CLOCK_MONOTONIC, _TFD_NONBLOCK)
+        self._epoll = _select.epoll()
+        self._epoll.register(inotify.fileno(), _select.EPOLLIN)
+        self._epoll.register(self._timer.fileno(), _select.EPOLLIN)
+        self._fd = self._epoll.fileno()
+
+    @property
+    def inotify(self):
+        """The Inotify object events are read from, use this to add watches"""
+        return self._inotify
+
+    def close(self):
+        self._epoll.close()
+        self._timer.close()
+        self._inotify.close()
+        self._fd = None
+
+    def _process(self, events, now):
+        raise NotImplementedError
+
+    def _expire(self, now):
+        raise NotImplementedError
+
+    def _next_deadline(self):
+        raise NotImplementedError
+
+    def _arm(self):
+        deadline = self._next_deadline()
+        if deadline == self._armed:
+            return
+        self._armed = deadline
+
+        if deadline is None:
+            self._timer.disable()
+        else:
+            # an absolute time of exactly 0 would disarm the timer
+            seconds, nano_seconds = divmod(max(int(deadline * 1000000000), 1), 1000000000)
+            self._timer.after(seconds, nano_seconds)
+        self._timer.update(absolute=True)
+
+    def _read_events(self):
+        inotify_fd = self._inotify.fileno()
+        timer_fd = self._timer.fileno()
+        timeout = -1 if self._blocking else 0
+
+        while True:
+            events = []
+            for fd, _ in self._epoll.poll(timeout):
+                if fd == inotify_fd:
+                    events.extend(self._process(self._inotify.read_events(), _monotonic()))
+                elif fd == timer_fd:
+                    try:
+                        _os.read(timer_fd, 8)
+                    except OSError as err:
+                        if err.errno != _EAGAIN:
+                            raise
+                    self._armed = None
+
+            events.extend(self._expire(_monotonic()))
+            self._arm()
+
+            # blocking callers expect at least one event
+            if events or not self._blocking:
+                return events
+
+
+# Events that are merged by InotifyCoalescer, everything else is passed
+# through as soon as it is read
+COALESCE_EVENTS = IN_ACCESS | IN_MODIFY | IN_ATTRIB | IN_OPEN | IN_CLOSE_WRITE | IN_CLOSE_NOWRITE
+
+
+class InotifyCoalescer(_InotifyStage):
+    """Merge bursts of events against the same file into a single event
+
+    Events in 'events' (COALESCE_EVENTS by default) are held back for
+    'window' seconds from the first event seen for a (wd, filename) pair,
+    any further events for the same pair in that time have their mask ORed
+    into the held event. A single InotifyEvent is returned per pair when
+    its window closes
+
+    >>> notifier = Inotify()
+    >>> wd = notifier.watch('/tmp', IN_MODIFY|IN_CLOSE_WRITE|IN_DELETE)
+    >>> coalescer = InotifyCoalescer(notifier, window=0.1)
+    >>> for event in coalescer:
+    ...     print(event)
+
+    Other events (eg IN_DELETE) are returned straight away, if one arrives
+    for a pair with a held event the held event is returned first so the
+    order of events for a file is preserved
+    """
+    def __init__(self, inotify, window=0.05, events=COALESCE_EVENTS, blocking=True):
+        """Create a new InotifyCoalescer
+
+        Arguments
+        ----------
+        :param Inotify inotify: The Inotify object to read events from
+        :param float window: Seconds to hold events for before returning them
+        :param int events: The IN_* events to merge together
+        :param bool blocking: Block in read_events() until there is an event
+        """
+        super(InotifyCoalescer, self).__init__(inotify, blocking)
+        self._window = window
+        self._coalesce = events
+        # (wd, filename) -> [deadline, mask, cookie], in deadline order as
+        # every key gets the same window
+        self._pending = _OrderedDict()
+
+    def flush(self):
+        """Return all held events without waiting for their window to close"""
+        pending = self._pending
+        self._pending = _OrderedDict()
+        self._arm()
+        return [InotifyEvent(wd, mask, cookie, filename)
+                for (wd, filename), (_, mask, cookie) in pending.items()]
+
+    def _process(self, events, now):
+        pending = self._pending
+        # IN_ISDIR is a flag rather than an event, don't let it stop merging
+        passthrough = ~(self._coalesce | IN_ISDIR)
+
+        ready = []
+        for event in events:
+            key = (event.wd, event.filename)
+            held = pending.get(key)
+            if event.mask & passthrough:
+                if held is not None:
+                    del pending[key]
+                    ready.append(InotifyEvent(key[0], held[1], held[2], key[1]))
+                ready.append(event)
+            elif held is not None:
+                held[1] |= event.mask
+            else:
+                pending[key] = [now + self._window, event.mask, event.cookie]
+
+        return ready
+
+    def _expire(self, now):
+        pending = self._pending
+
+        ready = []
+        while pending:
+            key, held = next(iter(pending.items()))
+            if held[0] > now:
+                break
+            del pending[key]
+            ready.append(InotifyEvent(key[0], held[1], held[2], key[1]))
+
+        return ready
+
+    def _next_deadline(self):
+        for deadline, _, _ in self._pending.values():
+            return deadline
+        return None
+
+
+class InotifyMovePairer(_InotifyStage):
+    """Pair IN_MOVED_FROM and IN_MOVED_TO events into a single MoveEvent
+
+    The kernel gives both halves of a rename the same cookie. IN_MOVED_FROM
+    events are held for up to 'timeout' seconds waiting for the matching
+    IN_MOVED_TO, when it arrives a MoveEvent(src, dst) is returned in its
+    place
+
+    >>> notifier = Inotify()
+    >>> wd = notifier.watch('/tmp', IN_MOVE|IN_CREATE|IN_DELETE)
+    >>> pairer = InotifyMovePairer(notifier)
+    >>> for event in pairer:
+    ...     if isinstance(event, MoveEvent):
+    ...         print(event.src.filename, '->', event.dst.filename)
+
+    A file moved out of the watched directories never gets its IN_MOVED_TO,
+    once its timeout expires (or more than max_pending renames are waiting)
+    the IN_MOVED_FROM is returned as an IN_DELETE. The kernel always queues
+    IN_MOVED_FROM first so an IN_MOVED_TO with nothing to pair with (a file
+    moved in from elsewhere) is returned as an IN_CREATE straight away. The
+    cookie of converted events is kept. All other events are passed through
+    as they are read
+    """
+    def __init__(self, inotify, timeout=0.01, max_pending=1024, blocking=True):
+        """Create a new InotifyMovePairer
+
+        Arguments
+        ----------
+        :param Inotify inotify: The Inotify object to read events from
+        :param float timeout: Seconds to wait for the second half of a rename
+        :param int max_pending: Most unpaired IN_MOVED_FROM events to hold
+        :param bool blocking: Block in read_events() until there is an event
+        """
+        super(InotifyMovePairer, self).__init__(inotify, blocking)
+        self._timeout = timeout
+        self._max_pending = max_pending
+        # cookie -> (deadline, IN_MOVED_FROM event) in deadline order
+        self._pending = _OrderedDict()
+
+    @staticmethod
+    def _as_delete(event):
+        return InotifyEvent(event.wd, IN_DELETE | (event.mask & IN_ISDIR), event.cookie, event.filename)
+
+    @staticmethod
+    def _as_create(event):
+        return InotifyEvent(event.wd, IN_CREATE | (event.mask & IN_ISDIR), event.cookie, event.filename)
+
+    def flush(self):
+        """Return all held IN_MOVED_FROM events as IN_DELETE events"""
+        pending = self._pending
+        self._pending = _OrderedDict()
+        self._arm()
+        return [self._as_delete(event) for _, event in pending.values()]
+
+    def _process(self, events, now):
+        pending = self._pending
+
+        ready = []
+        for event in events:
+            mask = event.mask
+            if mask & IN_MOVED_FROM:
+                pending[event.cookie] = (now + self._timeout, event)
+                if len(pending) > self._max_pending:
+                    _, (_, oldest) = pending.popitem(last=False)
+                    ready.append(self._as_delete(oldest))
+            elif mask & IN_MOVED_TO:
+                held = pending.pop(event.cookie, None)
+                if held is None:
+                    ready.append(self._as_create(event))
+                else:
+                    ready.append(MoveEvent(held[1], event))
+            else:
+                ready.append(event)
+
+        return ready
+
+    def _expire(self, now):
+        pending = self._pending
+
+        ready = []
+        while pending:
+            cookie, (deadline, event) = next(iter(pending.items()))
+            if deadline > now:
+                break
+            del pending[cookie]
+            ready.append(self._as_delete(event))
+
+        return ready
+
+    def _next_deadline(self):
+        for deadline, _ in self._pending.values():
+            return deadline
+        return None
+
+
+# wd used for events synthesised for paths that are being polled
+POLLED_WD = 0
+
+WatchMetrics = _namedtuple("WatchMetrics", "watched polled evictions fallbacks promotions promotion_failures polls")
+
+
+class InotifyWatchManager(_InotifyStage):
+    """Keep the amount of inotify watches within a budget
+
+    Paths are watched through the manager rather than the Inotify object.
+    Once 'budget' paths are watched, watching another path evicts the
+    least recently active one (the one that has gone longest without an
+    event). The kernel refusing a watch (ENOSPC, the per user
+    fs.inotify.max_user_watches limit) also causes an eviction, or if
+    nothing is left to evict the path falls back to polling.
+
+    Evicted paths are polled with stat() every 'poll_interval' seconds.
+    A polled path whose inode, mtime, ctime or size changed is watched
+    again (possibly evicting another path) and reported as an IN_MODIFY
+    event (with IN_ISDIR for directories) against the path itself. If it
+    can not be watched again (eg EACCES) it stays polled. A polled path
+    that vanished is reported as IN_DELETE_SELF and forgotten.
+    Events for polled paths have a wd of POLLED_WD, or the new wd if the
+    path was watched again. The filename of every returned event is the
+    full path of the file the event occurred against
+
+    >>> manager = InotifyWatchManager(Inotify(), budget=1000)
+    >>> for path in paths:
+    ...     manager.watch(path, IN_CREATE|IN_DELETE)
+    >>> for event in manager:
+    ...     print(event.filename)
+    >>> manager.metrics
+    WatchMetrics(watched=1000, polled=..., evictions=..., ...)
+    """
+    def __init__(self, inotify, budget=8192, poll_interval=5.0, blocking=True):
+        """Create a new InotifyWatchManager
+
+        Arguments
+        ----------
+        :param Inotify inotify: The Inotify object to manage watches on
+        :param int budget: The most watches to have active at once
+        :param float poll_interval: Seconds between polls of evicted paths
+        :param bool blocking: Block in read_events() until there is an event
+        """
+        super(InotifyWatchManager, self).__init__(inotify, blocking)
+        self._budget = budget
+        self._poll_interval = poll_interval
+
+        # path -> wd, least recently active first
+        self._active = _OrderedDict()
+        self._paths = {}
+        self._masks = {}
+        # path -> stat signature for paths we are polling
+        self._polled = {}
+        # wd -> path for watches we removed ourselves, events still queued
+        # for them are returned until their IN_IGNORED which is swallowed
+        self._evicted = {}
+        self._next_poll = None
+
+        self._evictions = 0
+        self._fallbacks = 0
+        self._promotions = 0
+        self._promotion_failures = 0
+        self._polls = 0
+
+    @property
+    def metrics(self):
+        """Counters describing how the budget is being managed
+
+        watched:    paths with an active inotify watch
+        polled:     paths currently being polled
+        evictions:  watches removed to stay within the budget
+        fallbacks:  times a path had to be polled as nothing was left to evict
+        promotions: polled paths that were watched again after changing
+        promotion_failures: changed polled paths that could not be watched
+                    again and are still polled
+        polls:      polls of the evicted paths
+        """
+        return WatchMetrics(len(self._active), len(self._polled), self._evictions,
+                            self._fallbacks, self._promotions, self._promotion_failures,
+                            self._polls)
+
+    def watch(self, path, events=IN_ALL_EVENTS):
+        """Watch path, returning its wd or POLLED_WD if it had to be polled"""
+        path = _fsencode(path)
+        self._masks[path] = events
+
+        wd = self._active.get(path)
+        if wd is not None:
+            # update the mask of the existing watch
+            return inotify_add_watch(self._inotify.fileno(), path, events)
+
+        self._polled.pop(path, None)
+        return self._add(path, ())
+
+    def ignore(self, path):
+        """Stop watching or polling path"""
+        path = _fsencode(path)
+        self._masks.pop(path, None)
+        self._polled.pop(path, None)
+        wd = self._active.pop(path, None)
+        if wd is not None:
+            del self._paths[wd]
+            self._evicted[wd] = path
+            self._inotify.ignore(wd)
+
+    def path(self, wd):
+        """Return the path watched by wd"""
+        return self._paths[wd]
+
+    @staticmethod
+    def _signature(path):
+        try:
+            st = _os.stat(path)
+        except OSError:
+            return None
+        return (st.st_ino, _mtime_ns(st), _ctime_ns(st), st.st_size, _S_ISDIR(st.st_mode))
+
+    def _add(self, path, ignore_errors):
+        active = self._active
+        fd = self._inotify.fileno()
+        mask = self._masks[path]
+
+        while True:
+            wd = inotify_add_watches(fd, [path], mask, ignore_errors=(_ENOSPC,) + ignore_errors)[0]
+            if wd != -_ENOSPC:
+                break
+            if not active:
+                self._fallbacks += 1
+                self._start_polling(path)
+                return POLLED_WD
+            self._evict()
+
+        if wd < 0:
+            return wd
+
+        # only make room once the path is watched, so a path the kernel
+        # refuses does not cost another path its watch
+        while active and len(active) >= self._budget:
+            self._evict()
+        if len(active) >= self._budget:
+            # budget of 0, undo the watch
+            self._inotify.ignore(wd)
+            self._evicted[wd] = path
+            self._fallbacks += 1
+            self._start_polling(path)
+            return POLLED_WD
+
+        active[path] = wd
+        self._paths[wd] = path
+        return wd
+
+    def _evict(self):
+        path, wd = self._active.popitem(last=False)
+        del self._paths[wd]
+        self._evicted[wd] = path
+        try:
+            self._inotify.ignore(wd)
+        except ValueError:
+            # already removed by the kernel
+            pass
+        self._evictions += 1
+        self._start_polling(path)
+
+    def _start_polling(self, path):
+        self._polled[path] = self._signature(path)
+        if self._next_poll is None:
+            self._next_poll = _monotonic() + self._poll_interval
+
+    def _poll(self):
+        self._polls += 1
+        polled = self._polled
+
+        events = []
+        for path, signature in list(polled.items()):
+            if path not in polled:
+                continue
+            current = self._signature(path)
+            if current == signature:
+                continue
+
+            del polled[path]
+            if current is None:
+                del self._masks[path]
+                events.append(InotifyEvent(POLLED_WD, IN_DELETE_SELF, 0, path))
+                continue
+
+            wd = self._add(path, (_ENOENT, _ENOTDIR, _EACCES))
+            if wd > 0:
+                self._promotions += 1
+            else:
+                # keep polling the path, a fallback (wd == POLLED_WD) is
+                # already polled
+                self._promotion_failures += 1
+                if wd < 0:
+                    polled[path] = current
+                wd = POLLED_WD
+            events.append(InotifyEvent(wd, IN_MODIFY | (IN_ISDIR if current[4] else 0), 0, path))
 
         return events
 
+    def _process(self, events, now):
+        active = self._active
+        paths = self._paths
+        new = tuple.__new__
+
+        ready = []
+        for event in events:
+            wd, mask, cookie, filename = event
+            path = paths.get(wd)
+            if path is None:
+                path = self._evicted.get(wd)
+                if path is None:
+                    ready.append(event)
+                    continue
+                if mask & IN_IGNORED:
+                    del self._evicted[wd]
+                    continue
+            else:
+                _move_to_end(active, path)
+                if mask & IN_IGNORED:
+                    del active[path]
+                    del paths[wd]
+                    self._masks.pop(path, None)
+
+            ready.append(new(InotifyEvent, (wd, mask, cookie, _os.path.join(path, filename) if filename else path)))
+
+        return ready
+
+    def _expire(self, now):
+        if self._next_poll is None or self._next_poll > now:
+            return []
+
+        events = self._poll()
+        self._next_poll = now + self._poll_interval if self._polled else None
+        return events
+
+    def _next_deadline(self):
+        return self._next_poll
+
+
 def watch(path, events=IN_ALL_EVENTS):
     """Quick Convience function to watch a file or dir for any changes
 
     If a dir argument is provided this call will not recursively watch the directories
     due to limitations in inotify's API. if you wish to watch directories recursively
-    you will need to recurs it yourself and add the watches manually
+    use a RecursiveInotify object instead
 
     Warning: if using this function to watch a file or dir repeatedly you may miss events
     due to a race condition, consider using the Inotify object instead to get all the 
@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+"""procinfo: A bounded cache of process information read from /proc
+
+Shared by the event objects that carry a pid (FanotifyEvent.process and
+Signal.process) so consumers do not have to read /proc for every event
+"""
+
+from collections import OrderedDict as _OrderedDict
+from collections import namedtuple as _namedtuple
+from .utils import monotonic as _monotonic
+from .utils import move_to_end as _move_to_end
+from .utils import O_CLOEXEC as _O_CLOEXEC
+import threading as _threading
+import errno as _errno
+import os as _os
+
+ProcessInfo = _namedtuple("ProcessInfo", "pid comm ppid uid gid cgroup start_time")
+class ProcessInfo(ProcessInfo):
+    """Information about a process
+
+    pid: The process id
+    comm: The name of the executable (bytes, at most 15 characters)
+    ppid: The parent process id
+    uid, gid: The real user and group id or -1 if they could not be read
+    cgroup: The cgroup v2 path of the process (bytes) or b'' if it is not known
+    start_time: When the process started in clock ticks after boot, used
+                to tell apart processes that are given the same pid
+    """
+    __slots__ = []
+
+
+# largest /proc/<pid>/status file we expect to read in one go
+_READ_SIZE = 4096
+
+# errnos of a process that has exited and of a file we may not read
+_GONE = (_errno.ENOENT, _errno.ESRCH)
+_DENIED = (_errno.EACCES, _errno.EPERM)
+
+
+def _open_at(dirfd, name):
+    if _os.open in getattr(_os, 'supports_dir_fd', ()):
+        return _os.open(name, _os.O_RDONLY | _O_CLOEXEC, dir_fd=dirfd)
+    return _os.open('/proc/self/fd/{}/{}'.format(dirfd, name), _os.O_RDONLY | _O_CLOEXEC)
+
+
+def _read(dirfd, name):
+    fd = _open_at(dirfd, name)
+    try:
+        return _os.read(fd, _READ_SIZE)
+    finally:
+        _os.close(fd)
+
+
+def _parse_stat(stat):
+    """Return (comm, ppid, start time) from the contents of /proc/<pid>/stat"""
+    # comm may itself contain spaces and brackets, it ends at the last ')'
+    start = stat.index(b'(') + 1
+    end = stat.rindex(b')')
+    fields = stat[end + 2:].split()
+    # fields[0] is field 3 (state) of proc(5)
+    return stat[start:end], int(fields[1]), int(fields[19])
+
+
+def _parse_ids(status):
+    uid = gid = -1
+    for line in status.splitlines():
+        if line.startswith(b'Uid:'):
+            uid = int(line.split()[1])
+        elif line.startswith(b'Gid:'):
+            gid = int(line.split()[1])
+            break
+    return uid, gid
+
+
+def _parse_cgroup(cgroup):
+    for line in cgroup.splitlines():
+        if line.startswith(b'0::'):
+            return line[3:]
+    return b''
+
+
+def read_process_info(pid):
+    """Read the ProcessInfo of a process from /proc
+
+    Arguments
+    ----------
+    :param int pid: The process to read
+
+    Fields other than those from /proc/<pid>/stat that we are not allowed
+    to read (eg the process belongs to another user on a hardened system)
+    are reported as unavailable rather than raising PermissionError
+
+    Returns
+    --------
+    :return: The information on the process or None if it no longer exists
+             or we may not read it
+    :rtype: ProcessInfo
+    """
+    try:
+        dirfd = _os.open('/proc/{}'.format(pid), _os.O_RDONLY | _os.O_DIRECTORY | _O_CLOEXEC)
+    except OSError as err:
+        if err.errno not in _GONE + _DENIED:
+            raise
+        return None
+    try:
+        comm, ppid, start_time = _parse_stat(_read(dirfd, 'stat'))
+        try:
+            uid, gid = _parse_ids(_read(dirfd, 'status'))
+        except OSError as err:
+            if err.errno not in _DENIED:
+                raise
+            uid = gid = -1
+        try:
+            cgroup = _parse_cgroup(_read(dirfd, 'cgroup'))
+        except OSError as err:
+            if err.errno not in (_errno.ENOENT,) + _DENIED:
+                raise
+            cgroup = b''
+    except OSError as err:
+        # the process exited while we were reading it (or its stat file is
+        # hidden from us)
+        if err.errno not in _GONE + _DENIED:
+            raise
+        return None
+    finally:
+        _os.close(dirfd)
+
+    return ProcessInfo(pid, comm, ppid, uid, gid, cgroup, start_time)
+
+
+def read_start_time(pid):
+    """Return the start time of a process (see ProcessInfo) or None if it no
+    longer exists or we may not read it"""
+    try:
+        fd = _os.open('/proc/{}/stat'.format(pid), _os.O_RDONLY | _O_CLOEXEC)
+    except OSError as err:
+        if err.errno not in _GONE + _DENIED:
+            raise
+        return None
+    try:
+        return _parse_stat(_os.read(fd, _READ_SIZE))[2]
+    except OSError as err:
+        if err.errno not in _GONE + _DENIED:
+            raise
+        return None
+    finally:
+        _os.close(fd)
+
+
+class ProcessInfoCache(object):
+    """A bounded, thread safe cache of pid -> ProcessInfo
+
+    Looking up a pid that was read or validated less than ttl seconds ago
+    costs no syscalls. Older entries are revalidated by comparing the start
+    time of the process currently using the pid with the cached one, so a
+    pid that has been reused by a new process is read again rather than
+    returning the information of the old one. Entries for processes that
+    have exited are kept until they are evicted, so events from short lived
+    processes can still be attributed if the process was seen before it
+    exited
+
+    The least recently used entry is evicted once maxsize pids are cached
+    """
+    def __init__(self, maxsize=1024, ttl=1.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # pid -> (ProcessInfo, time validated)
+        self._cache = _OrderedDict()
+        self._lock = _threading.Lock()
+
+    def get(self, pid):
+        """Return the ProcessInfo for pid or None if the process does not
+        exist (and was not cached)"""
+        return self.get_many([pid])[0]
+
+    def get_many(self, pids):
+        """Return the ProcessInfo for each pid in pids, reading all the pids
+        not in the cache in one pass"""
+        now = _monotonic()
+        results = [None] * len(pids)
+        stale = []
+        cache = self._cache
+
+        with self._lock:
+            for i, pid in enumerate(pids):
+                entry = cache.get(pid)
+                if entry is not None and now - entry[1] < self.ttl:
+                    _move_to_end(cache, pid)
+                    results[i] = entry[0]
+                    self.hits += 1
+                else:
+                    stale.append((i, entry))
+
+        if not stale:
+            return results
+
+        # /proc is read without holding the lock, the counters are updated
+        # with the results once we have it again
+        hits = misses = 0
+        read = {}
+        for i, entry in stale:
+            pid = pids[i]
+            if pid in read:
+                results[i] = read[pid]
+                continue
+            info = None
+            if entry is not None:
+                start_time = read_start_time(pid)
+                if start_time is None or start_time == entry[0].start_time:
+                    # the same process (or it has exited since we saw it)
+                    info = entry[0]
+                    hits += 1
+            if info is None:
+                info = read_process_info(pid)
+                misses += 1
+            read[pid] = results[i] = info
+
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+            for pid, info in read.items():
+                if info is None:
+                    cache.pop(pid, None)
+                    continue
+                cache[pid] = (info, now)
+                _move_to_end(cache, pid)
+            while len(cache) > self.maxsize:
+                cache.popitem(last=False)
+
+        return results
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def __len__(self):
+        return len(self._cache)
+
+
+# The cache used by FanotifyEvent.process and Signal.process
+default_cache = ProcessInfoCache()
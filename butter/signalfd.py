@@ -10,6 +10,7 @@ from ._signalfd import signalfd, pthread_sigmask
 from ._signalfd import signum_to_signame
 from ._signalfd_c import ffi as _ffi
 from ._signalfd_c import lib as _lib
+from . import procinfo as _procinfo
 import os as _os
 
 
@@ -98,6 +99,8 @@ class Signal(object):
     
     Ommited mappings are ones that deal with traps and SIGQUEUE
     """
+    _process = None
+
     def __init__(self, siginfo):
         self._siginfo = siginfo
 
@@ -116,6 +119,14 @@ class Signal(object):
         """PID of the sender of the signal"""
         return self._siginfo.ssi_pid
 
+    @property
+    def process(self):
+        """The ProcessInfo of the sender of the signal (see butter.procinfo),
+        or None if it has exited and was not cached"""
+        if self._process is None:
+            self._process = _procinfo.default_cache.get(self.pid)
+        return self._process
+
     @property
     def uid(self):
         """UID of the sender of the signal"""
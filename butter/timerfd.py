@@ -3,7 +3,11 @@
 
 from .utils import Eventlike as _Eventlike
 from .utils import CLOEXEC_DEFAULT as _CLOEXEC_DEFAULT
+from .utils import LatencyHistogram
+from .utils import monotonic_ns as _monotonic_ns
+from .utils import clock_gettime_ns as _clock_gettime_ns
 from ._timerfd import TimerVal, timerfd, timerfd_gettime, timerfd_settime
+from ._timerfd import timerfd_settime_ns, timerfd_remaining_ns, timerfd_settime_many
 from ._timerfd import TFD_CLOEXEC, TFD_NONBLOCK, TFD_TIMER_ABSTIME
 
 from ._timerfd import CLOCK_BOOTTIME, CLOCK_PROCESS_CPUTIME_ID, CLOCK_THREAD_CPUTIME_ID
@@ -12,6 +16,9 @@ from ._timerfd import CLOCK_REALTIME, CLOCK_REALTIME_COARSE
 from ._timerfd import CLOCK_REALTIME_ALARM, CLOCK_BOOTTIME_ALARM
 
 from ._timerfd import ffi as _ffi
+from collections import namedtuple as _namedtuple
+from select import select as _select
+from errno import EAGAIN as _EAGAIN
 import os as _os
 
 
@@ -43,6 +50,9 @@ class Timer(_Eventlike, TimerVal):
     near 0% cpu overhead. Using the timer in this manner is refered to as an 'interval
     timer'
     """
+    # scratch space for remaining_ns(), allocated on first use
+    _current = None
+
     def __init__(self, clock_type=CLOCK_MONOTONIC, flags=0, closefd=_CLOEXEC_DEFAULT):
         """Create a new Timerfd object
 
@@ -71,7 +81,7 @@ class Timer(_Eventlike, TimerVal):
         """
         return timerfd_gettime(self.fileno())
 
-    def update(self, absolute=False):
+    def update(self, absolute=False, old=True):
         """Update the kernel with the current values for the timer
         
         Arguments
@@ -79,16 +89,51 @@ class Timer(_Eventlike, TimerVal):
         :param bool absolute: Determines if the values in the timer should be considered absolute
         (seconds since UNIX epoch) or if they should be added to the current time to determine
         when the next event occurs
+        :param bool old: Fetch the old value of the timer, pass False to skip it
         
         Returns
         --------
-        :return: The old timer value
+        :return: The old timer value (None if old is False)
         :rtype: TimerVal
         """
         flags = TFD_TIMER_ABSTIME if absolute else 0
-        old_timer = timerfd_settime(self.fileno(), self._timerspec, flags)
+        old_timer = timerfd_settime(self.fileno(), self._timerspec, flags, old)
         
         return old_timer
+
+    def set_ns(self, value_ns, interval_ns=0, absolute=False):
+        """Set and arm the timer in a single call
+
+        A fast path for timers that are rearmed often, the timer's own
+        itimerspec is filled in C and handed to the kernel without
+        fetching the old value. Equivalent to
+        every(nano_seconds=interval_ns).after(nano_seconds=value_ns).update(absolute)
+
+        Arguments
+        ---------
+        :param int value_ns: Nanoseconds until the timer first expires (or
+                             the absolute clock time if absolute), 0 disarms it
+        :param int interval_ns: Nanoseconds between expirations after the first
+        :param bool absolute: value_ns is a time on the timer's clock
+        """
+        flags = TFD_TIMER_ABSTIME if absolute else 0
+        timerfd_settime_ns(self.fileno(), value_ns, interval_ns, flags, self._timerspec)
+
+    def set(self, value, interval=0.0, absolute=False):
+        """As set_ns() but taking (float) seconds"""
+        self.set_ns(int(value * 1000000000), int(interval * 1000000000), absolute)
+
+    def remaining_ns(self):
+        """Return the nanoseconds until the timer next expires, 0 if it is
+        disarmed. Reuses a per timer itimerspec rather than building a
+        TimerVal like get_current()"""
+        if self._current is None:
+            self._current = _ffi.new('struct itimerspec *')
+        return timerfd_remaining_ns(self.fileno(), self._current)
+
+    def remaining(self):
+        """As remaining_ns() but returning (float) seconds"""
+        return self.remaining_ns() / 1e9
     
     def _read_events(self):
         data = _os.read(self.fileno(), 8)
@@ -107,3 +152,368 @@ class Timer(_Eventlike, TimerVal):
                                                                            self._timerspec.it_interval.tv_sec,
                                                                            self._timerspec.it_interval.tv_nsec)
 
+
+# PeriodicScheduler policies for ticks missed while the caller was busy
+CATCH_UP = 'catch_up'
+SKIP = 'skip'
+
+Tick = _namedtuple('Tick', 'index deadline_ns lateness_ns missed')
+class Tick(Tick):
+    """A tick run by a PeriodicScheduler
+
+    index: The number of periods since the scheduler started (0 is the first)
+    deadline_ns: When the tick was due, on the scheduler's clock
+    lateness_ns: How long after its deadline the tick was run
+    missed: The amount of ticks skipped to get to this one (SKIP policy)
+    """
+    __slots__ = []
+
+
+class TimeoutHandle(object):
+    """A timeout scheduled on a TimerWheel, see TimerWheel.schedule()"""
+    __slots__ = ['expires', 'callback', 'args', '_slot', '_wheel']
+
+    def __init__(self, wheel, expires, callback, args):
+        self._wheel = wheel
+        # the tick the timeout expires on
+        self.expires = expires
+        self.callback = callback
+        self.args = args
+        self._slot = None
+
+    @property
+    def active(self):
+        """True until the timeout expires or is cancelled"""
+        return self._slot is not None
+
+    def cancel(self):
+        """Cancel the timeout, returns False if it had already expired or
+        been cancelled"""
+        return self._wheel.cancel(self)
+
+    def __repr__(self):
+        return "<{} expires={} active={}>".format(self.__class__.__name__, self.expires, self.active)
+
+
+class TimerWheel(_Eventlike):
+    """Multiplex many timeouts onto a single timerfd
+
+    Timeouts are kept in a hierarchical timing wheel (4 levels of 256
+    slots) so scheduling and cancelling are O(1) whatever the amount of
+    timeouts. The timer is armed for the next tick that holds expiring
+    timeouts (or needs timeouts moved down a level), when it fires every
+    timeout due is expired in one go
+
+    Timeouts are rounded up to the next tick of 'resolution' seconds and
+    so never expire early. Timeouts further than 2**32 ticks ahead (~50
+    days at the default 1ms) are parked at the far end of the wheel and
+    rescheduled as it turns
+
+    read_events() returns the TimeoutHandles that expired, calling their
+    callbacks first. The fd (see fileno()) can be passed to select/epoll
+
+    >>> wheel = TimerWheel()
+    >>> handle = wheel.schedule(0.5, print, "half a second")
+    >>> handle.cancel()
+    True
+    >>> handle = wheel.schedule(1.0, print, "a second")
+    >>> expired = wheel.read_events()
+    a second
+    """
+    BITS = 8
+    SLOTS = 1 << BITS
+    LEVELS = 4
+
+    def __init__(self, resolution=0.001, flags=0, closefd=_CLOEXEC_DEFAULT):
+        """Create a new TimerWheel
+
+        Arguments
+        ----------
+        :param float resolution: The length of a tick in seconds
+        :param int flags: TFD_NONBLOCK to make read_events() return [] rather
+                          than waiting for a timeout to expire
+        """
+        super(TimerWheel, self).__init__()
+        self._timer = Timer(CLOCK_MONOTONIC, flags | TFD_NONBLOCK, closefd=closefd)
+        self._fd = self._timer.fileno()
+        self._blocking = not flags & TFD_NONBLOCK
+
+        self._tick_ns = max(int(resolution * 1000000000), 1)
+        self._origin = _monotonic_ns()
+        # the next tick to be processed
+        self._tick = 0
+        self._slots = [[{} for i in range(self.SLOTS)] for level in range(self.LEVELS)]
+        # bit n of _occupied[level] is set when _slots[level][n] is not empty
+        self._occupied = [0] * self.LEVELS
+        self._armed = None
+        self._count = 0
+
+    def __len__(self):
+        """The amount of active timeouts"""
+        return self._count
+
+    def now(self):
+        """The current tick"""
+        return (_monotonic_ns() - self._origin) // self._tick_ns
+
+    def schedule(self, delay, callback=None, *args):
+        """Expire a timeout after delay seconds
+
+        Arguments
+        ----------
+        :param float delay: Seconds from now the timeout expires
+        :param callback: Called as callback(*args) when the timeout expires
+
+        Returns
+        --------
+        :return: A handle that can be used to cancel the timeout
+        :rtype: TimeoutHandle
+        """
+        delay_ns = int(delay * 1000000000)
+        # round up so a timeout never expires early
+        expires = -(-(_monotonic_ns() - self._origin + delay_ns) // self._tick_ns)
+        handle = TimeoutHandle(self, max(expires, self._tick), callback, args)
+        tick = self._insert(handle)
+        self._count += 1
+        # only touch the timer if this timeout needs it to fire sooner
+        if self._armed is None or tick < self._armed:
+            self._arm(tick)
+        return handle
+
+    def cancel(self, handle):
+        """Cancel a timeout, returns False if it had already expired or been
+        cancelled"""
+        slot = handle._slot
+        if slot is None:
+            return False
+        level, index, entries = slot
+        del entries[handle]
+        if not entries:
+            self._occupied[level] &= ~(1 << index)
+        handle._slot = None
+        self._count -= 1
+        # the timer is left armed, an early wakeup is cheaper than rearming
+        return True
+
+    def _insert(self, handle):
+        """Add handle to the wheel, returning the tick its slot is processed on"""
+        expires = handle.expires
+        delta = expires - self._tick
+        bits = self.BITS
+        for level in range(self.LEVELS):
+            if delta < 1 << (bits * (level + 1)):
+                break
+        else:
+            # park it as far out as the wheel reaches
+            expires = self._tick + (1 << (bits * self.LEVELS)) - 1
+        shift = bits * level
+        index = (expires >> shift) & (self.SLOTS - 1)
+        entries = self._slots[level][index]
+        entries[handle] = None
+        self._occupied[level] |= 1 << index
+        handle._slot = (level, index, entries)
+        return (expires >> shift) << shift
+
+    def _next_tick(self):
+        """The next tick something needs to happen on, or None"""
+        best = None
+        mask = self.SLOTS - 1
+        for level in range(self.LEVELS):
+            occupied = self._occupied[level]
+            if not occupied:
+                continue
+            shift = self.BITS * level
+            # the first tick on or after _tick at which this level is processed
+            start = -(-self._tick >> shift)
+            position = start & mask
+            rotated = ((occupied >> position) | (occupied << (self.SLOTS - position))) & ((1 << self.SLOTS) - 1)
+            tick = (start + (rotated & -rotated).bit_length() - 1) << shift
+            if best is None or tick < best:
+                best = tick
+        return best
+
+    def _advance(self, now):
+        """Process every tick up to and including now, returning the expired
+        handles"""
+        expired = []
+        mask = self.SLOTS - 1
+        while True:
+            tick = self._next_tick()
+            if tick is None or tick > now:
+                break
+            self._tick = tick
+
+            for level in range(1, self.LEVELS):
+                shift = self.BITS * level
+                if tick & ((1 << shift) - 1):
+                    break
+                index = (tick >> shift) & mask
+                entries = self._slots[level][index]
+                if entries:
+                    self._slots[level][index] = {}
+                    self._occupied[level] &= ~(1 << index)
+                    for handle in entries:
+                        self._insert(handle)
+
+            index = tick & mask
+            entries = self._slots[0][index]
+            if entries:
+                self._slots[0][index] = {}
+                self._occupied[0] &= ~(1 << index)
+                for handle in entries:
+                    handle._slot = None
+                expired.extend(entries)
+            self._tick = tick + 1
+
+        self._tick = max(self._tick, now + 1)
+        self._count -= len(expired)
+        return expired
+
+    def _arm(self, tick):
+        if tick == self._armed:
+            return
+        self._armed = tick
+        if tick is None:
+            self._timer.set_ns(0)
+        else:
+            # an absolute time of exactly 0 would disarm the timer
+            self._timer.set_ns(max(self._origin + tick * self._tick_ns, 1), absolute=True)
+
+    def _read_events(self):
+        while True:
+            if self._blocking and self._count:
+                _select([self._timer], [], [])
+            try:
+                _os.read(self._fd, 8)
+            except OSError as err:
+                if err.errno != _EAGAIN:
+                    raise
+            self._armed = None
+
+            expired = self._advance(self.now())
+            self._arm(self._next_tick())
+            for handle in expired:
+                if handle.callback is not None:
+                    handle.callback(*handle.args)
+
+            # blocking callers expect at least one expired timeout
+            if expired or not self._blocking or not self._count:
+                return expired
+
+    def close(self):
+        self._timer.close()
+        self._fd = None
+
+
+class PeriodicScheduler(_Eventlike):
+    """Run a callback every period seconds without drift
+
+    The timer is armed once with an absolute first deadline and an
+    interval so the kernel computes every deadline as start + n * period,
+    time spent in callbacks or waiting to be scheduled never pushes later
+    ticks back. When the caller falls behind the kernel's expiration count
+    says by how many ticks, the policy then decides what happens to them:
+
+    CATCH_UP: Run every missed tick, oldest first, until back on schedule
+    SKIP: Run only the latest tick, reporting how many were skipped in
+          Tick.missed and the missed counter
+
+    How late each tick is run is recorded in the 'lateness' LatencyHistogram
+
+    read_events() waits for the next tick(s) and returns the Ticks run,
+    calling the callback with each Tick first
+
+    >>> scheduler = PeriodicScheduler(0.1, sample, policy=SKIP)
+    >>> for i in range(100):
+    ...     scheduler.read_events()
+    >>> scheduler.lateness.percentile(99)
+    """
+    def __init__(self, period, callback=None, policy=SKIP, start_ns=None,
+                 clock_type=CLOCK_MONOTONIC, flags=0, closefd=_CLOEXEC_DEFAULT):
+        """Create and start a new PeriodicScheduler
+
+        Arguments
+        ----------
+        :param float period: Seconds between ticks
+        :param callback: Called as callback(tick) for each Tick run
+        :param str policy: CATCH_UP or SKIP, what to do with missed ticks
+        :param int start_ns: The deadline of the first tick on clock_type,
+                             defaults to one period from now
+        :param int clock_type: The clock deadlines are measured on
+        :param int flags: TFD_NONBLOCK to make read_events() return [] if no
+                          tick is due
+        """
+        super(PeriodicScheduler, self).__init__()
+        if policy not in (CATCH_UP, SKIP):
+            raise ValueError("policy must be CATCH_UP or SKIP")
+        self.period_ns = int(period * 1000000000)
+        if self.period_ns <= 0:
+            raise ValueError("period must be positive")
+        self.callback = callback
+        self.policy = policy
+        self._clock = clock_type
+
+        self.lateness = LatencyHistogram()
+        # ticks run, ticks dropped by SKIP, and reads that found more than one tick due
+        self.ticks = 0
+        self.missed = 0
+        self.overruns = 0
+
+        if start_ns is None:
+            start_ns = _clock_gettime_ns(clock_type) + self.period_ns
+        self.start_ns = start_ns
+        # index of the next tick to run
+        self._next = 0
+
+        self._timer = Timer(clock_type, flags, closefd=closefd)
+        self._fd = self._timer.fileno()
+        self._timer.set_ns(start_ns, self.period_ns, absolute=True)
+
+    def deadline_ns(self, index):
+        """The deadline of tick index on the scheduler's clock"""
+        return self.start_ns + index * self.period_ns
+
+    def _read_events(self):
+        try:
+            data = _os.read(self._fd, 8)
+        except OSError as err:
+            if err.errno != _EAGAIN:
+                raise
+            return []
+        value = _ffi.new('uint64_t[1]')
+        _ffi.buffer(value, 8)[0:8] = data
+        expirations = value[0]
+
+        first = self._next
+        self._next += expirations
+        if expirations > 1:
+            self.overruns += 1
+
+        if self.policy == SKIP:
+            missed = expirations - 1
+            self.missed += missed
+            first = self._next - 1
+        else:
+            missed = 0
+
+        ticks = []
+        for index in range(first, self._next):
+            deadline = self.deadline_ns(index)
+            lateness = _clock_gettime_ns(self._clock) - deadline
+            self.lateness.record(lateness)
+            tick = Tick(index, deadline, lateness, missed)
+            ticks.append(tick)
+            self.ticks += 1
+            if self.callback is not None:
+                self.callback(tick)
+
+        return ticks
+
+    def close(self):
+        self._timer.close()
+        self._fd = None
+
+    def __repr__(self):
+        fd = "closed" if self.closed() else self.fileno()
+        return "<{} fd={} period={}ns policy={} ticks={} missed={}>".format(
+            self.__class__.__name__, fd, self.period_ns, self.policy, self.ticks, self.missed)
@@ -2,10 +2,14 @@
 
 from select import select as _select
 from os import close as _close
-from collections import deque
+from collections import deque, OrderedDict
+from struct import Struct
+from stat import S_ISDIR
 import fcntl
 import array
 import errno
+import sys
+import os
 
 import platform
 
@@ -26,6 +30,123 @@ else:
 PermissionError = PermissionError
 TimeoutError = TimeoutError
 
+# Backports of the parts of the python 3 standard library used by butter for
+# python 2 and the python 3 releases that predate them
+try:
+    from time import monotonic_ns, time_ns, clock_gettime_ns
+except ImportError:
+    def clock_gettime_ns(clock_id):
+        """time.clock_gettime_ns(), new in python 3.7"""
+        ns = lib.clock_gettime_ns(clock_id)
+        if ns < 0:
+            raise ValueError("Invalid clock id")
+        return ns
+
+    def monotonic_ns():
+        """time.monotonic_ns(), new in python 3.7"""
+        return lib.clock_gettime_ns(lib.CLOCK_MONOTONIC)
+
+    def time_ns():
+        """time.time_ns(), new in python 3.7"""
+        return lib.clock_gettime_ns(lib.CLOCK_REALTIME)
+
+try:
+    from time import monotonic
+except ImportError:
+    def monotonic():
+        """time.monotonic(), new in python 3.3"""
+        return monotonic_ns() / 1e9
+
+try:
+    from os import fsencode, fsdecode
+except ImportError:
+    # python 2 paths are byte strings already
+    def fsencode(path):
+        if isinstance(path, unicode):
+            return path.encode(sys.getfilesystemencoding())
+        return path
+
+    def fsdecode(path):
+        return path
+
+try:
+    from os import readv
+except ImportError:
+    def readv(fd, buffers):
+        """os.readv(), new in python 3.3. A single read() copied into the buffers"""
+        data = os.read(fd, sum(len(buf) for buf in buffers))
+        offset = 0
+        for buf in buffers:
+            chunk = data[offset:offset + len(buf)]
+            buf[:len(chunk)] = chunk
+            offset += len(chunk)
+        return len(data)
+
+try:
+    from os import pread
+except ImportError:
+    def pread(fd, n, offset):
+        """os.pread(), new in python 3.3. Moves the file offset of fd"""
+        os.lseek(fd, offset, os.SEEK_SET)
+        return os.read(fd, n)
+
+try:
+    from os import scandir
+except ImportError:
+    class _DirEntry(object):
+        __slots__ = ['name', 'path', '_lstat']
+
+        def __init__(self, dirpath, name):
+            self.name = name
+            self.path = os.path.join(dirpath, name)
+            self._lstat = None
+
+        def stat(self, follow_symlinks=True):
+            if follow_symlinks:
+                return os.stat(self.path)
+            if self._lstat is None:
+                self._lstat = os.lstat(self.path)
+            return self._lstat
+
+        def is_dir(self, follow_symlinks=True):
+            return S_ISDIR(self.stat(follow_symlinks).st_mode)
+
+    def scandir(path):
+        """os.scandir(), new in python 3.5, built on listdir() and lstat()"""
+        return iter([_DirEntry(path, name) for name in os.listdir(path)])
+
+if hasattr(os.stat_result, 'st_mtime_ns'):
+    def mtime_ns(st):
+        return st.st_mtime_ns
+
+    def ctime_ns(st):
+        return st.st_ctime_ns
+else:
+    # stat_result.st_*time_ns are new in python 3.3
+    def mtime_ns(st):
+        return int(st.st_mtime * 1000000000)
+
+    def ctime_ns(st):
+        return int(st.st_ctime * 1000000000)
+
+# os.rename() replaces the destination atomically on linux
+replace = getattr(os, 'replace', os.rename)
+O_CLOEXEC = getattr(os, 'O_CLOEXEC', 0o2000000)
+
+if hasattr(Struct, 'iter_unpack'):
+    iter_unpack = Struct.iter_unpack
+else:
+    def iter_unpack(struct, buf):
+        """Struct.iter_unpack(), new in python 3.4"""
+        return (struct.unpack_from(buf, offset) for offset in range(0, len(buf), struct.size))
+
+if hasattr(OrderedDict, 'move_to_end'):
+    move_to_end = OrderedDict.move_to_end
+else:
+    def move_to_end(odict, key):
+        """OrderedDict.move_to_end(), new in python 3.2"""
+        odict[key] = odict.pop(key)
+
 class InternalError(Exception):
     """This Error occured due to an internal bug or OS misconfiguration"""
 
@@ -43,6 +164,68 @@ def get_buffered_length(fd):
     buf = array.array("I", [0])
     fcntl.ioctl(fd, lib.FIONREAD, buf)
     return buf[0]
+
+
+class LatencyHistogram(object):
+    """Histogram of durations in nanoseconds
+
+    Values are counted in power of 2 buckets (bucket n holds values in
+    [2**(n-1), 2**n)) so recording is cheap and the memory used is fixed,
+    percentiles are reported as the upper bound of their bucket and so are
+    accurate to within a factor of 2
+    """
+    BUCKETS = 64
+
+    def __init__(self):
+        self.reset()
+
+    def record(self, ns):
+        """Add a single duration (int nanoseconds), negative values count as 0"""
+        if ns < 0:
+            ns = 0
+        self._buckets[min(ns.bit_length(), self.BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def record_many(self, values):
+        for ns in values:
+            self.record(ns)
+
+    @property
+    def mean(self):
+        return float(self.total) / self.count if self.count else 0.0
+
+    def percentile(self, p):
+        """Return an upper bound (ns) on the p'th percentile, eg 99.9
+
+        Returns 0 if no values have been recorded
+        """
+        if self.count == 0:
+            return 0
+        rank = max(1, -(-self.count * p // 100))
+        seen = 0
+        for bucket, count in enumerate(self._buckets):
+            seen += count
+            if seen >= rank:
+                return min((1 << bucket) - 1, self.max) if bucket else 0
+        return self.max
+
+    def buckets(self):
+        """Return (upper bound ns, count) for each non empty bucket"""
+        return [(((1 << bucket) - 1) if bucket else 0, count)
+                for bucket, count in enumerate(self._buckets) if count]
+
+    def reset(self):
+        self._buckets = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def __repr__(self):
+        return "<{} count={} mean={:.0f}ns p99={}ns max={}ns>".format(
+                self.__class__.__name__, self.count, self.mean, self.percentile(99), self.max)
             
 
 class Eventlike(object):
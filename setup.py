@@ -120,7 +120,10 @@ setup(
     zip_safe = False,
     ext_package = name,
     setup_requires = ['cffi>=1.0.0'],
-    install_requires = ['cffi>=1.0.0'],
+    install_requires = ['cffi>=1.0.0',
+                        # backports of the stdlib modules used on python 2
+                        'enum34; python_version < "3.4"',
+                        'futures; python_version < "3.2"'],
     cffi_modules = ext_modules,
     tests_require = ['tox', 'pytest', 'pytest-cov', 'pytest-mock', 'mock'],
     cmdclass = {'test': PyTest},
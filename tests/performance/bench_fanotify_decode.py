@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+"""Compare the C fanotify metadata decoder against the original pure python
+decoder that cast a copy of the read buffer for every event
+
+Run against an installed (or in place built) copy of butter:
+
+    > python tests/performance/bench_fanotify_decode.py [events]
+"""
+from butter._fanotify import ffi, str_to_events, buffer_to_batch, FanotifyEvent
+from butter._fanotify import EVENT_STRUCT_SIZE, FAN_MODIFY
+from timeit import repeat
+import struct
+import sys
+
+
+def str_to_events_py(str):
+    """The decoder butter shipped before the C decoder was introduced"""
+    event_struct_size = ffi.sizeof('struct fanotify_event_metadata')
+
+    events = []
+
+    str_buf = ffi.new('char[]', len(str))
+    str_buf[0:len(str)] = str
+
+    i = 0
+    while i < len(str_buf):
+        event = ffi.cast('struct fanotify_event_metadata *', str_buf[i:i+event_struct_size])
+        events.append(FanotifyEvent(event.vers, event.mask, event.fd, event.pid))
+
+        i += event.event_len
+
+    return events
+
+
+def make_buffer(count):
+    return b''.join(struct.pack('IBBHQii', EVENT_STRUCT_SIZE, 3, 0, EVENT_STRUCT_SIZE,
+                                FAN_MODIFY, i + 100, i % 50 + 1)
+                    for i in range(count))
+
+
+def main(count=5000, rounds=5, loops=10):
+    buf = make_buffer(count)
+    expected = [(e.mask, e.fd, e.pid) for e in str_to_events_py(buf)]
+    assert [(e.mask, e.fd, e.pid) for e in str_to_events(buf)] == expected, "decoders disagree"
+    assert buffer_to_batch(buf).records() == expected, "decoders disagree"
+
+    for name, func in (('python', str_to_events_py), ('c', str_to_events),
+                       ('c batch', lambda buf: buffer_to_batch(buf).records())):
+        best = min(repeat(lambda: func(buf), number=loops, repeat=rounds)) / loops
+        print("{:>8}: {:8.3f}ms per batch of {} events ({:.0f} events/s)".format(
+              name, best * 1000, count, count / best))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
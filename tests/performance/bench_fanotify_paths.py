@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+"""Compare resolving event fds to paths with PathResolver against the
+readlink('/proc/<pid>/fd/<n>') per event FanotifyEvent.filename used to do
+
+Run against an installed (or in place built) copy of butter:
+
+    > python tests/performance/bench_fanotify_paths.py [fds] [files]
+"""
+from butter._fanotify import PathResolver
+from tempfile import TemporaryDirectory
+from os.path import join
+from timeit import repeat
+import os
+import sys
+
+
+def resolve_py(fds):
+    """The per event resolution butter shipped before PathResolver"""
+    paths = []
+    for fd in fds:
+        try:
+            paths.append(os.readlink(join('/proc', str(os.getpid()), 'fd', str(fd))))
+        except OSError:
+            paths.append("<Unknown>")
+    return paths
+
+
+def main(count=1000, files=50, rounds=5, loops=10):
+    with TemporaryDirectory() as tmp_dir:
+        names = [join(tmp_dir, 'file-{}'.format(i)) for i in range(files)]
+        # like a batch of events, many fds against a few hot files
+        fds = [os.open(names[i % files], os.O_CREAT | os.O_RDONLY) for i in range(count)]
+        try:
+            resolver = PathResolver()
+            # what FanotifyEventBatch.resolve_paths() does without a resolver
+            uncached = lambda: resolver.readlink(fds)
+            cold = lambda: PathResolver().resolve(fds)
+            warm = lambda: resolver.resolve(fds)
+            assert [os.fsdecode(path) for path in cold()] == resolve_py(fds), "resolvers disagree"
+
+            for name, func in (('readlink', lambda: resolve_py(fds)), ('uncached', uncached),
+                               ('cold', cold), ('cached', warm)):
+                best = min(repeat(func, number=loops, repeat=rounds)) / loops
+                print("{:>8}: {:8.3f}ms per batch of {} fds ({:.0f} fds/s)".format(
+                      name, best * 1000, count, count / best))
+        finally:
+            for fd in fds:
+                os.close(fd)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
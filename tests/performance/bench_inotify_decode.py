@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""Compare the C inotify event decoder against the original pure python
+decoder that sliced and cast a copy of the read buffer for every event
+
+Run against an installed (or in place built) copy of butter:
+
+    > python tests/performance/bench_inotify_decode.py [events]
+"""
+from butter._inotify import ffi, str_to_events, InotifyEvent, IN_MODIFY
+from timeit import repeat
+import struct
+import sys
+
+
+def str_to_events_py(str):
+    """The decoder butter shipped before the C decoder was introduced"""
+    event_struct_size = ffi.sizeof('struct inotify_event')
+
+    events = []
+
+    str_buf = ffi.new('char[]', len(str))
+    str_buf[0:len(str)] = str
+
+    i = 0
+    while i < len(str_buf):
+        event = ffi.cast('struct inotify_event *', str_buf[i:i+event_struct_size])
+
+        filename_start = i + event_struct_size
+        filename_end = filename_start + event.len
+        filename = ffi.string(str_buf[filename_start:filename_end])
+
+        events.append(InotifyEvent(event.wd, event.mask, event.cookie, filename))
+
+        i += event_struct_size + event.len
+
+    return events
+
+
+def make_buffer(count):
+    """Build a buffer the same shape as the kernel would return, names are
+    NUL padded to a multiple of the event struct size"""
+    records = []
+    for i in range(count):
+        name = 'file-{}.txt'.format(i).encode()
+        padded_len = (len(name) // 16 + 1) * 16
+        records.append(struct.pack('iIII', i % 64 + 1, IN_MODIFY, 0, padded_len))
+        records.append(name.ljust(padded_len, b'\0'))
+    return b''.join(records)
+
+
+def main(count=5000, rounds=5, loops=10):
+    buf = make_buffer(count)
+    assert str_to_events(buf) == str_to_events_py(buf), "decoders disagree"
+
+    for name, func in (('python', str_to_events_py), ('c', str_to_events)):
+        best = min(repeat(lambda: func(buf), number=loops, repeat=rounds)) / loops
+        print("{:>8}: {:8.3f}ms per batch of {} events ({:.0f} events/s)".format(
+              name, best * 1000, count, count / best))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
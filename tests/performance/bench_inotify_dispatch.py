@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""Compare dispatching events via the precomputed EventKind table against
+the chain of is_*_event properties on InotifyEvent
+
+Run against an installed (or in place built) copy of butter:
+
+    > python tests/performance/bench_inotify_dispatch.py [events]
+"""
+from butter._inotify import InotifyEvent, EventKind, dispatch
+from butter._inotify import IN_CREATE, IN_MODIFY, IN_DELETE, IN_CLOSE_WRITE, IN_ISDIR
+from timeit import repeat
+import sys
+
+
+def dispatch_py(events, on_create, on_modify, on_delete, on_close):
+    """Dispatch as callers did before EventKind existed"""
+    for event in events:
+        if event.create_event:
+            on_create(event)
+        elif event.modify_event:
+            on_modify(event)
+        elif event.delete_event:
+            on_delete(event)
+        elif event.close_write_event:
+            on_close(event)
+
+
+def make_events(count):
+    masks = [IN_CREATE, IN_MODIFY, IN_MODIFY, IN_DELETE|IN_ISDIR, IN_CLOSE_WRITE]
+    return [InotifyEvent(1, masks[i % len(masks)], 0, b'file') for i in range(count)]
+
+
+def main(count=10000, rounds=5, loops=10):
+    events = make_events(count)
+    counts = [0] * len(EventKind)
+
+    def counter(kind):
+        def handler(event):
+            counts[kind] += 1
+        return handler
+    
+    handlers = {kind: counter(kind) for kind in (EventKind.CREATE, EventKind.MODIFY,
+                                                  EventKind.DELETE, EventKind.CLOSE_WRITE)}
+    chain = lambda: dispatch_py(events, handlers[EventKind.CREATE], handlers[EventKind.MODIFY],
+                                handlers[EventKind.DELETE], handlers[EventKind.CLOSE_WRITE])
+    table = lambda: dispatch(events, handlers)
+    
+    chain()
+    expected = list(counts)
+    counts[:] = [0] * len(counts)
+    table()
+    assert counts == expected, "dispatchers disagree"
+
+    for name, func in (('property', chain), ('table', table)):
+        best = min(repeat(func, number=loops, repeat=rounds)) / loops
+        print("{:>8}: {:8.3f}ms per batch of {} events ({:.0f} events/s)".format(
+              name, best * 1000, count, count / best))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+"""Compare the drift and lateness of PeriodicScheduler against a loop that
+sleeps for the period after doing its work
+
+Run against an installed (or in place built) copy of butter:
+
+    > python tests/performance/bench_periodic.py [ticks] [period_ms] [work_ms]
+"""
+from butter.timerfd import PeriodicScheduler, SKIP
+from butter.utils import LatencyHistogram, monotonic_ns
+from time import sleep
+import sys
+
+
+def busy(ns):
+    end = monotonic_ns() + ns
+    while monotonic_ns() < end:
+        pass
+
+
+def report(name, lateness, drift):
+    print("{:>10}: p50 {:.3f}ms p99 {:.3f}ms max {:.3f}ms, drift after the last tick {:.3f}ms".format(
+          name, lateness.percentile(50) / 1e6, lateness.percentile(99) / 1e6,
+          lateness.max / 1e6, drift / 1e6))
+
+
+def main(ticks=200, period_ms=5, work_ms=1):
+    period = period_ms * 1000000
+    work = work_ms * 1000000
+
+    # each tick is due one period after the previous one was due
+    lateness = LatencyHistogram()
+    start = monotonic_ns()
+    for i in range(1, ticks + 1):
+        sleep(period / 1e9)
+        now = monotonic_ns()
+        lateness.record(now - (start + i * period))
+        busy(work)
+    report('sleep', lateness, now - (start + ticks * period))
+
+    scheduler = PeriodicScheduler(period / 1e9, lambda tick: busy(work), policy=SKIP)
+    last = None
+    while scheduler.ticks < ticks:
+        last = scheduler.read_events()[-1]
+    report('scheduler', scheduler.lateness, last.lateness_ns)
+    scheduler.close()
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
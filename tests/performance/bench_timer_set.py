@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+"""Compare rearming a Timer with set_ns()/remaining_ns() against the fluent
+every().after().update() and get_current() path
+
+Run against an installed (or in place built) copy of butter:
+
+    > python tests/performance/bench_timer_set.py [calls]
+"""
+from butter.timerfd import Timer
+from timeit import repeat
+import sys
+
+
+def main(count=100000, rounds=5):
+    timer = Timer()
+
+    def fluent():
+        for i in range(count):
+            timer.every(nano_seconds=0).after(seconds=60, nano_seconds=i).update()
+
+    def fast():
+        for i in range(count):
+            timer.set_ns(60000000000 + i)
+
+    def get_current():
+        for i in range(count):
+            timer.get_current().next_event
+
+    def remaining_ns():
+        for i in range(count):
+            timer.remaining_ns()
+
+    for name, func in (('fluent', fluent), ('set_ns', fast),
+                       ('get_current', get_current), ('remaining_ns', remaining_ns)):
+        best = min(repeat(func, number=1, repeat=rounds))
+        print("{:>12}: {:6.0f}ns per call".format(name, best / count * 1e9))
+
+    timer.close()
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
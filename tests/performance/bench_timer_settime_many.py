@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+"""Compare rearming many timers with timerfd_settime_many() against calling
+Timer.update() on each
+
+Run against an installed (or in place built) copy of butter:
+
+    > python tests/performance/bench_timer_settime_many.py [timers]
+"""
+from butter.timerfd import Timer, timerfd_settime_many
+from timeit import repeat
+import sys
+
+
+def main(count=1000, rounds=5):
+    timers = [Timer() for i in range(count)]
+    for i, timer in enumerate(timers):
+        timer.after(seconds=60, nano_seconds=i)
+
+    def update():
+        for timer in timers:
+            timer.update()
+
+    def update_no_old():
+        for timer in timers:
+            timer.update(old=False)
+
+    settings = [(timer, timer, 0) for timer in timers]
+
+    def many():
+        assert not any(timerfd_settime_many(settings))
+
+    for name, func in (('update', update), ('update(old=False)', update_no_old),
+                       ('settime_many', many)):
+        best = min(repeat(func, number=1, repeat=rounds))
+        print("{:>18}: {:8.3f}ms for {} timers ({:.0f}ns per timer)".format(
+              name, best * 1000, count, best / count * 1e9))
+
+    for timer in timers:
+        timer.close()
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
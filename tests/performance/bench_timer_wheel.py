@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""Measure TimerWheel schedule/cancel throughput against one Timer per
+timeout, and how late timeouts fire when many are pending
+
+Run against an installed (or in place built) copy of butter:
+
+    > python tests/performance/bench_timer_wheel.py [timeouts] [fired]
+"""
+from butter.timerfd import Timer, TimerWheel
+from butter.utils import LatencyHistogram, monotonic_ns
+from timeit import default_timer as perf_counter
+import random
+import sys
+
+
+def bench_schedule(count):
+    rand = random.Random(0)
+    delays = [rand.uniform(1, 3600) for i in range(count)]
+
+    wheel = TimerWheel()
+    start = perf_counter()
+    handles = [wheel.schedule(delay) for delay in delays]
+    scheduled = perf_counter() - start
+    start = perf_counter()
+    for handle in handles:
+        handle.cancel()
+    cancelled = perf_counter() - start
+    wheel.close()
+
+    print("{:>14}: {:8.0f} schedule/s {:8.0f} cancel/s ({} timeouts)".format(
+          'wheel', count / scheduled, count / cancelled, count))
+
+    # a timerfd per timeout, as callers did before TimerWheel existed
+    count = min(count, 1000)
+    start = perf_counter()
+    timers = []
+    for delay in delays[:count]:
+        timer = Timer()
+        seconds, nano_seconds = divmod(int(delay * 1000000000), 1000000000)
+        timer.after(seconds, nano_seconds).update()
+        timers.append(timer)
+    scheduled = perf_counter() - start
+    start = perf_counter()
+    for timer in timers:
+        timer.disable().update()
+    cancelled = perf_counter() - start
+    for timer in timers:
+        timer.close()
+
+    print("{:>14}: {:8.0f} schedule/s {:8.0f} cancel/s ({} timeouts)".format(
+          'timer per fd', count / scheduled, count / cancelled, count))
+
+
+def bench_jitter(count, fired):
+    """Keep count timeouts pending in the background while fired of them
+    expire over ~1s, recording how late each one fires"""
+    rand = random.Random(1)
+    wheel = TimerWheel()
+    lateness = LatencyHistogram()
+
+    def expired(deadline):
+        lateness.record(monotonic_ns() - deadline)
+
+    for i in range(count):
+        wheel.schedule(rand.uniform(60, 3600))
+    for i in range(fired):
+        delay = rand.uniform(0.01, 1.0)
+        wheel.schedule(delay, expired, monotonic_ns() + int(delay * 1000000000))
+
+    while lateness.count < fired:
+        wheel.read_events()
+    wheel.close()
+
+    print("{:>14}: p50 {:.3f}ms p99 {:.3f}ms max {:.3f}ms ({} fired, {} pending)".format(
+          'jitter', lateness.percentile(50) / 1e6, lateness.percentile(99) / 1e6,
+          lateness.max / 1e6, fired, count))
+
+
+def main(count=100000, fired=1000):
+    bench_schedule(count)
+    bench_jitter(count, fired)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
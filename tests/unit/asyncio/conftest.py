@@ -0,0 +1,5 @@
+import sys
+
+# async def is a syntax error before python 3.5
+if sys.version_info < (3, 5):
+    collect_ignore = ['test_asyncio_fanotify.py', 'test_asyncio_inotify.py']
@@ -0,0 +1,80 @@
+import pytest
+import sys
+import os
+
+pytestmark = [pytest.mark.skipif(sys.version_info < (3, 5), reason="requires python3.5/async def"),
+              pytest.mark.skipif(os.getuid() != 0, reason="fanotify can only be used by root")]
+
+if sys.version_info >= (3, 5):
+    from butter.asyncio.fanotify import Fanotify_async, QueueEmpty
+    from butter.fanotify import FAN_CLOSE_WRITE, FAN_EVENT_ON_CHILD
+    from tempfile import TemporaryDirectory
+    import asyncio
+
+
+    def _run(coro):
+        # asyncio.run() is python 3.7+
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            loop.close()
+
+
+    def _touch(directory, names):
+        for name in names:
+            open(os.path.join(directory, name), 'w').close()
+
+
+    @pytest.mark.fanotify
+    @pytest.mark.unit
+    def test_async_for():
+        async def consume(tmp_dir):
+            fanotify = Fanotify_async()
+            try:
+                fanotify.watch(tmp_dir, FAN_CLOSE_WRITE|FAN_EVENT_ON_CHILD)
+                with pytest.raises(QueueEmpty):
+                    fanotify.get_event_nowait()
+
+                asyncio.get_event_loop().call_soon(_touch, tmp_dir, ['a', 'b', 'c'])
+                names = []
+                async for event in fanotify:
+                    names.append(os.path.basename(event.filename))
+                    event.close()
+                    if len(names) == 3:
+                        break
+                return names
+            finally:
+                fanotify.close()
+
+        with TemporaryDirectory() as tmp_dir:
+            assert _run(consume(tmp_dir)) == ['a', 'b', 'c']
+
+
+    @pytest.mark.fanotify
+    @pytest.mark.unit
+    def test_get_batch_backpressure():
+        async def consume(tmp_dir):
+            fanotify = Fanotify_async(maxsize=2)
+            try:
+                fanotify.watch(tmp_dir, FAN_CLOSE_WRITE|FAN_EVENT_ON_CHILD)
+                _touch(tmp_dir, [str(i) for i in range(5)])
+
+                await asyncio.sleep(0.05)
+                assert fanotify.paused
+                assert fanotify.qsize() >= 2
+
+                events = await fanotify.get_batch(2)
+                assert len(events) == 2
+                while len(events) < 5:
+                    events.extend(await asyncio.wait_for(fanotify.get_batch(), 1))
+                assert not fanotify.paused
+                names = [os.path.basename(event.filename) for event in events]
+                for event in events:
+                    event.close()
+                return names
+            finally:
+                fanotify.close()
+
+        with TemporaryDirectory() as tmp_dir:
+            assert _run(consume(tmp_dir)) == ['0', '1', '2', '3', '4']
@@ -0,0 +1,108 @@
+import pytest
+import sys
+import os
+
+pytestmark = pytest.mark.skipif(sys.version_info < (3, 5), reason="requires python3.5/async def")
+
+if sys.version_info >= (3, 5):
+    from butter.asyncio.inotify import Inotify_async, QueueEmpty
+    from butter.inotify import IN_CREATE
+    from tempfile import TemporaryDirectory
+    import asyncio
+
+
+    def _run(coro):
+        # asyncio.run() is python 3.7+
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            loop.close()
+
+
+    def _touch(directory, names):
+        for name in names:
+            open(os.path.join(directory, name), 'w').close()
+
+
+    @pytest.mark.inotify
+    @pytest.mark.unit
+    def test_async_for():
+        async def consume(tmp_dir):
+            inotify = Inotify_async()
+            try:
+                wd = inotify.watch(tmp_dir, IN_CREATE)
+                with pytest.raises(QueueEmpty):
+                    inotify.get_event_nowait()
+
+                asyncio.get_event_loop().call_soon(_touch, tmp_dir, ['a', 'b', 'c'])
+                names = []
+                async for event in inotify:
+                    assert event.wd == wd
+                    names.append(event.filename)
+                    if len(names) == 3:
+                        break
+                return names
+            finally:
+                inotify.close()
+
+        with TemporaryDirectory() as tmp_dir:
+            assert _run(consume(tmp_dir)) == [b'a', b'b', b'c']
+
+
+    @pytest.mark.inotify
+    @pytest.mark.unit
+    def test_backpressure():
+        async def consume(tmp_dir):
+            inotify = Inotify_async(maxsize=2)
+            try:
+                inotify.watch(tmp_dir, IN_CREATE)
+                _touch(tmp_dir, [str(i) for i in range(5)])
+
+                # a single callback drains the kernel and then pauses
+                await asyncio.sleep(0.05)
+                assert inotify.paused
+                assert inotify.qsize() >= 2
+
+                names = []
+                while len(names) < 5:
+                    names.append((await asyncio.wait_for(inotify.get_event(), 1)).filename)
+                assert not inotify.paused
+                return names
+            finally:
+                inotify.close()
+
+        with TemporaryDirectory() as tmp_dir:
+            assert _run(consume(tmp_dir)) == [b'0', b'1', b'2', b'3', b'4']
+
+
+    @pytest.mark.inotify
+    @pytest.mark.unit
+    def test_close_while_waiting():
+        async def consume():
+            async for event in inotify:
+                pass
+
+        async def close_waiting(tmp_dir):
+            inotify.watch(tmp_dir, IN_CREATE)
+            loop = asyncio.get_event_loop()
+            getters = [loop.create_task(inotify.get_event()), loop.create_task(consume())]
+            await asyncio.sleep(0.01)
+            assert not any(getter.done() for getter in getters)
+
+            inotify.close()
+            # both are woken rather than waiting forever
+            done, pending = await asyncio.wait(getters, timeout=1)
+            assert not pending
+            assert all(getter.cancelled() for getter in done)
+
+            with pytest.raises(asyncio.CancelledError):
+                await inotify.get_event()
+
+        with TemporaryDirectory() as tmp_dir:
+            loop = asyncio.new_event_loop()
+            try:
+                inotify = Inotify_async(loop=loop)
+                loop.run_until_complete(close_waiting(tmp_dir))
+            finally:
+                loop.close()
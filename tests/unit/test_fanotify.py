@@ -0,0 +1,286 @@
+#!/usr/bin/env python
+
+import pytest
+from butter.fanotify import Fanotify, FanotifyEvent, FanotifyEventBatch, buffer_to_batch, str_to_events
+from butter.fanotify import FAN_CLASS_NOTIF, FAN_MODIFY, FAN_OPEN, FAN_CLOSE_WRITE, FAN_EVENT_ON_CHILD
+from butter.fanotify import FAN_CLASS_CONTENT, FAN_OPEN_PERM, PermissionEngine
+from butter._fanotify import EVENT_STRUCT_SIZE, PathResolver, FdTable
+from butter.utils import fsencode, monotonic
+
+from utils import TemporaryDirectory
+
+from subprocess import Popen
+from select import select
+import threading
+import struct
+import time
+import os
+
+
+def _cat(path):
+    with open(os.devnull, 'wb') as devnull:
+        return Popen(['cat', path], stdout=devnull, stderr=devnull)
+
+
+def _raw_event(mask, fd, pid, vers=3):
+    return struct.pack('IBBHQii', EVENT_STRUCT_SIZE, vers, 0, EVENT_STRUCT_SIZE, mask, fd, pid)
+
+
+def test_str_to_events():
+    buf = _raw_event(FAN_OPEN, 7, 100) + _raw_event(FAN_MODIFY, 8, 101)
+    events = str_to_events(buf)
+    assert [(e.version, e.mask, e.fd, e.pid) for e in events] == [(3, FAN_OPEN, 7, 100), (3, FAN_MODIFY, 8, 101)]
+
+    # truncated and malformed records end decoding
+    assert len(str_to_events(buf[:-1])) == 1
+    assert str_to_events(struct.pack('IBBHQii', 4, 3, 0, 4, FAN_OPEN, 7, 1) + buf) == []
+    assert str_to_events(b'') == []
+
+
+def test_batch_lazy():
+    batch = buffer_to_batch(_raw_event(FAN_OPEN, 7, 100) + _raw_event(FAN_MODIFY, 8, 101))
+    assert len(batch) == 2
+    assert batch.records() == [(FAN_OPEN, 7, 100), (FAN_MODIFY, 8, 101)]
+    assert batch.masks == [FAN_OPEN, FAN_MODIFY]
+    assert batch.fds == [7, 8]
+    assert batch.pids == [100, 101]
+    assert batch._events is None, "events created before they were accessed"
+
+    event = batch[-1]
+    assert isinstance(event, FanotifyEvent) and event.fd == 8
+    assert batch[1] is event
+    assert batch._events[0] is None
+
+
+def test_path_resolver():
+    with TemporaryDirectory() as tmp_dir:
+        names = [os.path.join(tmp_dir, name) for name in 'abc']
+        fds = [os.open(name, os.O_CREAT | os.O_RDONLY) for name in names]
+        # a second fd against the same file is served from the cache
+        fds.append(os.open(names[0], os.O_RDONLY))
+        try:
+            resolver = PathResolver(maxsize=2)
+            paths = resolver.resolve(fds + [-1])
+            assert paths == [fsencode(name) for name in names + names[:1]] + [None]
+            assert (resolver.hits, resolver.misses) == (1, 4)
+            assert len(resolver) == 2
+
+            # the oldest entry (a) was evicted
+            assert resolver.resolve(fds[2:]) == [fsencode(names[2]), fsencode(names[0])]
+            assert (resolver.hits, resolver.misses) == (2, 5)
+
+            # writes (which change the ctime) keep hitting the cache
+            with open(names[2], 'a') as f:
+                f.write('data')
+            assert resolver.resolve(fds[2:3]) == [fsencode(names[2])]
+            assert (resolver.hits, resolver.misses) == (3, 5)
+
+            # a renamed file is resolved again once its old path is invalidated
+            renamed = os.path.join(tmp_dir, 'renamed')
+            os.rename(names[2], renamed)
+            assert resolver.invalidate(names[2]) == 1
+            assert resolver.resolve(fds[2:3]) == [fsencode(renamed)]
+            assert resolver.invalidate(tmp_dir) == 2 and len(resolver) == 0
+            resolver.close()
+        finally:
+            for fd in fds:
+                os.close(fd)
+
+
+def test_filename_after_rename():
+    with TemporaryDirectory() as tmp_dir:
+        old, new = os.path.join(tmp_dir, 'a'), os.path.join(tmp_dir, 'b')
+        fd = os.open(old, os.O_CREAT | os.O_RDONLY)
+        try:
+            assert FanotifyEvent(3, FAN_OPEN, fd, 1).filename == old
+            assert buffer_to_batch(_raw_event(FAN_OPEN, fd, 1)).resolve_paths() == [old]
+            resolver = PathResolver()
+            assert resolver.resolve([fd]) == [fsencode(old)]
+
+            # events (and batches not given a resolver) see the rename
+            os.rename(old, new)
+            renamed = os.open(new, os.O_RDONLY)
+            try:
+                assert FanotifyEvent(3, FAN_OPEN, renamed, 1).filename == new
+                batch = buffer_to_batch(_raw_event(FAN_OPEN, renamed, 1))
+                assert batch.resolve_paths() == [new]
+                assert batch[0].filename == new
+                # a cache that was opted in to needs invalidating
+                assert batch.resolve_paths(resolver) == [old]
+                resolver.invalidate(old)
+                assert batch.resolve_paths(resolver) == [new]
+                resolver.close()
+            finally:
+                os.close(renamed)
+        finally:
+            os.close(fd)
+
+
+def test_fd_table():
+    table = FdTable(2)
+    fds = [os.open(os.devnull, os.O_RDONLY) for i in range(5)]
+    first = buffer_to_batch(b''.join(_raw_event(FAN_OPEN, fd, 1) for fd in fds[:2]) +
+                            _raw_event(FAN_OPEN_PERM, fds[4], 1))
+    second = buffer_to_batch(b''.join(_raw_event(FAN_OPEN, fd, 1) for fd in fds[2:4]))
+    try:
+        table.add_batch(first)
+        assert len(table) == 2
+        assert first._events is None, "events built to track their fds"
+
+        # closing an event frees its slot, even if it is not the oldest
+        first[1].close()
+        assert len(table) == 1 and first.fds[1] == -1
+
+        table.add_batch(second)
+        assert table.evicted == 1 and len(table) == 2
+        # the evicted fd is gone from the batch records, not just closed
+        assert first.fds == [-1, -1, fds[4]]
+        assert first[0].fd == -1
+        with pytest.raises(OSError):
+            os.fstat(fds[0])
+
+        table.close_all()
+        assert len(table) == 0
+        assert second.fds == [-1, -1]
+        # permission events are left to be answered
+        os.fstat(fds[4])
+    finally:
+        os.close(fds[4])
+
+
+@pytest.mark.skipif(os.getuid() != 0, reason="fanotify can only be used by root")
+def test_read_batch():
+    with TemporaryDirectory() as tmp_dir:
+        notifier = Fanotify(FAN_CLASS_NOTIF)
+        try:
+            notifier.watch(tmp_dir, FAN_MODIFY|FAN_CLOSE_WRITE|FAN_EVENT_ON_CHILD)
+            with open(os.path.join(tmp_dir, 'file'), 'w') as f:
+                f.write('data')
+            
+            batch = notifier.read_batch()
+            assert len(batch) >= 1
+            assert set(batch.pids) == {os.getpid()}
+            assert [info.pid for info in batch.processes()] == batch.pids
+            assert batch[0].process.pid == os.getpid()
+            assert batch.resolve_paths() == [os.path.join(tmp_dir, 'file')] * len(batch)
+            assert batch[0].filename == os.path.join(tmp_dir, 'file')
+            fds = batch.fds
+            batch.close()
+            assert batch.fds == [-1] * len(batch)
+            for fd in fds:
+                with pytest.raises(OSError):
+                    os.fstat(fd)
+        finally:
+            notifier.close()
+
+
+def _drain_events(notifier, count, timeout=5):
+    events = []
+    deadline = monotonic() + timeout
+    while len(events) < count and monotonic() < deadline:
+        if select([notifier], [], [], timeout)[0]:
+            events.extend(notifier.read_events())
+    return events
+
+
+@pytest.mark.skipif(os.getuid() != 0, reason="fanotify can only be used by root")
+def test_respond_many():
+    with TemporaryDirectory() as tmp_dir:
+        allowed, denied = [os.path.join(tmp_dir, name) for name in ('allowed', 'denied')]
+        for path in (allowed, denied):
+            open(path, 'w').close()
+        
+        notifier = Fanotify(FAN_CLASS_CONTENT)
+        try:
+            notifier.watch(tmp_dir, FAN_OPEN_PERM|FAN_EVENT_ON_CHILD)
+            procs = [_cat(path) for path in (allowed, denied)]
+
+            events = _drain_events(notifier, 2)
+            # other opens of the files (eg by the dynamic loader) are never in tmp_dir
+            assert sorted(event.filename for event in events) == [allowed, denied]
+            status = notifier.respond_many([(event, event.filename == allowed) for event in events])
+            assert status == [0, 0]
+            assert all(event.fd is None for event in events)
+            assert notifier.response_latency.count == 2
+
+            assert [proc.wait() for proc in procs] == [0, 1]
+        finally:
+            notifier.close()
+
+
+@pytest.mark.skipif(os.getuid() != 0, reason="fanotify can only be used by root")
+def test_permission_engine():
+    with TemporaryDirectory() as tmp_dir:
+        paths = [os.path.join(tmp_dir, name) for name in ('allowed', 'denied', 'slow', 'broken')]
+        for path in paths:
+            open(path, 'w').close()
+        release = threading.Event()
+        late_paths, late_fds = [], []
+
+        def decide(event):
+            name = os.path.basename(event.filename)
+            if name == 'slow':
+                release.wait(5)
+                # the fd stays open past the deadline
+                late_paths.append(os.readlink('/proc/self/fd/{}'.format(event.fd)))
+                late_fds.append(event.fd)
+            elif name == 'broken':
+                raise RuntimeError(name)
+            return name != 'denied'
+
+        notifier = Fanotify(FAN_CLASS_CONTENT)
+        engine = PermissionEngine(notifier, decide, workers=2, deadline=0.2, default=False)
+        try:
+            notifier.watch(tmp_dir, FAN_OPEN_PERM|FAN_EVENT_ON_CHILD)
+            with engine:
+                procs = [_cat(path) for path in paths]
+                # the slow decision times out and is denied without holding up the rest
+                assert [proc.wait() for proc in procs] == [0, 1, 1, 1]
+                release.set()
+
+            # the slow event's fd is closed once its late decision finishes
+            deadline = monotonic() + 5
+            while monotonic() < deadline:
+                try:
+                    if late_fds:
+                        os.fstat(late_fds[0])
+                except OSError:
+                    break
+                time.sleep(0.01)
+            else:
+                pytest.fail("late event fd was not closed")
+            assert late_paths == [paths[2]]
+
+            metrics = engine.metrics
+            assert (metrics.pending, metrics.decided, metrics.timed_out, metrics.errors) == (0, 3, 1, 1)
+            assert engine.late == 1
+            assert 0 < metrics.p50_ns <= metrics.p99_ns
+        finally:
+            notifier.close()
+
+
+@pytest.mark.skipif(os.getuid() != 0, reason="fanotify can only be used by root")
+def test_handle_batch():
+    with TemporaryDirectory() as tmp_dir:
+        notifier = Fanotify(FAN_CLASS_NOTIF, fd_limit=1)
+        try:
+            notifier.watch(tmp_dir, FAN_CLOSE_WRITE|FAN_EVENT_ON_CHILD)
+            open(os.path.join(tmp_dir, 'file'), 'w').close()
+
+            seen = []
+            assert notifier.handle_batch(lambda event: seen.append((event.filename, event.fd))) == 1
+            (filename, fd), = seen
+            assert filename == os.path.join(tmp_dir, 'file')
+            with pytest.raises(OSError):
+                os.fstat(fd)
+            assert notifier.open_fds == 0
+
+            for name in 'ab':
+                open(os.path.join(tmp_dir, name), 'w').close()
+            events = _drain_events(notifier, 2)
+            assert notifier.open_fds == 1
+            # the evicted event was closed before it was built
+            assert [event.fd for event in events][0] == -1 and events[1].fd >= 0
+        finally:
+            notifier.close()
+        assert events[1].fd is None
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+
+import pytest
+from butter.fanotify_journal import JournalWriter, JournalReader, JournalRecord, RECORD
+from butter.fanotify import Fanotify, FAN_CLASS_NOTIF, FAN_MODIFY, FAN_CLOSE_WRITE, FAN_ACCESS, FAN_EVENT_ON_CHILD
+from butter.utils import fsencode
+
+from utils import TemporaryDirectory
+
+import os
+
+
+def test_append_and_resume():
+    with TemporaryDirectory() as journal_dir:
+        with JournalWriter(journal_dir, segment_records=4) as journal:
+            assert journal.append([(1, FAN_MODIFY, 10, '/a'), (2, FAN_ACCESS, 11, b'/b'),
+                                   (3, FAN_MODIFY, 12, None)]) == 0
+            assert journal.append([(4, FAN_MODIFY, 13, '/a'), (5, FAN_MODIFY, 14, '/c')]) == 3
+        assert sorted(os.listdir(journal_dir)) == ['00000000000000000000.seg', '00000000000000000004.seg', 'paths']
+
+        reader = JournalReader(journal_dir)
+        assert list(reader.read(3)) == [JournalRecord(3, 4, FAN_MODIFY, 13, b'/a'),
+                                        JournalRecord(4, 5, FAN_MODIFY, 14, b'/c')]
+        assert [record.path for record in reader.read()] == [b'/a', b'/b', None, b'/a', b'/c']
+
+        # a torn trailing record is dropped when the journal is reopened
+        with open(os.path.join(journal_dir, '00000000000000000004.seg'), 'ab') as f:
+            f.write(b'\0' * (RECORD.size // 2))
+        with JournalWriter(journal_dir, segment_records=4) as journal:
+            assert journal.next_seq == 5
+            journal.append([(6, FAN_MODIFY, 15, '/a')])
+        assert [record.seq for record in reader.read(4)] == [4, 5]
+
+
+def test_compact():
+    with TemporaryDirectory() as journal_dir:
+        with JournalWriter(journal_dir, segment_records=5) as journal:
+            journal.append([(1, FAN_MODIFY, 1, '/a'), (2, FAN_ACCESS, 1, '/a'), (3, FAN_MODIFY, 1, '/a'),
+                            (4, FAN_CLOSE_WRITE, 1, '/a'), (5, FAN_MODIFY, 1, '/b'),
+                            # the current segment is left alone
+                            (6, FAN_MODIFY, 1, '/a'), (7, FAN_MODIFY, 1, '/a')])
+            assert journal.compact() == 2
+
+        assert list(JournalReader(journal_dir).read()) == [
+            JournalRecord(1, 2, FAN_ACCESS, 1, b'/a'),
+            JournalRecord(3, 4, FAN_MODIFY|FAN_CLOSE_WRITE, 1, b'/a'),
+            JournalRecord(4, 5, FAN_MODIFY, 1, b'/b'),
+            JournalRecord(5, 6, FAN_MODIFY, 1, b'/a'),
+            JournalRecord(6, 7, FAN_MODIFY, 1, b'/a')]
+
+
+@pytest.mark.skipif(os.getuid() != 0, reason="fanotify can only be used by root")
+def test_pump():
+    with TemporaryDirectory() as tmp_dir, TemporaryDirectory() as journal_dir:
+        notifier = Fanotify(FAN_CLASS_NOTIF)
+        try:
+            notifier.watch(tmp_dir, FAN_CLOSE_WRITE|FAN_EVENT_ON_CHILD)
+            open(os.path.join(tmp_dir, 'file'), 'w').close()
+            with JournalWriter(journal_dir) as journal:
+                assert journal.pump(notifier) == 1
+        finally:
+            notifier.close()
+
+        record, = JournalReader(journal_dir).read()
+        assert record.path == fsencode(os.path.join(tmp_dir, 'file'))
+        assert record.pid == os.getpid() and record.mask == FAN_CLOSE_WRITE
@@ -1,12 +1,25 @@
 #!/usr/bin/env python
 
 import pytest
-from butter.inotify import watch
+from butter.inotify import watch, str_to_events, Inotify, RecursiveInotify
+from butter.inotify import IN_CREATE, IN_MODIFY, IN_ISDIR, IN_NONBLOCK, IN_ALL_EVENTS
+from butter.inotify import IN_DELETE, IN_IGNORED, IN_CLOSE_WRITE, IN_Q_OVERFLOW
+from butter.inotify import InotifyEvent, InotifyMovePairer, MoveEvent, IN_MOVE
+from butter.inotify import InotifyPool, InotifyWatchManager, POLLED_WD, IN_DELETE_SELF
+from butter.inotify import InotifyCoalescer
+from butter.inotify import EVENT_BUFFER_MIN, WatchStats
+from butter._inotify import EVENT_STRUCT_SIZE
+from butter.utils import fsencode
+import butter.inotify
+from butter.inotify import EventKind, event_kind, dispatch, IN_OPEN
 
 from utils import TemporaryDirectory
 
 from subprocess import Popen
 from time import sleep
+import threading
+import struct
+import errno
 import os
 
 def test_watch():
@@ -19,3 +32,452 @@ def test_watch():
         event = watch(tmp_dir)
         
         proc.wait()
+
+
+def _raw_event(wd, mask, cookie, name=b''):
+    length = (len(name) // 16 + 1) * 16 if name else 0
+    return struct.pack('iIII', wd, mask, cookie, length) + name.ljust(length, b'\0')
+
+@pytest.mark.inotify
+@pytest.mark.unit
+def test_str_to_events():
+    buf = _raw_event(1, IN_CREATE|IN_ISDIR, 0, b'subdir') + _raw_event(2, IN_MODIFY, 7)
+    
+    events = str_to_events(buf)
+
+    assert len(events) == 2
+    assert events[0] == (1, IN_CREATE|IN_ISDIR, 0, b'subdir')
+    assert events[0].create_event and events[0].is_dir_event
+    assert events[1] == (2, IN_MODIFY, 7, b'')
+
+@pytest.mark.inotify
+@pytest.mark.unit
+def test_str_to_events_truncated():
+    """Partial records at the end of the buffer must not be read past"""
+    buf = _raw_event(1, IN_MODIFY, 0, b'file')
+    
+    assert str_to_events(b'') == []
+    assert str_to_events(buf[:-1]) == []
+    assert str_to_events(buf + buf[:8]) == [(1, IN_MODIFY, 0, b'file')]
+
+@pytest.mark.inotify
+@pytest.mark.unit
+def test_str_to_events_mask():
+    buf = _raw_event(1, IN_CREATE, 0, b'new') + _raw_event(1, IN_MODIFY, 0, b'changed')
+    
+    assert str_to_events(buf, IN_MODIFY) == [(1, IN_MODIFY, 0, b'changed')]
+    assert str_to_events(buf, IN_DELETE) == []
+
+@pytest.mark.inotify
+@pytest.mark.unit
+@pytest.mark.parametrize('buffer_size', [None, EVENT_BUFFER_MIN])
+def test_read_events_mask(buffer_size):
+    with TemporaryDirectory() as tmp_dir:
+        notifier = Inotify(IN_NONBLOCK, buffer_size=buffer_size)
+        try:
+            notifier.watch(tmp_dir, IN_ALL_EVENTS)
+            assert list(notifier.iter_events(IN_CREATE)) == []
+
+            for name in ('a', 'b'):
+                with open(os.path.join(tmp_dir, name), 'w') as f:
+                    f.write(name)
+
+            events = list(notifier.iter_events(IN_CREATE))
+            assert [event.filename for event in events] == [b'a', b'b']
+            assert all(event.mask == IN_CREATE for event in events)
+
+            # whole batches of unwanted events before the one we want
+            for i in range(20):
+                open(os.path.join(tmp_dir, 'a'), 'rb').close()
+                open(os.path.join(tmp_dir, 'b'), 'rb').close()
+            open(os.path.join(tmp_dir, 'c'), 'w').close()
+            events = list(notifier.iter_events(IN_CREATE))
+            assert [event.filename for event in events] == [b'c']
+        finally:
+            notifier.close()
+
+@pytest.mark.inotify
+@pytest.mark.unit
+def test_buffer_size_too_small():
+    with pytest.raises(ValueError):
+        Inotify(buffer_size=EVENT_BUFFER_MIN - 1)
+
+@pytest.mark.inotify
+@pytest.mark.unit
+def test_buffer_reuse():
+    with TemporaryDirectory() as tmp_dir:
+        notifier = Inotify(IN_NONBLOCK, buffer_size=EVENT_BUFFER_MIN)
+        buf = notifier._buffer
+        try:
+            wd = notifier.watch(tmp_dir, IN_CREATE)
+            assert notifier.read_events() == []
+
+            for name in ('a', 'b' * 200, 'c'):
+                open(os.path.join(tmp_dir, name), 'w').close()
+
+            events = []
+            while True:
+                batch = notifier.read_events()
+                if not batch:
+                    break
+                events.extend(batch)
+            
+            assert [event.filename for event in events] == [b'a', b'b' * 200, b'c']
+            assert all(event.wd == wd for event in events)
+            assert notifier._buffer is buf
+        finally:
+            notifier.close()
+
+def _drain(notifier):
+    events = []
+    while True:
+        batch = notifier.read_events()
+        if not batch:
+            return events
+        events.extend(batch)
+
+@pytest.mark.inotify
+@pytest.mark.unit
+def test_recursive_watch():
+    with TemporaryDirectory() as tmp_dir:
+        os.makedirs(os.path.join(tmp_dir, 'a', 'b', 'c'))
+        os.makedirs(os.path.join(tmp_dir, 'd'))
+        root = fsencode(tmp_dir)
+
+        notifier = RecursiveInotify(IN_NONBLOCK, buffer_size=EVENT_BUFFER_MIN)
+        try:
+            wd = notifier.watch(tmp_dir, IN_CREATE|IN_DELETE)
+            assert notifier.path(wd) == root
+            assert sorted(notifier._paths.values()) == sorted([root] + 
+                    [os.path.join(root, p) for p in (b'a', b'a/b', b'a/b/c', b'd')])
+
+            open(os.path.join(tmp_dir, 'a', 'b', 'c', 'file'), 'w').close()
+            os.mkdir(os.path.join(tmp_dir, 'd', 'new'))
+            events = _drain(notifier)
+            assert [e.filename for e in events] == [os.path.join(root, b'a/b/c/file'),
+                                                    os.path.join(root, b'd/new')]
+
+            # the newly created directory is now watched as well
+            open(os.path.join(tmp_dir, 'd', 'new', 'file'), 'w').close()
+            os.unlink(os.path.join(tmp_dir, 'a', 'b', 'c', 'file'))
+            os.rmdir(os.path.join(tmp_dir, 'a', 'b', 'c'))
+            events = _drain(notifier)
+            assert os.path.join(root, b'd/new/file') in [e.filename for e in events]
+            assert any(e.mask & IN_IGNORED for e in events)
+            assert os.path.join(root, b'a/b/c') not in notifier._paths.values()
+        finally:
+            notifier.close()
+
+@pytest.mark.inotify
+@pytest.mark.unit
+def test_recursive_watch_blocking():
+    with TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(fsencode(tmp_dir), b'file')
+
+        notifier = RecursiveInotify()
+        try:
+            # IN_CREATE is read for tracking but not asked for, a batch of
+            # only that must not end a blocking read with nothing
+            wd = notifier.watch(tmp_dir, IN_DELETE)
+            open(filename, 'w').close()
+            timer = threading.Timer(0.1, os.unlink, [filename])
+            timer.start()
+            try:
+                assert notifier.wait(timeout=5) == (wd, IN_DELETE, 0, filename)
+            finally:
+                timer.join()
+
+            open(filename, 'w').close()
+            timer = threading.Timer(0.1, os.unlink, [filename])
+            timer.start()
+            try:
+                assert notifier.read_events() == [(wd, IN_DELETE, 0, filename)]
+            finally:
+                timer.join()
+        finally:
+            notifier.close()
+
+@pytest.mark.inotify
+@pytest.mark.unit
+def test_coalescer():
+    with TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, 'file')
+        notifier = Inotify()
+        wd = notifier.watch(tmp_dir, IN_MODIFY|IN_CLOSE_WRITE|IN_DELETE)
+        coalescer = InotifyCoalescer(notifier, window=0.05)
+        try:
+            for i in range(10):
+                with open(filename, 'a') as f:
+                    f.write('data')
+
+            assert coalescer.read_events() == [(wd, IN_MODIFY|IN_CLOSE_WRITE, 0, b'file')]
+
+            with open(filename, 'a') as f:
+                f.write('data')
+            os.unlink(filename)
+
+            # the held modify is returned before the delete that ended it
+            events = coalescer.read_events()
+            assert events == [(wd, IN_MODIFY|IN_CLOSE_WRITE, 0, b'file'), (wd, IN_DELETE, 0, b'file')]
+            assert coalescer.flush() == []
+        finally:
+            coalescer.close()
+
+@pytest.mark.inotify
+@pytest.mark.unit
+def test_overflow_recovery(mocker):
+    with TemporaryDirectory() as tmp_dir:
+        for name in ('kept', 'modified', 'removed'):
+            with open(os.path.join(tmp_dir, name), 'w') as f:
+                f.write(name)
+        os.mkdir(os.path.join(tmp_dir, 'gone'))
+        root = fsencode(tmp_dir)
+
+        notifier = RecursiveInotify(recover=True)
+        try:
+            wd = notifier.watch(tmp_dir, IN_CREATE|IN_DELETE|IN_MODIFY)
+            
+            with open(os.path.join(tmp_dir, 'modified'), 'a') as f:
+                f.write('more data')
+            os.unlink(os.path.join(tmp_dir, 'removed'))
+            os.rmdir(os.path.join(tmp_dir, 'gone'))
+            os.mkdir(os.path.join(tmp_dir, 'new'))
+            
+            # pretend the kernel dropped everything above
+            overflow = InotifyEvent(-1, IN_Q_OVERFLOW, 0, b'')
+            mocker.patch.object(Inotify, '_read_events', return_value=[overflow])
+            events = notifier.read_events()
+            
+            assert events[0] == overflow
+            received = {(e.mask, e.filename) for e in events[1:]}
+            join = os.path.join
+            assert received == {(IN_MODIFY, join(root, b'modified')),
+                                (IN_DELETE, join(root, b'removed')),
+                                (IN_DELETE|IN_ISDIR, join(root, b'gone')),
+                                (IN_IGNORED, join(root, b'gone')),
+                                (IN_CREATE|IN_ISDIR, join(root, b'new'))}
+            assert join(root, b'new') in notifier._paths.values()
+        finally:
+            notifier.close()
+
+@pytest.mark.inotify
+@pytest.mark.unit
+def test_move_pairer():
+    with TemporaryDirectory() as tmp_dir, TemporaryDirectory() as other_dir:
+        join = os.path.join
+        for name in ('a', 'c'):
+            open(join(tmp_dir, name), 'w').close()
+        open(join(other_dir, 'd'), 'w').close()
+
+        notifier = Inotify()
+        wd = notifier.watch(tmp_dir, IN_MOVE)
+        pairer = InotifyMovePairer(notifier, timeout=0.05)
+        try:
+            os.rename(join(tmp_dir, 'a'), join(tmp_dir, 'b'))
+            os.rename(join(tmp_dir, 'c'), join(other_dir, 'c'))
+            os.rename(join(other_dir, 'd'), join(tmp_dir, 'd'))
+
+            events = pairer.read_events()
+            while len(events) < 3:
+                events.extend(pairer.read_events())
+
+            move, created, deleted = events
+            assert isinstance(move, MoveEvent)
+            assert move.src.filename == b'a' and move.dst.filename == b'b'
+            assert move.src.cookie == move.dst.cookie == move.cookie
+            assert created == (wd, IN_CREATE, created.cookie, b'd')
+            assert deleted == (wd, IN_DELETE, deleted.cookie, b'c')
+        finally:
+            pairer.close()
+
+@pytest.mark.inotify
+@pytest.mark.unit
+def test_read_events_array():
+    np = pytest.importorskip('numpy')
+    with TemporaryDirectory() as tmp_dir:
+        notifier = Inotify(IN_NONBLOCK, buffer_size=EVENT_BUFFER_MIN * 4)
+        try:
+            wd = notifier.watch(tmp_dir, IN_CREATE|IN_MODIFY)
+            for name in ('first', 'second'):
+                with open(os.path.join(tmp_dir, name), 'w') as f:
+                    f.write(name)
+
+            batch = notifier.read_events_array(IN_CREATE)
+            assert batch.events.dtype.names == ('wd', 'mask', 'cookie')
+            assert list(batch.events['wd']) == [wd, wd]
+            assert list(batch.events['mask']) == [IN_CREATE, IN_CREATE]
+            assert list(batch.name_offsets) == [0, 5, 11]
+            assert batch.names == b'firstsecond'
+            
+            assert len(notifier.read_events_array().events) == 0
+        finally:
+            notifier.close()
+
+@pytest.mark.inotify
+@pytest.mark.unit
+def test_pool():
+    with TemporaryDirectory() as tmp_dir:
+        dirs = [os.path.join(tmp_dir, str(i)) for i in range(16)]
+        pool = InotifyPool(shards=3, flags=IN_NONBLOCK)
+        try:
+            wds = {}
+            for path in dirs:
+                os.mkdir(path)
+                wds[pool.watch(path, IN_CREATE)] = path
+            # every shard has a watch and the wd's are unique
+            assert {pool.shard_of(wd)[0] for wd in wds} == {0, 1, 2}
+            assert len(wds) == len(dirs)
+
+            assert pool.read_events() == []
+            for path in dirs:
+                open(os.path.join(path, 'file'), 'w').close()
+
+            seen = []
+            while len(seen) < len(dirs):
+                seen.append(pool.wait(1))
+            assert sorted(wds[event.wd] for event in seen) == sorted(dirs)
+            assert all(event.filename == b'file' for event in seen)
+
+            pool.ignore(next(iter(wds)))
+        finally:
+            pool.close()
+
+@pytest.mark.inotify
+@pytest.mark.unit
+def test_watch_manager():
+    with TemporaryDirectory() as tmp_dir:
+        dirs = [fsencode(os.path.join(tmp_dir, name)) for name in 'abc']
+        for path in dirs:
+            os.mkdir(path)
+        
+        manager = InotifyWatchManager(Inotify(), budget=2, poll_interval=0.05)
+        try:
+            a, b, c = [manager.watch(path, IN_CREATE) for path in dirs]
+            assert a > 0 and b > 0 and c > 0
+            assert manager.metrics.watched == 2
+            assert manager.metrics.polled == 1
+            assert manager.metrics.evictions == 1
+
+            # the first directory was evicted, activity on b leaves c as the LRU
+            open(os.path.join(dirs[1], b'file'), 'w').close()
+            assert manager.read_events() == [(b, IN_CREATE, 0, os.path.join(dirs[1], b'file'))]
+        
+            # activity on the polled path brings it back, evicting c
+            open(os.path.join(dirs[0], b'file'), 'w').close()
+            event, = manager.read_events()
+            assert event.mask == IN_MODIFY|IN_ISDIR and event.filename == dirs[0]
+            assert manager.path(event.wd) == dirs[0]
+            assert manager.metrics.promotions == 1
+            assert manager.metrics.evictions == 2
+            
+            os.rmdir(dirs[2])
+            assert manager.read_events() == [(POLLED_WD, IN_DELETE_SELF, 0, dirs[2])]
+            assert manager.metrics.polled == 0
+        finally:
+            manager.close()
+
+
+@pytest.mark.inotify
+@pytest.mark.unit
+def test_watch_manager_promotion_failure(monkeypatch):
+    with TemporaryDirectory() as tmp_dir:
+        dirs = [fsencode(os.path.join(tmp_dir, name)) for name in 'ab']
+        for path in dirs:
+            os.mkdir(path)
+
+        manager = InotifyWatchManager(Inotify(), budget=1, poll_interval=0.05)
+        try:
+            a, b = [manager.watch(path, IN_CREATE) for path in dirs]
+            assert manager.metrics.polled == 1
+
+            # the kernel refuses to watch the changed path again
+            add_watches = butter.inotify.inotify_add_watches
+            monkeypatch.setattr(butter.inotify, 'inotify_add_watches',
+                                lambda fd, paths, mask, ignore_errors: [-errno.EACCES])
+            open(os.path.join(dirs[0], b'file'), 'w').close()
+            assert manager.read_events() == [(POLLED_WD, IN_MODIFY|IN_ISDIR, 0, dirs[0])]
+            assert manager.metrics.polled == 1 and manager.metrics.watched == 1
+            assert manager.metrics.promotions == 0
+            assert manager.metrics.promotion_failures == 1
+
+            # still polled, so it is promoted once the kernel lets us
+            monkeypatch.setattr(butter.inotify, 'inotify_add_watches', add_watches)
+            open(os.path.join(dirs[0], b'other'), 'w').close()
+            event, = manager.read_events()
+            assert event.wd > 0 and event.filename == dirs[0]
+            assert manager.metrics.promotions == 1
+        finally:
+            manager.close()
+
+
+@pytest.mark.unit
+@pytest.mark.inotify
+def test_event_kind():
+    assert event_kind(IN_CREATE|IN_ISDIR) == EventKind.CREATE
+    assert event_kind(IN_MODIFY|IN_CLOSE_WRITE) == EventKind.MODIFY
+    assert event_kind(0) == EventKind.UNKNOWN
+    assert event_kind(IN_ISDIR) == EventKind.UNKNOWN
+    for name, kind in EventKind.__members__.items():
+        flag = getattr(butter.inotify, 'IN_' + name, None)
+        # IN_MOVE is MOVED_FROM|MOVED_TO, paired renames get EventKind.MOVE
+        if flag is not None and kind != EventKind.MOVE:
+            assert event_kind(flag) == kind
+    assert InotifyEvent(1, IN_IGNORED, 0, b'').kind == EventKind.IGNORED
+
+    create = InotifyEvent(1, IN_CREATE, 0, b'a')
+    delete = InotifyEvent(1, IN_DELETE|IN_ISDIR, 0, b'b')
+    opened = InotifyEvent(1, IN_OPEN, 0, b'c')
+    move = MoveEvent(create, create)
+    
+    seen = []
+    dispatch([create, delete, opened, move],
+             {EventKind.CREATE: lambda e: seen.append(('create', e)),
+              EventKind.MOVE: lambda e: seen.append(('move', e))},
+             default=lambda e: seen.append(('default', e)))
+    assert seen == [('create', create), ('default', delete), ('default', opened), ('move', move)]
+
+    seen = []
+    handlers = [None] * len(EventKind)
+    handlers[EventKind.DELETE] = seen.append
+    dispatch([create, delete, opened], handlers)
+    assert seen == [delete]
+
+
+@pytest.mark.unit
+@pytest.mark.inotify
+@pytest.mark.parametrize('buffer_size', [None, EVENT_BUFFER_MIN])
+def test_watch_stats(buffer_size):
+    with TemporaryDirectory() as tmp_dir:
+        tmp_dir = fsencode(tmp_dir)
+        quiet = os.path.join(tmp_dir, b'quiet')
+        os.mkdir(quiet)
+
+        # start small to exercise growing the C array mid batch
+        inotify = Inotify(IN_NONBLOCK, buffer_size=buffer_size, stats=WatchStats(size=1))
+        try:
+            busy = inotify.watch(tmp_dir, IN_CREATE)
+            idle = inotify.watch(quiet, IN_CREATE)
+            for i in range(3):
+                open(os.path.join(tmp_dir, 'file{}'.format(i).encode()), 'w').close()
+            open(os.path.join(quiet, b'file'), 'w').close()
+            _drain(inotify)
+
+            stats = inotify.stats.snapshot()
+            assert stats[busy].events == 3
+            assert stats[idle].events == 1
+            assert stats[busy].bytes % EVENT_STRUCT_SIZE == 0 and stats[busy].bytes > 3 * EVENT_STRUCT_SIZE
+            assert stats[idle].last_event_ns > 0
+            assert [wd for wd, stat in inotify.stats.top_n(2, 'events')] == [busy, idle]
+
+            inotify.stats.forget(busy)
+            assert inotify.stats[busy] == (0, 0, 0)
+            inotify.stats.reset()
+            assert inotify.stats.snapshot() == {}
+        finally:
+            inotify.close()
+    
+    inotify = Inotify()
+    try:
+        assert inotify.stats is None
+    finally:
+        inotify.close()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+
+import pytest
+from butter.procinfo import ProcessInfoCache, read_process_info
+from butter.signalfd import Signalfd, pthread_sigmask, SIG_BLOCK, SIG_UNBLOCK
+
+from subprocess import Popen
+import signal
+import errno
+import os
+
+
+def test_read_process_info():
+    info = read_process_info(os.getpid())
+    assert info.pid == os.getpid()
+    assert info.ppid == os.getppid()
+    assert info.uid == os.getuid() and info.gid == os.getgid()
+    assert info.start_time > 0
+
+    proc = Popen(['true'])
+    proc.wait()
+    assert read_process_info(proc.pid) is None
+
+
+def test_read_process_info_denied(monkeypatch):
+    import butter.procinfo
+    read = butter.procinfo._read
+    def _read(dirfd, name):
+        if name != 'stat':
+            raise OSError(errno.EACCES, 'Permission denied')
+        return read(dirfd, name)
+    monkeypatch.setattr(butter.procinfo, '_read', _read)
+
+    info = read_process_info(os.getpid())
+    assert info.pid == os.getpid() and info.start_time > 0
+    assert info.uid == info.gid == -1
+    assert info.cgroup == b''
+
+    monkeypatch.setattr(butter.procinfo, '_read', lambda dirfd, name: _read(dirfd, 'status'))
+    assert read_process_info(os.getpid()) is None
+
+
+def test_cache():
+    cache = ProcessInfoCache(maxsize=2, ttl=60)
+    pid, ppid = os.getpid(), os.getppid()
+    
+    infos = cache.get_many([pid, pid, ppid])
+    assert [info.pid for info in infos] == [pid, pid, ppid]
+    assert cache.misses == 2 and cache.hits == 0
+
+    assert cache.get(pid) is infos[0]
+    assert cache.hits == 1
+
+    # a different process reusing the pid is detected once the entry is revalidated
+    cache.ttl = 0
+    cache._cache[pid] = (infos[0]._replace(start_time=infos[0].start_time - 1, comm=b'old'), 0)
+    assert cache.get(pid).comm == infos[0].comm
+    assert cache.misses == 3
+
+    cache.get(1)
+    assert len(cache) == 2 and ppid not in cache._cache
+
+
+def test_signal_process():
+    sfd = Signalfd()
+    sfd.enable(signal.SIGUSR1)
+    pthread_sigmask(SIG_BLOCK, [signal.SIGUSR1])
+    try:
+        os.kill(os.getpid(), signal.SIGUSR1)
+        sig = sfd.wait(5)
+        assert sig.process.pid == os.getpid()
+        assert sig.process.comm == read_process_info(os.getpid()).comm
+    finally:
+        pthread_sigmask(SIG_UNBLOCK, [signal.SIGUSR1])
+        sfd.close()
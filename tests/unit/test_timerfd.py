@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+
+import pytest
+from butter.timerfd import Timer, TimerVal, TimerWheel, PeriodicScheduler, CATCH_UP, SKIP
+from butter.timerfd import timerfd_settime_many, TFD_NONBLOCK
+import butter.timerfd
+
+import random
+import errno
+import time
+
+
+@pytest.mark.unit
+def test_timer_wheel_order(monkeypatch):
+    """Timeouts spread over every level of the wheel expire on their tick"""
+    clock = [10**12]
+    monkeypatch.setattr(butter.timerfd, '_monotonic_ns', lambda: clock[0])
+
+    wheel = TimerWheel(resolution=0.001, flags=TFD_NONBLOCK)
+    rand = random.Random(0)
+    delays = [rand.randrange(1, 1 << 26) for i in range(2000)] + [1 << 33]
+    handles = [wheel.schedule(delay / 1000.0) for delay in delays]
+    cancelled = set(handles[::7])
+    for handle in cancelled:
+        assert handle.cancel()
+        assert not handle.cancel()
+    assert len(wheel) == len(handles) - len(cancelled)
+
+    expected = sorted((h.expires for h in handles if h not in cancelled), reverse=True)
+    tick = 0
+    while len(wheel):
+        # jump straight to the next thing the wheel needs to do
+        tick = max(wheel._next_tick(), tick + rand.randrange(1, 1 << 20))
+        for handle in wheel._advance(tick):
+            assert handle.expires <= tick
+            assert not handle.active
+            expected.remove(handle.expires)
+        # nothing due has been left behind
+        assert not expected or expected[-1] > tick
+
+    assert expected == []
+    wheel.close()
+
+
+@pytest.mark.unit
+def test_timer_wheel_fires():
+    wheel = TimerWheel(resolution=0.001)
+    fired = []
+    wheel.schedule(0.02, fired.append, 'second')
+    wheel.schedule(0.01, fired.append, 'first')
+    wheel.schedule(0.01, fired.append, 'cancelled').cancel()
+
+    expired = []
+    while len(wheel):
+        expired += wheel.read_events()
+
+    assert fired == ['first', 'second']
+    assert len(expired) == 2
+    wheel.close()
+
+
+@pytest.mark.unit
+def test_timer_set_ns():
+    timer = Timer()
+    timer.set_ns(5 * 10**9 + 7, 10**9 + 3)
+    assert timer.next_event == (5, 7)
+    assert timer.period == (1, 3)
+    assert 4 * 10**9 < timer.remaining_ns() <= 5 * 10**9 + 7
+    assert timer.get_current().period == (1, 3)
+
+    timer.set(0)
+    assert timer.remaining_ns() == 0
+    assert timer.remaining() == 0.0
+    assert timer.after(seconds=1).update(old=False) is None
+    assert timer.remaining() > 0
+
+    with pytest.raises(ValueError):
+        timer.set_ns(-1)
+    timer.close()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('policy', [CATCH_UP, SKIP])
+def test_periodic_scheduler(policy):
+    ran = []
+    scheduler = PeriodicScheduler(0.01, ran.append, policy=policy)
+    first, = scheduler.read_events()
+    assert first.index == 0 and first.missed == 0
+    assert first.deadline_ns == scheduler.start_ns
+
+    # fall 3+ ticks behind
+    time.sleep(0.035)
+    ticks = scheduler.read_events()
+    assert scheduler.overruns == 1
+    if policy == CATCH_UP:
+        assert [tick.index for tick in ticks] == list(range(1, len(ticks) + 1))
+        assert len(ticks) >= 3 and scheduler.missed == 0
+        # the oldest tick caught up on was run at least a period late
+        assert ticks[0].lateness_ns >= scheduler.period_ns
+    else:
+        tick, = ticks
+        assert tick.index >= 3 and tick.missed == tick.index - 1
+        assert scheduler.missed == tick.missed
+    # deadlines stay on the original grid
+    assert ticks[-1].deadline_ns == scheduler.start_ns + ticks[-1].index * scheduler.period_ns
+
+    assert ran == [first] + ticks
+    assert scheduler.lateness.count == scheduler.ticks == len(ran)
+    assert scheduler.lateness.max == max(tick.lateness_ns for tick in ran)
+
+    with pytest.raises(ValueError):
+        PeriodicScheduler(0.01, policy='sometimes')
+    scheduler.close()
+
+
+@pytest.mark.unit
+def test_timerfd_settime_many():
+    timers = [Timer() for i in range(3)]
+    for i, timer in enumerate(timers):
+        timer.after(seconds=i + 1)
+    bad_fd = timers[0].fileno() + 1000
+
+    status = timerfd_settime_many([(timer, timer, 0) for timer in timers] +
+                                  [(bad_fd, TimerVal().after(seconds=1), 0),
+                                   (timers[0].fileno(), timers[0].__timerspec__(), -1)])
+    assert status == [0, 0, 0, errno.EBADF, errno.EINVAL]
+    for i, timer in enumerate(timers):
+        assert i < timer.remaining() <= i + 1
+        timer.close()
+
+    assert timerfd_settime_many([]) == []